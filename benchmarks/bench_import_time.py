@@ -0,0 +1,170 @@
+"""
+Check that short-lived jobs start quickly, by timing the imports of each kind of job in a fresh interpreter.
+
+Every scenario imports what a job of that kind needs (e.g. DataFrameInfo for a profiling job)
+and must stay within a startup budget: its import time over the baseline of importing numpy
+and pandas, which every job pays anyway. It must also leave the heavy libraries it does not
+need (SQLAlchemy, SciPy, matplotlib, seaborn) unimported, since they are loaded on first use.
+The exit status is 1 if any scenario is over budget or loads a library it should not.
+
+Usage:
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --budget 0.1 --repeat 7 --slowest 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# The libraries that are slow to import, and only loaded by the functions that use them
+HEAVY_MODULES = ['sqlalchemy', 'scipy', 'matplotlib', 'seaborn']
+
+BASELINE = 'import numpy, pandas'
+
+# Each scenario: the imports of the job, and the heavy libraries its imports must not load
+SCENARIOS = {
+    'extract-only': {
+        'statement': 'from utils import DataCache, DataExtractor, RDSDatabaseConnector',
+        'forbidden': ['scipy', 'matplotlib', 'seaborn'],
+    },
+    'profile-only': {
+        'statement': 'from utils import DataFrameInfo, DataFrameProfiler, MissingnessAnalyzer',
+        'forbidden': ['sqlalchemy', 'scipy', 'matplotlib', 'seaborn'],
+    },
+    'aggregate-only': {
+        'statement': 'from utils import DataCache, DataCube',
+        'forbidden': ['sqlalchemy', 'scipy', 'matplotlib', 'seaborn'],
+    },
+    'transform': {
+        'statement': 'from utils import DataExtractor, DataTransformer',
+        'forbidden': ['sqlalchemy', 'scipy', 'matplotlib', 'seaborn'],
+    },
+    'plotter': {
+        'statement': 'from plotter import Plotter',
+        'forbidden': ['sqlalchemy', 'scipy', 'matplotlib', 'seaborn'],
+    },
+}
+
+# Run in a fresh interpreter: time the statement after the baseline, and list the heavy modules it loaded
+TIMER = """
+import json, sys, time
+start = time.perf_counter()
+{baseline}
+middle = time.perf_counter()
+{statement}
+end = time.perf_counter()
+print(json.dumps({{'baseline': middle - start, 'seconds': end - middle,
+                  'loaded': [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def time_import(statement: str) -> Dict:
+    """
+    Time a statement in a new interpreter, after the baseline imports.
+
+    Returns:
+        Dict: The 'baseline' and statement 'seconds', and the heavy modules 'loaded'.
+    """
+    code = TIMER.format(baseline=BASELINE, statement=statement, heavy=HEAVY_MODULES)
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"'{statement}' failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(statement: str, count: int) -> List[tuple]:
+    """
+    Return the slowest top-level packages imported by a statement, from `python -X importtime`.
+
+    Returns:
+        List[tuple]: (package, cumulative seconds) pairs, slowest first.
+    """
+    code = f'{BASELINE}\nimport sys\nsys.stderr.write("--- statement ---\\n")\n{statement}'
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT, capture_output=True, text=True)
+    lines = result.stderr.split('--- statement ---\n', 1)[-1].splitlines()
+
+    packages = {}
+    for line in lines:
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit():
+            continue
+        # Only the outermost imports, whose cumulative times include their dependencies
+        if name.startswith('  ') or name.strip() in packages:
+            continue
+        packages[name.strip()] = int(cumulative) / 1e6
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def run(scenarios: List[str], repeat: int, budget: float) -> List[Dict]:
+    """
+    Time every scenario `repeat` times and check it against the budget.
+
+    Returns:
+        List[Dict]: One result per scenario, with the best and median times and whether it 'passed'.
+    """
+    results = []
+    for name in scenarios:
+        scenario = SCENARIOS[name]
+        runs = [time_import(scenario['statement']) for _ in range(repeat)]
+        seconds = [run['seconds'] for run in runs]
+        loaded = sorted(set().union(*[run['loaded'] for run in runs]))
+        forbidden = [module for module in loaded if module in scenario['forbidden']]
+
+        best = min(seconds)
+        results.append({
+            'scenario': name,
+            'statement': scenario['statement'],
+            'baseline': min(run['baseline'] for run in runs),
+            'best': best,
+            'median': statistics.median(seconds),
+            'loaded': loaded,
+            'forbidden': forbidden,
+            'passed': best <= budget and not forbidden,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--budget', type=float, default=0.25,
+                        help='Seconds each scenario may add to the numpy and pandas imports (default: 0.25)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--slowest', type=int, default=5,
+                        help='Number of slowest imports shown for each failing scenario (default: 5)')
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    args = parser.parse_args()
+
+    results = run(args.scenarios, args.repeat, args.budget)
+    print(f"Baseline ({BASELINE}): {min(result['baseline'] for result in results):.3f} s, "
+          f"budget {args.budget:.3f} s over the baseline")
+    print(f"{'Scenario':<16}{'Best (s)':>10}{'Median (s)':>12}  {'Heavy modules loaded':<28}Status")
+    for result in results:
+        status = 'ok' if result['passed'] else ('FORBIDDEN' if result['forbidden'] else 'OVER BUDGET')
+        loaded = ', '.join(result['loaded']) or '-'
+        print(f"{result['scenario']:<16}{result['best']:>10.3f}{result['median']:>12.3f}  {loaded:<28}{status}")
+
+    for result in results:
+        if not result['passed'] and args.slowest:
+            print(f"\nSlowest imports of {result['scenario']} ({result['statement']}):")
+            for package, seconds in slowest_imports(result['statement'], args.slowest):
+                print(f"    {package:<40}{seconds:.3f} s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'baseline': BASELINE, 'budget': args.budget, 'results': results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if not all(result['passed'] for result in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Measure how per-column work scales from 1 to N worker processes.
+
+A synthetic wide/tall version of customer_activity is built by resampling the numeric columns
+of customer_activity.csv with a little noise, then Yeo-Johnson lambdas are fitted with
+`DataTransformer.transform_skewed_columns(n_jobs=...)` and distinct values are counted with
+`DataFrameInfo.count_distinct_values(n_jobs=...)`.
+
+Usage:
+    python benchmarks/bench_parallel_columns.py --rows 200000 --width 48 --max-workers 8
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from utils.data_frame_info import DataFrameInfo
+from utils.data_transformer import DataTransformer
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'customer_activity.csv')
+
+
+def synthetic_frame(rows: int, width: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Build a frame of `width` numeric and `width` categorical columns resampled from customer_activity.
+    """
+    rng = np.random.default_rng(seed)
+    source = pd.read_csv(CSV_PATH).dropna()
+    numeric = source.select_dtypes(include=['float64', 'int64'])
+    categorical = source.select_dtypes(exclude=['float64', 'int64', 'bool'])
+
+    columns = {}
+    for index in range(width):
+        values = numeric.iloc[:, index % numeric.shape[1]].to_numpy()
+        columns[f'numeric_{index}'] = rng.choice(values, rows) + rng.random(rows) * 1e-3
+        labels = categorical.iloc[:, index % categorical.shape[1]].to_numpy()
+        columns[f'category_{index}'] = pd.Categorical(rng.choice(labels, rows))
+    return pd.DataFrame(columns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--width', type=int, default=24)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    df = synthetic_frame(args.rows, args.width)
+    numeric_columns = [column for column in df.columns if column.startswith('numeric_')]
+    print(f"Rows: {args.rows}, columns: {df.shape[1]}, CPUs: {os.cpu_count()}")
+
+    baseline = None
+    workers = 1
+    while workers <= args.max_workers:
+        start = time.perf_counter()
+        DataTransformer(df).transform_skewed_columns(numeric_columns, 'yeo-johnson', n_jobs=workers)
+        transform_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        DataFrameInfo(df).count_distinct_values(verbose=False, n_jobs=workers)
+        distinct_time = time.perf_counter() - start
+
+        baseline = baseline or transform_time
+        print(f"{workers:>3} workers: yeo-johnson {transform_time:.3f} s ({baseline / transform_time:.2f}x), "
+              f"distinct counts {distinct_time:.3f} s")
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+"""
+Generate synthetic customer_activity-shaped data of any size, chunk by chunk.
+
+Rows are drawn from customer_activity.csv with replacement, so the joint distribution of the
+columns, the null rates and which columns are null together, and the category cardinalities
+all match the real table. Continuous columns (durations, rates and page values) get a small
+multiplicative jitter, clipped to the observed range, so a large table does not repeat the
+same few thousand values. Count columns keep their integer values.
+
+The generator is seeded and each chunk draws from its own child seed, so the same seed and
+chunk size always produce the same table, and tables of 10M+ rows are written without ever
+being held in memory.
+
+Usage:
+    python benchmarks/synthetic_data.py --rows 1000000 --output benchmarks/data/customer_activity_1m.parquet
+    python benchmarks/synthetic_data.py --rows 10000000 --output benchmarks/data/customer_activity.db
+"""
+import argparse
+import os
+import sys
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from utils.chunked_pipeline import ChunkSink
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'customer_activity.csv')
+
+
+class SyntheticCustomerActivity:
+    """
+    A class for generating synthetic rows shaped like the customer_activity table.
+    """
+
+    def __init__(self, source_path: str = CSV_PATH, noise: float = 0.02, seed: int = 0):
+        """
+        Initialize the generator from the real table.
+
+        Args:
+            source_path (str, optional): The CSV file to draw rows from. Defaults to customer_activity.csv.
+            noise (float, optional): The standard deviation of the multiplicative log-normal jitter
+                applied to continuous columns. Defaults to 0.02.
+            seed (int, optional): The seed of the generator. Defaults to 0.
+        """
+        self.source = pd.read_csv(source_path)
+        self.noise = noise
+        self.seed = seed
+
+        # Jitter the float columns holding non-integer values, leave the page counts as they are
+        self.continuous_columns = []
+        for column_name in self.source.select_dtypes(include=['float64']).columns:
+            values = self.source[column_name].dropna().to_numpy()
+            if not np.array_equal(values, np.round(values)):
+                self.continuous_columns.append(column_name)
+        self.bounds = {column_name: (self.source[column_name].min(), self.source[column_name].max())
+                       for column_name in self.continuous_columns}
+
+    def generate(self, rows: int, chunk_size: int = 1000000, add_id: bool = False) -> Iterator[pd.DataFrame]:
+        """
+        Generate the rows in chunks.
+
+        Args:
+            rows (int): The total number of rows.
+            chunk_size (int, optional): The number of rows per chunk. Defaults to 1000000.
+            add_id (bool, optional): Add a sequential 'session_id' column, for partitioned and
+                incremental reads. Defaults to False.
+
+        Yields:
+            pd.DataFrame: The chunks, with the dtypes pandas infers for customer_activity.csv.
+        """
+        chunk_seeds = np.random.SeedSequence(self.seed).spawn(-(-rows // chunk_size))
+        for index, chunk_seed in enumerate(chunk_seeds):
+            rng = np.random.default_rng(chunk_seed)
+            start = index * chunk_size
+            length = min(chunk_size, rows - start)
+
+            # Resample whole rows to keep the columns' joint distribution and null patterns
+            chunk = self.source.iloc[rng.integers(0, len(self.source), length)].reset_index(drop=True)
+            for column_name in self.continuous_columns:
+                values = chunk[column_name].to_numpy()
+                jittered = values * np.exp(rng.normal(0.0, self.noise, length))
+                chunk[column_name] = np.clip(jittered, *self.bounds[column_name])
+
+            if add_id:
+                chunk.insert(0, 'session_id', np.arange(start, start + length, dtype=np.int64))
+            yield chunk
+
+    def frame(self, rows: int, add_id: bool = False) -> pd.DataFrame:
+        """
+        Generate the rows as a single DataFrame.
+
+        Args:
+            rows (int): The number of rows.
+            add_id (bool, optional): Add a sequential 'session_id' column. Defaults to False.
+
+        Returns:
+            pd.DataFrame: The generated rows.
+        """
+        return pd.concat(self.generate(rows, add_id=add_id), ignore_index=True)
+
+    def write(self, rows: int, file_path: str, chunk_size: int = 1000000, add_id: bool = False) -> int:
+        """
+        Write the rows to a .csv or .parquet file, one chunk at a time.
+
+        Args:
+            rows (int): The number of rows.
+            file_path (str): The path of the file to write.
+            chunk_size (int, optional): The number of rows per chunk. Defaults to 1000000.
+            add_id (bool, optional): Add a sequential 'session_id' column. Defaults to False.
+
+        Returns:
+            int: The number of rows written.
+        """
+        sink = ChunkSink(file_path)
+        try:
+            for chunk in self.generate(rows, chunk_size, add_id):
+                sink.write(chunk)
+        finally:
+            sink.close()
+        return rows
+
+    def write_sql(self, rows: int, engine, table_name: str = 'customer_activity', chunk_size: int = 1000000) -> int:
+        """
+        Load the rows into a database table, replacing it, with a 'session_id' column.
+
+        Args:
+            rows (int): The number of rows.
+            engine (sqlalchemy.engine.Engine): The engine of the database, e.g. a local SQLite file
+                or PostgreSQL stand-in.
+            table_name (str, optional): The name of the table. Defaults to 'customer_activity'.
+            chunk_size (int, optional): The number of rows per chunk. Defaults to 1000000.
+
+        Returns:
+            int: The number of rows written.
+        """
+        for index, chunk in enumerate(self.generate(rows, chunk_size, add_id=True)):
+            chunk.to_sql(table_name, engine, if_exists='replace' if index == 0 else 'append', index=False,
+                         chunksize=50000)
+        return rows
+
+    def compare(self, data_frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compare the null rates, cardinalities and means of a generated frame with the real table.
+
+        Args:
+            data_frame (pd.DataFrame): The generated rows.
+
+        Returns:
+            pd.DataFrame: One row per column with the real and synthetic statistics side by side.
+        """
+        rows = {}
+        for column_name in self.source.columns:
+            real, synthetic = self.source[column_name], data_frame[column_name]
+            row = {'real_null_rate': real.isna().mean(), 'synthetic_null_rate': synthetic.isna().mean()}
+            if column_name in self.continuous_columns:
+                row.update(real_mean=real.mean(), synthetic_mean=synthetic.mean())
+            else:
+                row.update(real_distinct=real.nunique(), synthetic_distinct=synthetic.nunique())
+            rows[column_name] = row
+        return pd.DataFrame(rows).T
+
+
+def parse_rows(value: str) -> int:
+    """
+    Parse a row count such as '10k', '1M' or '50m'.
+    """
+    multipliers = {'k': 1000, 'm': 1000000}
+    suffix = value[-1].lower()
+    if suffix in multipliers:
+        return int(float(value[:-1]) * multipliers[suffix])
+    return int(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=parse_rows, default=1000000, help="Row count, e.g. 10k, 1M or 50M")
+    parser.add_argument('--output', required=True, help="A .csv, .parquet or SQLite .db file")
+    parser.add_argument('--table', default='customer_activity', help="The table name, for .db outputs")
+    parser.add_argument('--chunk-size', type=int, default=1000000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    generator = SyntheticCustomerActivity(seed=args.seed)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    if args.output.endswith('.db'):
+        generator.write_sql(args.rows, create_engine(f"sqlite:///{args.output}"), args.table, args.chunk_size)
+    else:
+        generator.write(args.rows, args.output, args.chunk_size)
+    print(f"Wrote {args.rows} rows to {args.output}")
+
+    # Report how closely a sample of the output matches the real table
+    sample_rows = min(args.rows, 100000)
+    print(generator.compare(next(generator.generate(sample_rows, sample_rows))).to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -1,40 +1,296 @@
+import os
+import re
+import time
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy.stats import boxcox, probplot
 import math
-from typing import List
-
+from typing import Dict, List, Optional, Union
+from utils.correlation import correlate
+from utils.diagnostics import Diagnostics
+from utils.instrumentation import instrument_class
+from utils.lazy_imports import LazyModule
+from utils.parallel import process_pool
+
+# Imported on first use, so that importing Plotter does not load the plotting libraries
+plt = LazyModule('matplotlib.pyplot')
+sns = LazyModule('seaborn')
+
+@instrument_class
 class Plotter:
     """
     A class for generating plots to visualize DataFrame transformations.
+
+    By default every plot is shown interactively and the plot methods return None. In headless
+    mode the plots are drawn on standalone figures with an Agg canvas, outside pyplot, and
+    returned, or saved to `output_dir`. pyplot's backend is left alone, so a headless Plotter
+    does not stop other Plotters from showing their plots.
     """
 
-    def plot_null_distribution(self, df: pd.DataFrame) -> None:
+    def __init__(self, headless: bool = False, output_dir: Optional[str] = None, file_format: str = 'png', dpi: int = 100):
+        """
+        Initialize the Plotter.
+
+        Args:
+            headless (bool, optional): Draw without a display instead of calling plt.show(). Defaults to False.
+            output_dir (str, optional): In headless mode, save each figure to this directory and close it. Defaults to None.
+            file_format (str, optional): The image format to save, e.g. 'png' or 'svg'. Defaults to 'png'.
+            dpi (int, optional): The resolution of saved raster images. Defaults to 100.
+        """
+        self.headless = headless
+        self.output_dir = output_dir
+        self.file_format = file_format
+        self.dpi = dpi
+        self._next_name = None
+        self._saved_names = {}
+
+        if headless and output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+    def _subplots(self, nrows: int = 1, ncols: int = 1, figsize: Optional[tuple] = None) -> tuple:
+        """
+        Create a figure and its axes: through pyplot when showing plots, or in headless mode as a
+        standalone figure on an Agg canvas, which pyplot does not track.
+        """
+        if not self.headless:
+            return plt.subplots(nrows, ncols, figsize=figsize)
+
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        return fig, fig.subplots(nrows, ncols)
+
+    def _finish(self, fig: 'plt.Figure', name: str) -> Optional[Union['plt.Figure', str]]:
+        """
+        Show the figure, or in headless mode return it or save it to the output directory.
+
+        Nothing is returned when the figure is shown, so a notebook cell ending with a plot call
+        does not display the figure a second time.
+        """
+        if not self.headless:
+            plt.show()
+            return None
+
+        if not self.output_dir:
+            return fig
+
+        # Name the file after the plot, numbering repeated names
+        name = self._next_name or name
+        self._next_name = None
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', name).strip('_').lower() or 'figure'
+        count = self._saved_names.get(slug, 0)
+        self._saved_names[slug] = count + 1
+        file_name = f"{slug}.{self.file_format}" if count == 0 else f"{slug}_{count}.{self.file_format}"
+
+        path = os.path.join(self.output_dir, file_name)
+        fig.savefig(path, dpi=self.dpi, bbox_inches='tight')
+        return path
+
+    def render(self, method: str, *args, name: Optional[str] = None, **kwargs) -> Optional[Union['plt.Figure', str]]:
+        """
+        Call a plot method by name, optionally choosing the name of the saved file.
+
+        Args:
+            method (str): The name of the plot method, e.g. 'plot_bar_chart'.
+            *args: Positional arguments for the plot method.
+            name (str, optional): The file name to save the figure under, without extension. Defaults to None.
+            **kwargs: Keyword arguments for the plot method.
+
+        Returns:
+            plt.Figure or str: In headless mode, the figure, or the path it was saved to.
+        """
+        self._next_name = name
+        return getattr(self, method)(*args, **kwargs)
+
+    @staticmethod
+    def numeric_values(series: pd.Series) -> np.ndarray:
+        """
+        Return the finite values of a numeric column as a float64 array.
+
+        Args:
+            series (pd.Series): The column.
+
+        Returns:
+            np.ndarray: The values, without nulls and infinities.
+        """
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        return values[np.isfinite(values)]
+
+    @staticmethod
+    def histogram(series: pd.Series, bins: int = 50) -> tuple:
+        """
+        Bin a numeric column, so it can be plotted without keeping the rows.
+
+        Args:
+            series (pd.Series): The column.
+            bins (int, optional): The number of bins. Defaults to 50.
+
+        Returns:
+            tuple: The counts and the bin edges, as returned by np.histogram.
+        """
+        return np.histogram(Plotter.numeric_values(series), bins=bins)
+
+    @staticmethod
+    def null_blocks(df: pd.DataFrame, max_blocks: int = 200) -> pd.DataFrame:
+        """
+        Compute the fraction of null values in each column for consecutive blocks of rows.
+
+        Args:
+            df (pd.DataFrame): The DataFrame.
+            max_blocks (int, optional): The maximum number of row blocks. Defaults to 200.
+
+        Returns:
+            pd.DataFrame: One row per block, indexed by the first row of the block.
+        """
+        num_rows = len(df)
+        starts = np.unique(np.linspace(0, num_rows, min(max_blocks, num_rows) + 1).astype(np.int64)[:-1])
+        if len(starts) == 0:
+            return pd.DataFrame(columns=df.columns, dtype=np.float64)
+
+        # Count the nulls of every block in one pass over the null mask
+        null_counts = np.add.reduceat(df.isnull().to_numpy(), starts, axis=0, dtype=np.int64)
+        block_sizes = np.diff(np.append(starts, num_rows))
+        return pd.DataFrame(null_counts / block_sizes[:, None], index=starts, columns=df.columns)
+
+    @staticmethod
+    def binned_kde(counts: np.ndarray, edges: np.ndarray, grid_size: int = 200) -> tuple:
+        """
+        Estimate a KDE curve from a histogram instead of from the rows.
+
+        Each bin is treated as its count of values at the bin centre, and the bandwidth follows
+        Scott's rule from the binned standard deviation, but is never narrower than a bin. The curve is scaled to the counts, like
+        the KDE line of sns.histplot.
+
+        Args:
+            counts (np.ndarray): The bin counts.
+            edges (np.ndarray): The bin edges.
+            grid_size (int, optional): The number of points of the curve. Defaults to 200.
+
+        Returns:
+            tuple: The x and y values of the curve, or None if the values are constant.
+        """
+        counts = np.asarray(counts, dtype=np.float64)
+        edges = np.asarray(edges, dtype=np.float64)
+        centres = (edges[:-1] + edges[1:]) / 2
+        total = counts.sum()
+        if total == 0:
+            return None
+
+        mean = np.dot(counts, centres) / total
+        std = np.sqrt(np.dot(counts, (centres - mean) ** 2) / total)
+        if std == 0:
+            return None
+
+        # The bins hide any detail finer than their width, so the bandwidth is at least one bin
+        bin_width = np.diff(edges).mean()
+        bandwidth = max(1.06 * std * total ** -0.2, bin_width)
+
+        # Sum a Gaussian kernel per bin, weighted by the bin count
+        grid = np.linspace(edges[0], edges[-1], grid_size)
+        kernels = np.exp(-0.5 * ((grid[:, None] - centres[None, :]) / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+        density = kernels @ counts
+        return grid, density * bin_width
+
+    @staticmethod
+    def binned_skewness(counts: np.ndarray, edges: np.ndarray) -> float:
+        """
+        Approximate the skewness of a column from its histogram.
+
+        Args:
+            counts (np.ndarray): The bin counts.
+            edges (np.ndarray): The bin edges.
+
+        Returns:
+            float: The skewness of the bin centres weighted by the counts.
+        """
+        counts = np.asarray(counts, dtype=np.float64)
+        centres = (np.asarray(edges[:-1]) + np.asarray(edges[1:])) / 2
+        total = counts.sum()
+        if total == 0:
+            return np.nan
+        mean = np.dot(counts, centres) / total
+        std = np.sqrt(np.dot(counts, (centres - mean) ** 2) / total)
+        return float(np.dot(counts, (centres - mean) ** 3) / total / std ** 3) if std > 0 else 0.0
+
+    @staticmethod
+    def box_stats(series: pd.Series, max_fliers: int = 1000, seed: int = 0) -> Dict:
+        """
+        Compute the statistics of a boxplot, keeping at most `max_fliers` of the outliers.
+
+        Args:
+            series (pd.Series): The column.
+            max_fliers (int, optional): The maximum number of outliers drawn. Defaults to 1000.
+            seed (int, optional): Seed for choosing the outliers drawn. Defaults to 0.
+
+        Returns:
+            Dict: The statistics, in the format of `Axes.bxp`.
+        """
+        values = Plotter.numeric_values(series)
+        if len(values) == 0:
+            return {'med': np.nan, 'q1': np.nan, 'q3': np.nan, 'whislo': np.nan, 'whishi': np.nan, 'fliers': []}
+
+        q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+        low, high = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+
+        # The whiskers reach the most extreme values within 1.5 IQR of the box
+        inside = values[(values >= low) & (values <= high)]
+        fliers = values[(values < low) | (values > high)]
+        if len(fliers) > max_fliers:
+            # Keep the extremes and a random subset of the other outliers
+            rng = np.random.default_rng(seed)
+            fliers = np.concatenate([[fliers.min(), fliers.max()], rng.choice(fliers, max_fliers - 2, replace=False)])
+
+        return {'med': median, 'q1': q1, 'q3': q3, 'whislo': inside.min(), 'whishi': inside.max(), 'fliers': fliers}
+
+    def _plot_histogram(self, ax, counts: np.ndarray, edges: np.ndarray, kde: bool = True):
+        """
+        Draw a histogram from its counts and edges, with a KDE line estimated from the bins.
+        """
+        ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', alpha=0.6, edgecolor='white')
+        curve = self.binned_kde(counts, edges) if kde else None
+        if curve is not None:
+            ax.plot(*curve)
+
+    def plot_null_distribution(self, df: pd.DataFrame, max_blocks: int = 200) -> Optional[Union['plt.Figure', str]]:
         """
         Plot the distribution of null values in the DataFrame.
 
+        Rows are grouped into at most `max_blocks` consecutive blocks and each cell shows the
+        fraction of nulls in a block, so the heatmap stays the same size for any number of rows.
+
         Args:
             df (pd.DataFrame): The DataFrame to visualize.
+            max_blocks (int, optional): The maximum number of row blocks. Defaults to 200.
+
+        Returns:
+            plt.Figure or str: In headless mode, the figure, or the path it was saved to when an output directory is set.
         """
+        # Reduce the null mask to the null fraction of each block of rows
+        fractions = self.null_blocks(df, max_blocks)
+
         # Create a figure with a specific size
-        plt.figure(figsize=(10, 6))
+        fig, ax = self._subplots(figsize=(10, 6))
         
-        # Use seaborn to create a heatmap of null values in the DataFrame
-        sns.heatmap(df.isnull(), cbar=False, cmap='viridis')
+        # Use seaborn to create a heatmap of the null fractions
+        sns.heatmap(fractions, vmin=0, vmax=1, cmap='viridis', cbar_kws={'label': 'Fraction of nulls'}, ax=ax)
         
-        # Set the title of the plot
-        plt.title('Distribution of Null Values in DataFrame')
+        # Set the title and labels of the plot
+        ax.set_title('Distribution of Null Values in DataFrame')
+        ax.set_ylabel('First row of block')
         
-        # Display the plot
-        plt.show()
+        # Display the plot, or save it in headless mode
+        return self._finish(fig, 'null_distribution')
 
-    def plot_null_percentage(self, df: pd.DataFrame) -> None:
+    def plot_null_percentage(self, df: pd.DataFrame) -> Optional[Union['plt.Figure', str]]:
         """
         Plot the percentage of null values in each column.
 
         Args:
             df (pd.DataFrame): The DataFrame to visualize.
+
+        Returns:
+            plt.Figure or str: In headless mode, the figure, or the path it was saved to when an output directory is set.
         """
         # Calculate the percentage of null values in each column
         null_percent = df.isnull().mean() * 100
@@ -43,57 +299,77 @@ class Plotter:
         null_percent = null_percent[null_percent > 0]
 
         # Create a figure with a specific size
-        plt.figure(figsize=(12, 6))
+        fig, ax = self._subplots(figsize=(12, 6))
         
         # Use seaborn to create a bar plot of the null percentage for each column
-        sns.barplot(x=null_percent.index, y=null_percent.values)
+        sns.barplot(x=null_percent.index, y=null_percent.values, ax=ax)
         
         # Set the title and labels of the plot
-        plt.title('Percentage of Null Values by Column')
-        plt.ylabel('Percentage')
+        ax.set_title('Percentage of Null Values by Column')
+        ax.set_ylabel('Percentage')
         
         # Rotate the x-axis labels for better readability
-        plt.xticks(rotation=45)
+        ax.tick_params(axis='x', labelrotation=45)
         
-        # Display the plot
-        plt.show()
+        # Display the plot, or save it in headless mode
+        return self._finish(fig, 'null_percentage')
 
-    def plot_column_distribution(self, df: pd.DataFrame, column: str) -> None:
+    def plot_column_distribution(self, df: Optional[pd.DataFrame], column: str, bins: int = 50,
+                                 histogram: Optional[tuple] = None) -> Optional[Union['plt.Figure', str]]:
         """
         Plot the distribution of values in a specified column.
 
         Args:
-            df (pd.DataFrame): The DataFrame to visualize.
+            df (pd.DataFrame): The DataFrame to visualize. Can be None when `histogram` is given.
             column (str): The column to plot.
+            bins (int, optional): The number of bins. Defaults to 50.
+            histogram (tuple, optional): Pre-computed (counts, edges), e.g. from `Plotter.histogram`. Defaults to None.
+
+        Returns:
+            plt.Figure or str: In headless mode, the figure, or the path it was saved to when an output directory is set.
         """
+        # Bin the column's values, excluding nulls, unless the bins were given
+        counts, edges = histogram if histogram is not None else self.histogram(df[column], bins)
+
         # Create a figure with a specific size
-        plt.figure(figsize=(10, 6))
+        fig, ax = self._subplots(figsize=(10, 6))
         
-        # Use seaborn to create a histogram of the column's values, excluding nulls
-        sns.histplot(df[column].dropna(), kde=True)
+        # Draw the histogram and its KDE from the bins
+        self._plot_histogram(ax, counts, edges)
         
         # Set the title and labels of the plot
-        plt.title(f'Distribution of Values in {column}')
-        plt.xlabel(column)
-        plt.ylabel('Frequency')
+        ax.set_title(f'Distribution of Values in {column}')
+        ax.set_xlabel(column)
+        ax.set_ylabel('Frequency')
         
-        # Display the plot
-        plt.show()
+        # Display the plot, or save it in headless mode
+        return self._finish(fig, f'column_distribution_{column}')
 
-    def plot_skewness(self, df: pd.DataFrame, columns: List[str]) -> None:
+    def plot_skewness(self, df: Optional[pd.DataFrame], columns: List[str], bins: int = 50,
+                      histograms: Optional[Dict[str, tuple]] = None,
+                      diagnostics: Optional[Diagnostics] = None) -> Optional[Union['plt.Figure', str]]:
         """
         Plot the skewness of specified columns in the DataFrame.
 
         Args:
-            df (pd.DataFrame): The DataFrame to visualize.
+            df (pd.DataFrame): The DataFrame to visualize. Can be None when `histograms` covers every column.
             columns (List[str]): The list of columns to check skewness.
+            bins (int, optional): The number of bins. Defaults to 50.
+            histograms (Dict[str, tuple], optional): Pre-computed (counts, edges) for each column. The skewness
+                of these columns is then approximated from the bins. Defaults to None.
+            diagnostics (Diagnostics, optional): Diagnostics holding the skewness of the columns. Defaults to None.
+
+        Returns:
+            plt.Figure or str: In headless mode, the figure, or the path it was saved to when an output directory is set.
         """
+        histograms = histograms or {}
+
         # Number of columns for the grid
         num_columns = len(columns)
         num_rows = math.ceil(num_columns / 3)
 
         # Create subplots with a specific size
-        fig, axes = plt.subplots(num_rows, 3, figsize=(20, num_rows * 6))
+        fig, axes = self._subplots(num_rows, 3, figsize=(20, num_rows * 6))
 
         # Flatten axes array for easy iteration
         axes = axes.flatten()
@@ -102,11 +378,21 @@ class Plotter:
             # Select the axis for the current plot
             ax = axes[idx]
 
-            # Calculate skewness of the column
-            skewness = df[column].skew()
+            # Bin the column and calculate its skewness, unless it was already diagnosed
+            if column in histograms:
+                counts, edges = histograms[column]
+            else:
+                counts, edges = self.histogram(df[column], bins)
+
+            if diagnostics is not None and column in diagnostics:
+                skewness = diagnostics[column].skewness
+            elif column in histograms:
+                skewness = self.binned_skewness(counts, edges)
+            else:
+                skewness = df[column].skew()
 
             # Plot the histogram of the column values
-            sns.histplot(df[column].dropna(), bins=50, kde=True, ax=ax)
+            self._plot_histogram(ax, counts, edges)
 
             # Set the title including the skewness value
             ax.set_title(f'Distribution of Values in {column} (Skewness: {skewness:.2f})')
@@ -120,23 +406,37 @@ class Plotter:
         # Adjust layout
         fig.tight_layout()
 
-        # Display the plot
-        plt.show()
+        # Display the plot, or save it in headless mode
+        return self._finish(fig, 'skewness')
 
-    def plot_qq(self, df: pd.DataFrame, columns: List[str]) -> None:
+    def plot_qq(self, df: Optional[pd.DataFrame], columns: List[str],
+                diagnostics: Optional[Diagnostics] = None) -> Optional[Union['plt.Figure', str]]:
         """
         Plot Q-Q plots of the specified columns in a grid format.
 
+        Each plot shows a fixed number of quantiles of the column against the normal quantiles,
+        so the full column is never sorted.
+
         Args:
-            df (pd.DataFrame): The DataFrame to visualize.
+            df (pd.DataFrame): The DataFrame to visualize. Can be None when `diagnostics` covers every column.
             columns (List[str]): The list of columns to plot.
+            diagnostics (Diagnostics, optional): Diagnostics already computed for the columns. Defaults to
+                computing them on the DataFrame.
+
+        Returns:
+            plt.Figure or str: In headless mode, the figure, or the path it was saved to when an output directory is set.
         """
+        # Compute the quantiles of any column that was not diagnosed yet
+        missing = [column for column in columns if diagnostics is None or column not in diagnostics]
+        if missing:
+            diagnostics = (diagnostics or Diagnostics()).compute(df, missing)
+
         # Number of columns for the grid
         num_columns = len(columns)
         num_rows = math.ceil(num_columns / 3)
 
         # Create subplots with a specific size
-        fig, axes = plt.subplots(num_rows, 3, figsize=(20, num_rows * 6))
+        fig, axes = self._subplots(num_rows, 3, figsize=(20, num_rows * 6))
 
         # Flatten axes array for easy iteration
         axes = axes.flatten()
@@ -145,14 +445,19 @@ class Plotter:
             # Select the axis for the current plot
             ax = axes[idx]
 
-            # Create Q-Q plot
-            probplot(df[column].dropna(), dist="norm", plot=ax)
+            # Create Q-Q plot of the column's quantiles against the normal quantiles
+            column_diagnostics = diagnostics[column]
+            theoretical = column_diagnostics.theoretical_quantiles
+            slope, intercept, r = column_diagnostics.qq_fit()
+            ax.plot(theoretical, column_diagnostics.quantiles, 'o')
             
-            # Set the color of the Q-Q plot line to red
-            ax.get_lines()[1].set_color('red')
+            # Draw the fitted line in red
+            ax.plot(theoretical, slope * theoretical + intercept, color='red')
             
-            # Set the title of the subplot
+            # Set the title and labels of the subplot
             ax.set_title(f'Q-Q Plot of {column}')
+            ax.set_xlabel('Theoretical quantiles')
+            ax.set_ylabel('Ordered Values')
 
         # Hide any unused subplots
         for i in range(num_columns, len(axes)):
@@ -161,30 +466,42 @@ class Plotter:
         # Adjust layout
         fig.tight_layout()
 
-        # Display the plot
-        plt.show()
+        # Display the plot, or save it in headless mode
+        return self._finish(fig, 'qq')
 
-    def plot_categorical_data(self, df: pd.DataFrame, categorical_columns: List[str]) -> None:
+    def plot_categorical_data(self, df: Optional[pd.DataFrame], categorical_columns: List[str],
+                              counts: Optional[Dict[str, pd.Series]] = None) -> Optional[Union['plt.Figure', str]]:
         """
         Plot bar charts for categorical columns in a grid format.
 
         Args:
-            df (pd.DataFrame): The DataFrame to visualize.
+            df (pd.DataFrame): The DataFrame to visualize. Can be None when `counts` covers every column.
             categorical_columns (List[str]): List of categorical columns to plot.
+            counts (Dict[str, pd.Series], optional): Pre-computed value counts for each column, e.g. from
+                `DataCube.query([column])`. Defaults to None.
+
+        Returns:
+            plt.Figure or str: In headless mode, the figure, or the path it was saved to when an output directory is set.
         """
+        counts = counts or {}
+
         # Number of plots per row
         num_columns = 3
         num_rows = math.ceil(len(categorical_columns) / num_columns)
         
         # Create subplots with a specific size
-        fig, axes = plt.subplots(num_rows, num_columns, figsize=(num_columns * 5, num_rows * 5))
+        fig, axes = self._subplots(num_rows, num_columns, figsize=(num_columns * 5, num_rows * 5))
         
         # Flatten axes array for easy iteration
         axes = axes.flatten()
         
         for i, column in enumerate(categorical_columns):
-            # Use seaborn to create a count plot for each categorical column
-            sns.countplot(data=df, x=column, ax=axes[i])
+            # Count the values once, keeping the category order like sns.countplot
+            value_counts = counts[column] if column in counts else df[column].value_counts(sort=False)
+            value_counts = value_counts[value_counts > 0]
+
+            # Use seaborn to create a bar plot of the counts for each categorical column
+            sns.barplot(x=value_counts.index.astype(str), y=value_counts.to_numpy(), ax=axes[i])
             
             # Set the title and labels of the plot
             axes[i].set_title(f'Distribution of {column}')
@@ -192,35 +509,41 @@ class Plotter:
             axes[i].set_xlabel(column)
         
         # Remove any empty subplots
-        for j in range(i + 1, len(axes)):
+        for j in range(len(categorical_columns), len(axes)):
             fig.delaxes(axes[j])
         
         # Adjust layout
-        plt.tight_layout()
+        fig.tight_layout()
         
-        # Display the plot
-        plt.show()
+        # Display the plot, or save it in headless mode
+        return self._finish(fig, 'categorical_data')
 
-    def plot_boxplots(self, df: pd.DataFrame, columns: List[str], rows: int = 2, cols: int = 3, figsize: tuple = (15, 10)) -> None:
+    def plot_boxplots(self, df: pd.DataFrame, columns: List[str], rows: int = 2, cols: int = 3, figsize: tuple = (15, 10)) -> Optional[Union['plt.Figure', str]]:
         """
         Plot boxplots for the specified columns.
 
+        The boxes are drawn from quantiles computed with NumPy, and at most 1000 outliers are drawn per column.
+
         Args:
             df (pd.DataFrame): The DataFrame to visualize.
             columns (List[str]): List of columns to plot.
             rows (int): Number of rows in the grid.
             cols (int): Number of columns in the grid.
             figsize (tuple): Size of the figure.
+
+        Returns:
+            plt.Figure or str: In headless mode, the figure, or the path it was saved to when an output directory is set.
         """
         # Create subplots with a specific size
-        fig, axes = plt.subplots(rows, cols, figsize=figsize)
+        fig, axes = self._subplots(rows, cols, figsize=figsize)
         
         # Flatten axes array for easy iteration
         axes = axes.flatten()
 
         for i, col in enumerate(columns):
-            # Use seaborn to create a boxplot for each column
-            sns.boxplot(y=df[col], ax=axes[i])
+            # Draw a boxplot for each column from its quantiles
+            axes[i].bxp([self.box_stats(df[col])], showfliers=True, widths=0.5)
+            axes[i].set_xticks([])
             
             # Set the title of the plot
             axes[i].set_title(col)
@@ -230,34 +553,46 @@ class Plotter:
             fig.delaxes(axes[i])
 
         # Adjust layout
-        plt.tight_layout()
+        fig.tight_layout()
         
-        # Display the plot
-        plt.show()
+        # Display the plot, or save it in headless mode
+        return self._finish(fig, 'boxplots')
 
-    def correlation_matrix(self, df: pd.DataFrame) -> None:
+    def correlation_matrix(self, df: Optional[pd.DataFrame], corr: Optional[pd.DataFrame] = None,
+                           annotate: Optional[bool] = None) -> Optional[Union['plt.Figure', str]]:
         """
         Plot a heatmap of the correlation matrix of the DataFrame.
 
         Args:
-            df (pd.DataFrame): The DataFrame to visualize.
+            df (pd.DataFrame): The DataFrame to visualize. Can be None when `corr` is given.
+            corr (pd.DataFrame, optional): A correlation matrix already computed, e.g. from
+                `CorrelationAccumulator.pearson()`. Defaults to computing it from `df`.
+            annotate (bool, optional): Write the correlation in each cell. Defaults to annotating
+                matrices of at most 20 columns, where the numbers are still readable.
+
+        Returns:
+            plt.Figure or str: In headless mode, the figure, or the path it was saved to when an output directory is set.
         """
-        # Calculate the correlation matrix
-        corr = df.corr()
+        # Calculate the correlation matrix, unless it was given
+        if corr is None:
+            corr = correlate(df, sample_size=0).pearson()
+        if annotate is None:
+            annotate = len(corr.columns) <= 20
         
         # Create a figure with a specific size
-        plt.figure(figsize=(12, 10))
+        fig, ax = self._subplots(figsize=(12, 10))
         
         # Use seaborn to create a heatmap of the correlation matrix
-        sns.heatmap(corr, annot=True, fmt=".2f", cmap='coolwarm', linewidths=0.5)
+        sns.heatmap(corr, annot=annotate, fmt=".2f", cmap='coolwarm', vmin=-1, vmax=1,
+                    linewidths=0.5 if annotate else 0, ax=ax)
         
         # Set the title of the plot
-        plt.title('Correlation Matrix')
+        ax.set_title('Correlation Matrix')
         
-        # Display the plot
-        plt.show()
+        # Display the plot, or save it in headless mode
+        return self._finish(fig, 'correlation_matrix')
 
-    def plot_bar_chart(self, df: pd.DataFrame, title: str, xlabel: str, ylabel: str) -> None:
+    def plot_bar_chart(self, df: pd.DataFrame, title: str, xlabel: str, ylabel: str) -> Optional[Union['plt.Figure', str]]:
         """
         Plot a bar chart.
 
@@ -266,25 +601,28 @@ class Plotter:
             title (str): Title of the chart.
             xlabel (str): Label for the x-axis.
             ylabel (str): Label for the y-axis.
+
+        Returns:
+            plt.Figure or str: In headless mode, the figure, or the path it was saved to when an output directory is set.
         """
         # Create a figure with a specific size
-        plt.figure(figsize=(12, 6))
+        fig, ax = self._subplots(figsize=(12, 6))
         
         # Use seaborn to create a bar plot
-        sns.barplot(x=df.index, y=df.values, palette="viridis")
+        sns.barplot(x=df.index, y=df.values, palette="viridis", ax=ax)
 
         # Set the title and labels of the plot
-        plt.title(title)
-        plt.xlabel(xlabel)
-        plt.ylabel(ylabel)
+        ax.set_title(title)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
         
         # Rotate the x-axis labels for better readability
-        plt.xticks(rotation=45)
+        ax.tick_params(axis='x', labelrotation=45)
 
-        # Display the plot
-        plt.show()
+        # Display the plot, or save it in headless mode
+        return self._finish(fig, title)
 
-    def plot_stacked_bar_chart(self, df: pd.DataFrame, title: str, xlabel: str, ylabel: str) -> None:
+    def plot_stacked_bar_chart(self, df: pd.DataFrame, title: str, xlabel: str, ylabel: str) -> Optional[Union['plt.Figure', str]]:
         """
         Plot a stacked bar chart.
 
@@ -293,20 +631,75 @@ class Plotter:
             title (str): Title of the chart.
             xlabel (str): Label for the x-axis.
             ylabel (str): Label for the y-axis.
+
+        Returns:
+            plt.Figure or str: In headless mode, the figure, or the path it was saved to when an output directory is set.
         """
         # Reset the index to plot the multi-index DataFrame
         df = df.unstack(level=-1)
         
         # Plot the DataFrame as a stacked bar chart
-        df.plot(kind='bar', stacked=True, figsize=(12, 6), colormap='viridis')
+        fig, ax = self._subplots(figsize=(12, 6))
+        df.plot(kind='bar', stacked=True, colormap='viridis', ax=ax)
 
         # Set the title and labels of the plot
-        plt.title(title)
-        plt.xlabel(xlabel)
-        plt.ylabel(ylabel)
+        ax.set_title(title)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
         
         # Rotate the x-axis labels for better readability
-        plt.xticks(rotation=45)
+        ax.tick_params(axis='x', labelrotation=45)
         
-        # Display the plot
-        plt.show()
+        # Display the plot, or save it in headless mode
+        return self._finish(fig, title)
+
+
+def _render_spec(spec: Dict, output_dir: str, file_format: str, dpi: int) -> Dict:
+    """
+    Render one plot spec in a worker process and time it.
+    """
+    # Import the plotting libraries before the timer starts, so the first figure of each worker
+    # is not charged for loading them
+    import matplotlib.pyplot
+    import seaborn
+
+    plotter = Plotter(headless=True, output_dir=output_dir, file_format=file_format, dpi=dpi)
+
+    start = time.perf_counter()
+    try:
+        path = plotter.render(spec['method'], *spec.get('args', []), name=spec.get('name'), **spec.get('kwargs', {}))
+        error = None
+    except Exception as e:
+        path, error = None, f"{type(e).__name__}: {e}"
+
+    return {'method': spec['method'], 'name': spec.get('name'), 'path': path,
+            'seconds': time.perf_counter() - start, 'error': error}
+
+
+def render_batch(specs: List[Dict], output_dir: str, file_format: str = 'png', dpi: int = 100,
+                 max_workers: Optional[int] = None) -> List[Dict]:
+    """
+    Render many plots headlessly in a process pool and save them to a directory.
+
+    Each spec names a Plotter method and its arguments, for example the per-region bounce rate charts:
+    {'method': 'plot_bar_chart', 'args': [series, 'Bounce Rate for Africa', 'Traffic Type', 'Average Bounce Rate'],
+    'name': 'bounce_rate_africa'}.
+
+    Args:
+        specs (List[Dict]): The plots to render, each with 'method' and optional 'args', 'kwargs' and 'name'.
+        output_dir (str): The directory to save the figures to.
+        file_format (str, optional): The image format, e.g. 'png' or 'svg'. Defaults to 'png'.
+        dpi (int, optional): The resolution of raster images. Defaults to 100.
+        max_workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+
+    Returns:
+        List[Dict]: For each spec, in order, the saved path, the render time in seconds and any error.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Give every spec a distinct file name, since the workers do not share their name counters
+    specs = [spec if spec.get('name') else {**spec, 'name': f"{index:04d}_{spec['method']}"} for index, spec in enumerate(specs)]
+
+    with process_pool(max_workers) as executor:
+        futures = [executor.submit(_render_spec, spec, output_dir, file_format, dpi) for spec in specs]
+        return [future.result() for future in futures]
@@ -0,0 +1,57 @@
+"""
+Utilities for extracting, transforming and analysing the online shopping customer activity data.
+
+The main classes can be imported from the package itself, e.g. `from utils import DataExtractor`.
+Each is imported from its module on first use, so a job only loads the modules it uses, and heavy
+dependencies such as SQLAlchemy and SciPy are only imported by the functions that need them.
+"""
+import importlib
+from typing import List
+
+# The module each public name is imported from, on first use
+_EXPORTS = {
+    'RDSDatabaseConnector': 'db_utils',
+    'DataExtractor': 'data_extraction',
+    'AsyncRDSDatabaseConnector': 'async_extraction',
+    'AsyncDataExtractor': 'async_extraction',
+    'DataCache': 'data_cache',
+    'DataTransformer': 'data_transformer',
+    'ChunkedTransformer': 'chunked_pipeline',
+    'ChunkSink': 'chunked_pipeline',
+    'DataFrameInfo': 'data_frame_info',
+    'DataFrameProfiler': 'profiler',
+    'ProfileResult': 'profiler',
+    'DataCube': 'data_cube',
+    'DtypePlanner': 'dtype_planner',
+    'Diagnostics': 'diagnostics',
+    'CorrelationAccumulator': 'correlation',
+    'correlate': 'correlation',
+    'outlier_bounds': 'outliers',
+    'MissingnessAnalyzer': 'missingness',
+    'analyze_missingness': 'missingness',
+    'StratifiedReservoir': 'sampling',
+    'StratifiedSample': 'sampling',
+    'ColumnExecutor': 'parallel',
+    'Pipeline': 'pipeline',
+    'trace_run': 'instrumentation',
+    'LazyModule': 'lazy_imports',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    """
+    Import a public name from its module the first time it is used.
+    """
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'utils' has no attribute '{name}'")
+    value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+
+    # Later lookups find the name directly, without calling __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,276 @@
+import asyncio
+import pandas as pd
+from sqlalchemy import URL, inspect
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.util import greenlet_spawn
+from typing import AsyncIterator, Callable, Dict, List, Optional, Union
+from .data_extraction import SQL_AGGREGATES, DataExtractor
+from .db_utils import RDSDatabaseConnector
+from .instrumentation import instrument_engine
+
+
+class AsyncRDSDatabaseConnector(RDSDatabaseConnector):
+    """
+    The asyncio counterpart of RDSDatabaseConnector, connecting with the asyncpg driver.
+    """
+
+    def _init_db_engine(self):
+        """
+        Initialize an async database engine from the same credentials, and pool settings, as RDSDatabaseConnector.
+
+        Returns:
+            sqlalchemy.ext.asyncio.AsyncEngine: The initialized async database engine.
+        """
+        url_object = URL.create(
+            "postgresql+asyncpg",
+            username=self.creds['RDS_USER'],
+            password=self.creds['RDS_PASSWORD'],
+            host=self.creds['RDS_HOST'],
+            port=self.creds.get('RDS_PORT'),
+            database=self.creds['RDS_DATABASE'],
+        )
+        engine = create_async_engine(
+            url_object,
+            pool_size=self.creds.get('RDS_POOL_SIZE', 5),
+            max_overflow=self.creds.get('RDS_MAX_OVERFLOW', 10),
+            pool_pre_ping=self.creds.get('RDS_POOL_PRE_PING', True),
+            pool_recycle=self.creds.get('RDS_POOL_RECYCLE', 1800),
+        )
+
+        # Queries run on the underlying sync engine, which is where the trace hooks attach
+        instrument_engine(engine.sync_engine)
+        return engine
+
+
+class AsyncDataExtractor:
+    """
+    A class for extracting data without blocking the event loop, with several queries in flight at once.
+
+    Queries are built by the DataExtractor query builders and run over an AsyncEngine, so the
+    rows are fetched by an async driver (asyncpg for PostgreSQL, aiosqlite for a local SQLite
+    stand-in) while other tasks run. At most `max_concurrency` queries run at a time, each
+    query is cancelled after `timeout` seconds, and cancelling a task cancels its query and
+    returns its connection to the pool.
+
+    Example:
+        engine = create_async_engine('sqlite+aiosqlite:///customer_activity.db')
+        extractor = AsyncDataExtractor(engine, max_concurrency=4, timeout=60)
+        tables = await extractor.read_tables(['customer_activity', 'products'])
+    """
+
+    def __init__(self, engine: AsyncEngine, max_concurrency: Optional[int] = None, timeout: Optional[float] = None):
+        """
+        Initialize the AsyncDataExtractor with a SQLAlchemy AsyncEngine.
+
+        Args:
+            engine (sqlalchemy.ext.asyncio.AsyncEngine): The async engine to use for data extraction.
+            max_concurrency (int, optional): The maximum number of queries running at once.
+                Defaults to the size of the engine's connection pool.
+            timeout (float, optional): The number of seconds after which a query is cancelled. Defaults to None.
+        """
+        self.engine = engine
+        self.timeout = timeout
+
+        # The query builders of the sync extractor, bound to the engine the async engine wraps
+        self.builder = DataExtractor(engine.sync_engine)
+
+        pool = engine.sync_engine.pool
+        self.max_concurrency = max_concurrency or (pool.size() if hasattr(pool, 'size') else 1)
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def _run(self, func: Callable, connect: bool = True):
+        """
+        Run a function taking a sync connection, within the concurrency limit and the timeout.
+
+        The function runs in SQLAlchemy's greenlet bridge, so it can use the sync pandas and
+        SQLAlchemy APIs while every round trip to the database is awaited. With `connect=False`
+        it is called without arguments, for sync DataExtractor helpers that open their own connection.
+        """
+        async with self.semaphore:
+            async with asyncio.timeout(self.timeout):
+                if not connect:
+                    return await greenlet_spawn(func)
+                async with self.engine.connect() as connection:
+                    return await connection.run_sync(func)
+
+    async def read_table(self, table_name: str, columns: Optional[List[str]] = None, where: Optional[str] = None,
+                         params: Optional[Dict] = None, dtypes: Optional[Dict] = None) -> pd.DataFrame:
+        """
+        Read a table from the database into a pandas DataFrame.
+
+        Args:
+            table_name (str): The name of the table to read from the database.
+            columns (List[str], optional): Columns to read. Defaults to all columns.
+            where (str, optional): A SQL predicate using named bind parameters. Defaults to None.
+            params (Dict, optional): Values for the bind parameters used in `where`. Defaults to None.
+            dtypes (Dict, optional): Mapping of column names to the dtypes to convert them to. Defaults to None.
+
+        Returns:
+            pd.DataFrame: A DataFrame containing the table data.
+        """
+        query = self.builder._build_select_query(table_name, columns, where)
+        data_frame = await self._run(lambda connection: pd.read_sql(query, connection, params=params))
+
+        if dtypes:
+            data_frame = self.builder._apply_dtypes(data_frame, dtypes)
+        return data_frame
+
+    async def read_table_parallel(self, table_name: str, partition_column: Optional[str] = None,
+                                  num_partitions: Optional[int] = None, columns: Optional[List[str]] = None,
+                                  where: Optional[str] = None, params: Optional[Dict] = None,
+                                  dtypes: Optional[Dict] = None) -> pd.DataFrame:
+        """
+        Read a table by fetching ranges of it concurrently.
+
+        The table is split as in `DataExtractor.read_rds_table_parallel`, on `partition_column` or
+        on ctid ranges for PostgreSQL, and the partitions are read as concurrent queries.
+
+        Args:
+            table_name (str): The name of the table to read from the database.
+            partition_column (str, optional): A numeric column to split the table on. Defaults to None.
+            num_partitions (int, optional): The number of partitions. Defaults to `max_concurrency`.
+            columns (List[str], optional): Columns to read. Defaults to all columns.
+            where (str, optional): A SQL predicate using named bind parameters. Defaults to None.
+            params (Dict, optional): Values for the bind parameters used in `where`. Defaults to None.
+            dtypes (Dict, optional): Mapping of column names to the dtypes to convert them to. Defaults to None.
+
+        Returns:
+            pd.DataFrame: A DataFrame containing the table data, in partition order.
+        """
+        num_partitions = num_partitions or self.max_concurrency
+        partitions = await self._run(lambda: self.builder._partition_predicates(
+            table_name, partition_column, num_partitions, where, params), connect=False)
+        if not partitions:
+            return await self.read_table(table_name, columns, where, params, dtypes)
+
+        def read_partition(predicate, partition_params):
+            query = self.builder._build_select_query(table_name, columns, where).where(predicate)
+            return lambda connection: pd.read_sql(query, connection, params={**(params or {}), **partition_params})
+
+        frames = await self._gather([self._run(read_partition(*partition)) for partition in partitions])
+
+        # Concatenate once, then convert so categorical columns share one set of categories
+        data_frame = pd.concat(frames, ignore_index=True)
+        if dtypes:
+            data_frame = self.builder._apply_dtypes(data_frame, dtypes)
+        return data_frame
+
+    async def stream_table(self, table_name: str, chunk_size: int = 50000, columns: Optional[List[str]] = None,
+                           where: Optional[str] = None, params: Optional[Dict] = None, limit: Optional[int] = None,
+                           offset: Optional[int] = None, dtypes: Optional[Dict] = None) -> AsyncIterator[pd.DataFrame]:
+        """
+        Stream a table as DataFrame chunks using a server-side cursor.
+
+        The stream holds one of the `max_concurrency` slots until it is exhausted or closed, and
+        the timeout applies to fetching each chunk.
+
+        Args:
+            table_name (str): The name of the table to read from the database.
+            chunk_size (int, optional): Number of rows per chunk. Defaults to 50000.
+            columns (List[str], optional): Columns to read. Defaults to all columns.
+            where (str, optional): A SQL predicate using named bind parameters. Defaults to None.
+            params (Dict, optional): Values for the bind parameters used in `where`. Defaults to None.
+            limit (int, optional): Maximum number of rows to read. Defaults to None.
+            offset (int, optional): Number of rows to skip. Defaults to None.
+            dtypes (Dict, optional): Mapping of column names to the dtypes to convert them to. Defaults to None.
+
+        Yields:
+            pd.DataFrame: The next chunk of at most `chunk_size` rows.
+        """
+        query = self.builder._build_select_query(table_name, columns, where, limit, offset)
+
+        async with self.semaphore:
+            async with self.engine.connect() as connection:
+                async with asyncio.timeout(self.timeout):
+                    result = await connection.stream(query, params or {})
+                column_names = list(result.keys())
+                partitions = result.partitions(chunk_size)
+
+                while True:
+                    async with asyncio.timeout(self.timeout):
+                        rows = await anext(partitions, None)
+                    if rows is None:
+                        break
+                    chunk = pd.DataFrame.from_records(rows, columns=column_names, coerce_float=True)
+                    if dtypes:
+                        chunk = self.builder._apply_dtypes(chunk, dtypes)
+                    yield chunk
+
+    async def aggregate(self, table_name: str, dimensions: Optional[List[str]] = None,
+                        measures: Optional[Dict[str, Union[str, List[str]]]] = None,
+                        filters: Optional[Dict] = None) -> pd.DataFrame:
+        """
+        Aggregate a table in the database with a parameterized GROUP BY, transferring only the result.
+
+        Args:
+            table_name (str): The name of the table to aggregate.
+            dimensions (List[str], optional): The columns to group by. Defaults to a grand total.
+            measures (Dict, optional): Mapping of columns to an aggregation or list of aggregations
+                ('sum', 'mean', 'min', 'max', 'count'), e.g. {'revenue': 'sum'}. Defaults to None.
+            filters (Dict, optional): Mapping of columns to a value, or to a list of allowed values. Defaults to None.
+
+        Returns:
+            pd.DataFrame: One row per group with the dimensions, a 'rows' count and a '<column>_<aggregation>'
+            column per measure.
+        """
+        dimensions = list(dimensions or [])
+        measures = self.builder._normalize_measures(measures or {})
+
+        unknown = [aggregation for _, aggregation, _ in measures if aggregation not in SQL_AGGREGATES]
+        if unknown:
+            print(f"Aggregations {unknown} are not recognized. Use 'sum', 'mean', 'min', 'max' or 'count'.")
+            return None
+
+        # The column types are looked up on the first aggregation of a table, and remembered
+        if table_name not in self.builder._column_types:
+            column_info = await self._run(lambda connection: inspect(connection).get_columns(table_name))
+            self.builder._column_types[table_name] = {info['name']: info['type'] for info in column_info}
+
+        query = self.builder._build_aggregate_query(table_name, dimensions, measures, filters)
+        return await self._run(lambda connection: pd.read_sql(query, connection))
+
+    async def read_tables(self, tables: Union[List[str], Dict[str, Dict]],
+                          return_exceptions: bool = False) -> Dict[str, Union[pd.DataFrame, BaseException]]:
+        """
+        Read several tables concurrently.
+
+        Args:
+            tables (List[str] or Dict[str, Dict]): The table names, or a mapping of table names to the
+                keyword arguments of `read_table` for each, e.g. {'customer_activity': {'columns': ['month']}}.
+            return_exceptions (bool, optional): Return the exception of a failed or timed out table in
+                its place. Otherwise the first failure cancels the other reads and is raised. Defaults to False.
+
+        Returns:
+            Dict[str, pd.DataFrame]: The DataFrame of each table, by table name.
+        """
+        if not isinstance(tables, dict):
+            tables = {table_name: {} for table_name in tables}
+
+        reads = [self.read_table(table_name, **kwargs) for table_name, kwargs in tables.items()]
+        frames = await self._gather(reads, return_exceptions)
+        return dict(zip(tables, frames))
+
+    @staticmethod
+    async def _gather(coroutines: List, return_exceptions: bool = False) -> List:
+        """
+        Run coroutines concurrently and return their results in order.
+
+        Unless `return_exceptions` is set, the first exception cancels the coroutines still
+        running, waits for them to release their connections, and is raised.
+        """
+        tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+        if return_exceptions:
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            # Also reached when the caller itself is cancelled
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        for task in tasks:
+            if not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+        return [task.result() for task in tasks]
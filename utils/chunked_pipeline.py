@@ -0,0 +1,279 @@
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
+from .data_transformer import DataTransformer
+from .outliers import DEFAULT_THRESHOLDS, outlier_bounds
+from .parallel import fit_power_lambda
+from .sketches import FrequencyAccumulator, MomentAccumulator, ReservoirSample
+
+class ChunkedTransformer:
+    """
+    A class for running a sequence of DataTransformer operations over an iterator of DataFrame chunks.
+
+    Steps are recorded with the same methods as DataTransformer. `fit()` gathers the statistics
+    the steps need (imputation values and power-transform lambdas) in streaming passes over the
+    chunks, using mergeable accumulators, and `run()` transforms the chunks one at a time into a
+    sink. Peak memory is bounded by the chunk size and the sample size, not by the table size.
+
+    Means, modes and z-score bounds are exact. Medians, power-transform lambdas and the other
+    outlier bounds are computed from a uniform reservoir sample of `sample_size` values per column.
+    """
+
+    def __init__(self, sample_size: int = 100000, seed: int = 0):
+        """
+        Initialize the ChunkedTransformer.
+
+        Args:
+            sample_size (int, optional): Size of the reservoir sample per column for approximate statistics.
+                Defaults to 100000.
+            seed (int, optional): Seed for the reservoir samples. Defaults to 0.
+        """
+        self.sample_size = sample_size
+        self.seed = seed
+        self.steps = []
+        self.fitted = {}
+
+    def convert_columns(self, columns: List[str], dtype, errors: str = 'coerce') -> 'ChunkedTransformer':
+        """
+        Record a `DataTransformer.convert_columns` step.
+        """
+        self.steps.append({'op': 'convert_columns', 'columns': list(columns), 'dtype': dtype, 'errors': errors})
+        return self
+
+    def impute_null(self, columns: List[str], method: str = 'mean') -> 'ChunkedTransformer':
+        """
+        Record a `DataTransformer.impute_null` step.
+        """
+        self.steps.append({'op': 'impute_null', 'columns': list(columns), 'method': method})
+        return self
+
+    def remove_null(self, columns: List[str]) -> 'ChunkedTransformer':
+        """
+        Record a `DataTransformer.remove_null` step.
+        """
+        self.steps.append({'op': 'remove_null', 'columns': list(columns)})
+        return self
+
+    def transform_skewed_columns(self, columns: List[str], method: str = 'box-cox') -> 'ChunkedTransformer':
+        """
+        Record a `DataTransformer.transform_skewed_columns` step.
+        """
+        self.steps.append({'op': 'transform_skewed_columns', 'columns': list(columns), 'method': method})
+        return self
+
+    def handle_outliers(self, columns: List[str], method: str = 'iqr', action: str = 'clip',
+                        threshold: Optional[float] = None) -> 'ChunkedTransformer':
+        """
+        Record a `DataTransformer.handle_outliers` step.
+        """
+        self.steps.append({'op': 'handle_outliers', 'columns': list(columns), 'method': method, 'action': action,
+                           'threshold': threshold})
+        return self
+
+    @staticmethod
+    def _needs_fit(step: Dict) -> bool:
+        """
+        Check whether a step needs statistics over all rows.
+        """
+        if step['op'] in ('impute_null', 'handle_outliers'):
+            return True
+        return step['op'] == 'transform_skewed_columns' and step['method'] != 'log'
+
+    def _new_accumulator(self, step: Dict):
+        """
+        Create the accumulator gathering the statistic of one column for a step.
+        """
+        method = step['method']
+        if method in ('mean', 'zscore'):
+            return MomentAccumulator()
+        if method == 'mode':
+            return FrequencyAccumulator()
+        return ReservoirSample(self.sample_size, self.seed)
+
+    def _apply_step(self, chunk: pd.DataFrame, index: int, step: Dict) -> pd.DataFrame:
+        """
+        Apply a row-independent step, a filter, or an already fitted step to a chunk.
+        """
+        transformer = DataTransformer(chunk, copy=False)
+        if step['op'] == 'convert_columns':
+            return transformer.convert_columns(step['columns'], step['dtype'], step['errors'])
+        if step['op'] == 'remove_null':
+            return transformer.remove_null(step['columns'])
+        if not self._needs_fit(step):
+            return transformer.transform_skewed_columns(step['columns'], step['method'])
+
+        # Fitted steps are applied through the DataTransformer fit/transform API
+        key = {'impute_null': 'impute', 'handle_outliers': 'outliers'}.get(step['op'], 'power')
+        transformer.fitted_params = {'impute': {}, 'power': {}, 'outliers': {}}
+        transformer.fitted_params[key] = self.fitted[index]
+        return transformer.transform()
+
+    def _finalize(self, step: Dict, accumulators: Dict) -> Dict:
+        """
+        Turn the accumulators of a step into its fitted parameters.
+        """
+        params = {}
+        for column, accumulator in accumulators.items():
+            if step['op'] == 'impute_null':
+                if step['method'] == 'mean':
+                    value = accumulator.mean if accumulator.count else None
+                elif step['method'] == 'median':
+                    value = float(accumulator.quantile(0.5))
+                else:
+                    value = accumulator.mode()
+                # A column without any values is left as it is, as the eager impute_null leaves it
+                if pd.isna(value):
+                    continue
+                params[column] = {'method': step['method'], 'value': value}
+            elif step['op'] == 'handle_outliers':
+                if step['method'] == 'zscore':
+                    threshold = DEFAULT_THRESHOLDS['zscore'] if step['threshold'] is None else step['threshold']
+                    lower = accumulator.mean - threshold * accumulator.std
+                    upper = accumulator.mean + threshold * accumulator.std
+                else:
+                    lower, upper = outlier_bounds(accumulator.values.astype(float)[:, None], step['method'],
+                                                  step['threshold'], seed=self.seed)
+                    lower, upper = lower[0], upper[0]
+                params[column] = {'method': step['method'], 'lower': float(lower), 'upper': float(upper),
+                                  'action': step['action']}
+            else:
+                lmbda = fit_power_lambda(accumulator.values.astype(float), step['method'])
+                params[column] = {'method': step['method'], 'lambda': lmbda}
+        return params
+
+    def fit(self, chunks: Callable[[], Iterable[pd.DataFrame]]) -> Dict:
+        """
+        Gather the statistics of every step that needs them, in as few passes over the chunks as possible.
+
+        A pass applies the steps that can already be applied and accumulates statistics for every
+        unfitted step whose input does not depend on another unfitted step. Steps downstream of an
+        unfitted step are left for the next pass, so each statistic sees the same data it would in
+        the eager DataTransformer.
+
+        Args:
+            chunks (Callable[[], Iterable[pd.DataFrame]]): A function returning a fresh iterator of chunks,
+                e.g. `lambda: extractor.stream_rds_table('customer_activity')`.
+
+        Returns:
+            Dict: The fitted parameters, keyed by step index.
+        """
+        self.fitted = {}
+        while any(self._needs_fit(step) and index not in self.fitted for index, step in enumerate(self.steps)):
+            accumulators = {}
+
+            for chunk in chunks():
+                chunk = chunk.copy()
+                dirty = set()
+                for index, step in enumerate(self.steps):
+                    # Stop at the first step reading a column an unfitted step has yet to produce
+                    if set(step['columns']) & dirty:
+                        break
+
+                    if self._needs_fit(step) and index not in self.fitted:
+                        step_accumulators = accumulators.setdefault(index, {})
+                        for column in step['columns']:
+                            if column in chunk.columns:
+                                step_accumulators.setdefault(column, self._new_accumulator(step)).update(chunk[column].to_numpy())
+                        dirty |= set(step['columns'])
+                        if step['op'] == 'handle_outliers' and step['action'] == 'drop':
+                            # Later steps must not see the rows this step will drop
+                            break
+                    else:
+                        chunk = self._apply_step(chunk, index, step)
+
+            if not accumulators:
+                break
+            for index, step_accumulators in accumulators.items():
+                self.fitted[index] = self._finalize(self.steps[index], step_accumulators)
+
+        return self.fitted
+
+    def transform(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Apply every step to each chunk, using the fitted statistics.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): The chunks to transform.
+
+        Yields:
+            pd.DataFrame: The transformed chunks.
+        """
+        for chunk in chunks:
+            chunk = chunk.copy()
+            for index, step in enumerate(self.steps):
+                chunk = self._apply_step(chunk, index, step)
+            yield chunk
+
+    def run(self, chunks: Callable[[], Iterable[pd.DataFrame]], sink: Union[str, Callable[[pd.DataFrame], None]]) -> int:
+        """
+        Fit the steps if needed, then transform the chunks and write them to a sink.
+
+        Args:
+            chunks (Callable[[], Iterable[pd.DataFrame]]): A function returning a fresh iterator of chunks.
+            sink (str or Callable): A .csv or .parquet file path, or a function called with each transformed chunk.
+
+        Returns:
+            int: The number of rows written.
+        """
+        if any(self._needs_fit(step) and index not in self.fitted for index, step in enumerate(self.steps)):
+            self.fit(chunks)
+
+        writer = ChunkSink(sink) if isinstance(sink, str) else None
+        rows_written = 0
+        try:
+            for chunk in self.transform(chunks()):
+                if writer is not None:
+                    writer.write(chunk)
+                else:
+                    sink(chunk)
+                rows_written += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+
+        return rows_written
+
+
+class ChunkSink:
+    """
+    A class for writing DataFrame chunks to a single CSV or Parquet file.
+    """
+
+    def __init__(self, file_path: str):
+        """
+        Initialize the sink. The file format is chosen from the extension.
+
+        Args:
+            file_path (str): The path of the .csv or .parquet file to write.
+        """
+        self.file_path = file_path
+        self.parquet = os.path.splitext(file_path)[1] == '.parquet'
+        self.writer = None
+        self.chunks_written = 0
+
+    def write(self, chunk: pd.DataFrame):
+        """
+        Write one chunk to the file.
+
+        Args:
+            chunk (pd.DataFrame): The chunk to write.
+        """
+        if self.parquet:
+            arrow_table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.file_path, arrow_table.schema)
+            self.writer.write_table(arrow_table.cast(self.writer.schema))
+        else:
+            # Only write the header with the first chunk
+            chunk.to_csv(self.file_path, mode='w' if self.chunks_written == 0 else 'a',
+                         header=self.chunks_written == 0, index=False)
+        self.chunks_written += 1
+
+    def close(self):
+        """
+        Close the file.
+        """
+        if self.writer is not None:
+            self.writer.close()
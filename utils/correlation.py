@@ -0,0 +1,265 @@
+import numpy as np
+import pandas as pd
+from typing import Iterable, List, Optional
+
+class CorrelationAccumulator:
+    """
+    A class for computing the correlations of many numeric columns incrementally.
+
+    Pearson correlations are accumulated block by block of rows from float32 sums of the
+    values, their squares and their cross-products. Each column is shifted by its mean in the
+    first block before the float32 products, which keeps the sums accurate. The sums only count
+    the rows where both columns of a pair are present, so the result matches `df.corr()`.
+
+    Spearman correlations need ranks, so they are computed on a uniform reservoir sample of the
+    rows. Both come with Fisher z confidence bounds.
+    """
+
+    def __init__(self, columns: Optional[List[str]] = None, block_size: int = 65536, sample_size: int = 100000,
+                 seed: int = 0):
+        """
+        Initialize an empty accumulator.
+
+        Args:
+            columns (List[str], optional): The columns to correlate. Defaults to the numeric and boolean
+                columns of the first chunk.
+            block_size (int, optional): The number of rows summed at a time in float32. Defaults to 65536.
+            sample_size (int, optional): The number of rows kept for Spearman correlations. Pass 0 to keep none.
+                Defaults to 100000.
+            seed (int, optional): Seed for the row sample. Defaults to 0.
+        """
+        self.columns = list(columns) if columns is not None else None
+        self.block_size = block_size
+        self.sample_size = sample_size
+        self.rng = np.random.default_rng(seed)
+        self.shift = None
+        self.sample_keys = np.empty(0)
+        self.sample = None
+
+    def _reset(self):
+        """
+        Allocate the pairwise sums for the columns.
+        """
+        width = len(self.columns)
+        self.pair_counts = np.zeros((width, width))
+        self.sums = np.zeros((width, width))
+        self.squares = np.zeros((width, width))
+        self.products = np.zeros((width, width))
+        self.sample = np.empty((0, width), dtype=np.float32)
+
+    def update(self, chunk: pd.DataFrame) -> 'CorrelationAccumulator':
+        """
+        Add a chunk of rows.
+
+        Args:
+            chunk (pd.DataFrame): The rows to add.
+
+        Returns:
+            CorrelationAccumulator: The accumulator.
+        """
+        if self.columns is None:
+            # Booleans are correlated as 0/1, like `df.corr()` does
+            self.columns = chunk.select_dtypes(include=['number', 'bool', 'boolean']).columns.tolist()
+        if self.sample is None:
+            self._reset()
+
+        values = np.column_stack([chunk[column].to_numpy(dtype=np.float64, na_value=np.nan) for column in self.columns]) \
+            if self.columns else np.empty((len(chunk), 0))
+
+        if self.shift is None:
+            # Shift by the first block's means so the float32 sums stay small
+            with np.errstate(all='ignore'):
+                self.shift = np.nan_to_num(np.nanmean(values[:self.block_size], axis=0))
+
+        for start in range(0, len(values), self.block_size):
+            self._update_block(values[start:start + self.block_size])
+
+        if self.sample_size:
+            self._update_sample(values)
+
+        return self
+
+    def _update_block(self, values: np.ndarray):
+        """
+        Add the pairwise sums of a block of rows, computed with float32 matrix products.
+        """
+        present = ~np.isnan(values)
+        mask = present.astype(np.float32)
+        shifted = np.where(present, values - self.shift, 0).astype(np.float32)
+
+        # Entry [i, j] sums column i over the rows where column j is also present
+        self.pair_counts += mask.T @ mask
+        self.sums += shifted.T @ mask
+        self.squares += (shifted * shifted).T @ mask
+        self.products += shifted.T @ shifted
+
+    def _update_sample(self, values: np.ndarray):
+        """
+        Keep the rows with the smallest random keys, a uniform sample of every row added.
+        """
+        keys = np.concatenate([self.sample_keys, self.rng.random(len(values))])
+        rows = np.concatenate([self.sample, values.astype(np.float32)])
+        if len(keys) > self.sample_size:
+            keep = np.argpartition(keys, self.sample_size)[:self.sample_size]
+            keys, rows = keys[keep], rows[keep]
+        self.sample_keys, self.sample = keys, rows
+
+    def update_chunks(self, chunks: Iterable[pd.DataFrame]) -> 'CorrelationAccumulator':
+        """
+        Add every chunk of a stream.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): The chunks to add.
+
+        Returns:
+            CorrelationAccumulator: The accumulator.
+        """
+        for chunk in chunks:
+            self.update(chunk)
+        return self
+
+    def pearson(self) -> pd.DataFrame:
+        """
+        Return the Pearson correlation matrix, using pairwise-complete rows like `df.corr()`.
+
+        Returns:
+            pd.DataFrame: The correlation matrix.
+        """
+        with np.errstate(all='ignore'):
+            n = self.pair_counts
+            covariance = self.products - self.sums * self.sums.T / n
+            variance = self.squares - self.sums ** 2 / n
+            correlation = covariance / np.sqrt(variance * variance.T)
+        correlation = np.clip(correlation, -1, 1)
+        np.fill_diagonal(correlation, np.where(np.diag(variance) > 0, 1.0, np.nan))
+        return pd.DataFrame(correlation, index=self.columns, columns=self.columns)
+
+    def spearman(self) -> pd.DataFrame:
+        """
+        Return the Spearman correlation matrix of the row sample.
+
+        Returns:
+            pd.DataFrame: The correlation matrix.
+        """
+        if self.sample is None or not self.sample_size:
+            print("No rows were sampled, create the accumulator with a sample_size to use Spearman correlations")
+            return None
+        return pd.DataFrame(self.sample, columns=self.columns).corr(method='spearman')
+
+    def sample_counts(self) -> pd.DataFrame:
+        """
+        Return the number of sampled rows where both columns of each pair are present.
+
+        Returns:
+            pd.DataFrame: The pairwise counts of the sample.
+        """
+        present = (~np.isnan(self.sample)).astype(np.float64)
+        return pd.DataFrame(present.T @ present, index=self.columns, columns=self.columns)
+
+    def correlation(self, method: str = 'pearson') -> pd.DataFrame:
+        """
+        Return the correlation matrix.
+
+        Args:
+            method (str, optional): 'pearson' or 'spearman'. Defaults to 'pearson'.
+
+        Returns:
+            pd.DataFrame: The correlation matrix.
+        """
+        if method == 'pearson':
+            return self.pearson()
+        elif method == 'spearman':
+            return self.spearman()
+        print(f"Method '{method}' is not recognized. Use 'pearson' or 'spearman'.")
+        return None
+
+    def top_pairs(self, k: int = 10, method: str = 'pearson', confidence: float = 0.95) -> pd.DataFrame:
+        """
+        Return the k most correlated pairs of columns with Fisher z confidence bounds.
+
+        Args:
+            k (int, optional): The number of pairs. Defaults to 10.
+            method (str, optional): 'pearson' or 'spearman'. Defaults to 'pearson'.
+            confidence (float, optional): The confidence level of the bounds. Defaults to 0.95.
+
+        Returns:
+            pd.DataFrame: The pairs, from the strongest absolute correlation down.
+        """
+        from scipy import stats
+
+        correlation = self.correlation(method)
+        if correlation is None:
+            return None
+        counts = self.pair_counts if method == 'pearson' else self.sample_counts().to_numpy()
+
+        # Only the upper triangle, each pair once
+        first, second = np.triu_indices(len(self.columns), k=1)
+        r = correlation.to_numpy()[first, second]
+        n = counts[first, second]
+
+        # Spearman's standard error is about 3% wider than Pearson's (Fieller et al.)
+        scale = 1.0 if method == 'pearson' else np.sqrt(1.06)
+        critical = stats.norm.ppf(0.5 + confidence / 2)
+        with np.errstate(all='ignore'):
+            z = np.arctanh(np.clip(r, -1 + 1e-12, 1 - 1e-12))
+            margin = critical * scale / np.sqrt(n - 3)
+
+        pairs = pd.DataFrame({
+            'column_1': np.asarray(self.columns)[first],
+            'column_2': np.asarray(self.columns)[second],
+            'correlation': r,
+            'lower': np.tanh(z - margin),
+            'upper': np.tanh(z + margin),
+            'rows': n.astype(np.int64),
+        })
+        pairs = pairs.dropna(subset=['correlation'])
+        order = pairs['correlation'].abs().sort_values(ascending=False, kind='stable').index
+        return pairs.loc[order].head(k).reset_index(drop=True)
+
+    def suggest_drop(self, threshold: float = 0.85, method: str = 'pearson') -> List[str]:
+        """
+        Suggest columns to drop so that no remaining pair is correlated above a threshold.
+
+        Pairs are visited from the strongest correlation down. For each pair where neither column
+        was dropped yet, the column with the higher mean absolute correlation to the other columns
+        is dropped, as it is the more redundant of the two.
+
+        Args:
+            threshold (float, optional): The absolute correlation above which a pair is redundant. Defaults to 0.85.
+            method (str, optional): 'pearson' or 'spearman'. Defaults to 'pearson'.
+
+        Returns:
+            List[str]: The columns to drop.
+        """
+        correlation = self.correlation(method)
+        if correlation is None:
+            return None
+        absolute = correlation.abs()
+        redundancy = (absolute.sum() - 1) / max(len(self.columns) - 1, 1)
+
+        to_drop = []
+        for _, pair in self.top_pairs(len(self.columns) ** 2, method).iterrows():
+            if abs(pair['correlation']) <= threshold:
+                break
+            first, second = pair['column_1'], pair['column_2']
+            if first in to_drop or second in to_drop:
+                continue
+            to_drop.append(first if redundancy[first] >= redundancy[second] else second)
+        return to_drop
+
+
+def correlate(data_frame: pd.DataFrame, columns: Optional[List[str]] = None, block_size: int = 65536,
+              sample_size: int = 100000) -> CorrelationAccumulator:
+    """
+    Accumulate the correlations of the columns of a DataFrame.
+
+    Args:
+        data_frame (pd.DataFrame): The DataFrame.
+        columns (List[str], optional): The columns to correlate. Defaults to every numeric and boolean column.
+        block_size (int, optional): The number of rows summed at a time. Defaults to 65536.
+        sample_size (int, optional): The number of rows kept for Spearman correlations. Defaults to 100000.
+
+    Returns:
+        CorrelationAccumulator: The accumulator, e.g. `correlate(df).suggest_drop(0.85)`.
+    """
+    return CorrelationAccumulator(columns, block_size, sample_size).update(data_frame)
@@ -0,0 +1,229 @@
+import hashlib
+import json
+import os
+import shutil
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+class DataCache:
+    """
+    A class for caching extracted tables locally as typed, columnar Parquet files.
+
+    Each cache entry is a directory keyed on the table name and a fingerprint of the query
+    that produced it. Categorical columns are stored dictionary-encoded and boolean columns
+    as booleans, so a cached frame loads back with the same dtypes it was saved with.
+    """
+
+    def __init__(self, cache_dir: str = 'cache'):
+        """
+        Initialize the DataCache with the directory the cache entries are stored in.
+
+        Args:
+            cache_dir (str, optional): The cache directory. Defaults to 'cache'.
+        """
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def fingerprint(table_name: str, query: Optional[str] = None, params: Optional[Dict] = None) -> str:
+        """
+        Compute a short fingerprint identifying the rows selected from a table.
+
+        Args:
+            table_name (str): The name of the table.
+            query (str, optional): The query or predicate used to select the rows. Defaults to None.
+            params (Dict, optional): The bind parameters of the query. Defaults to None.
+
+        Returns:
+            str: A hexadecimal fingerprint.
+        """
+        key = json.dumps([table_name, query, params], sort_keys=True, default=str)
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+
+    def entry_path(self, table_name: str, fingerprint: str) -> str:
+        """
+        Return the directory holding the cache entry for a table and fingerprint.
+
+        Args:
+            table_name (str): The name of the table.
+            fingerprint (str): The query fingerprint.
+
+        Returns:
+            str: The path of the cache entry directory.
+        """
+        return os.path.join(self.cache_dir, f"{table_name}-{fingerprint}")
+
+    def _part_files(self, table_name: str, fingerprint: str) -> List[str]:
+        """
+        List the Parquet part files of a cache entry in the order they were written.
+        """
+        path = self.entry_path(table_name, fingerprint)
+        if not os.path.isdir(path):
+            return []
+        return [os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith('.parquet')]
+
+    def exists(self, table_name: str, fingerprint: str) -> bool:
+        """
+        Check whether a cache entry exists.
+
+        Args:
+            table_name (str): The name of the table.
+            fingerprint (str): The query fingerprint.
+
+        Returns:
+            bool: True if the entry has been written.
+        """
+        return len(self._part_files(table_name, fingerprint)) > 0
+
+    def read_metadata(self, table_name: str, fingerprint: str) -> Dict:
+        """
+        Read the metadata stored alongside a cache entry.
+
+        Args:
+            table_name (str): The name of the table.
+            fingerprint (str): The query fingerprint.
+
+        Returns:
+            Dict: The entry metadata, or an empty dictionary if there is none.
+        """
+        path = os.path.join(self.entry_path(table_name, fingerprint), '_metadata.json')
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def write_metadata(self, table_name: str, fingerprint: str, metadata: Dict):
+        """
+        Write the metadata stored alongside a cache entry.
+
+        Args:
+            table_name (str): The name of the table.
+            fingerprint (str): The query fingerprint.
+            metadata (Dict): The metadata to store.
+        """
+        path = os.path.join(self.entry_path(table_name, fingerprint), '_metadata.json')
+        with open(path, 'w') as f:
+            json.dump(metadata, f, indent=2, default=str)
+
+    def save(self, data_frame: pd.DataFrame, table_name: str, fingerprint: str, metadata: Optional[Dict] = None):
+        """
+        Save a DataFrame as the cache entry for a table and fingerprint, replacing any existing entry.
+
+        Args:
+            data_frame (pd.DataFrame): The DataFrame to cache.
+            table_name (str): The name of the table.
+            fingerprint (str): The query fingerprint.
+            metadata (Dict, optional): Extra metadata to store with the entry. Defaults to None.
+        """
+        path = self.entry_path(table_name, fingerprint)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        os.makedirs(path)
+
+        self._write_part(data_frame, path, 0)
+        self.write_metadata(table_name, fingerprint, {
+            **(metadata or {}),
+            'table_name': table_name,
+            'fingerprint': fingerprint,
+            'rows': len(data_frame),
+            'columns': list(data_frame.columns),
+            'saved_at': datetime.now(timezone.utc).isoformat(),
+        })
+
+    def append(self, data_frame: pd.DataFrame, table_name: str, fingerprint: str):
+        """
+        Append rows to an existing cache entry as a new part file, without rewriting the cached data.
+
+        Args:
+            data_frame (pd.DataFrame): The rows to append.
+            table_name (str): The name of the table.
+            fingerprint (str): The query fingerprint.
+        """
+        if not self.exists(table_name, fingerprint):
+            self.save(data_frame, table_name, fingerprint)
+            return
+
+        path = self.entry_path(table_name, fingerprint)
+        self._write_part(data_frame, path, len(self._part_files(table_name, fingerprint)))
+
+        metadata = self.read_metadata(table_name, fingerprint)
+        metadata['rows'] = metadata.get('rows', 0) + len(data_frame)
+        self.write_metadata(table_name, fingerprint, metadata)
+
+    def _write_part(self, data_frame: pd.DataFrame, path: str, part: int):
+        """
+        Write a DataFrame as one Parquet part file of a cache entry.
+        """
+        arrow_table = pa.Table.from_pandas(data_frame, preserve_index=False)
+        pq.write_table(arrow_table, os.path.join(path, f"part-{part:05d}.parquet"))
+
+    def load(self, table_name: str, fingerprint: str, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """
+        Load a cache entry into a DataFrame, reading only the requested columns.
+
+        The part files are memory-mapped, so only the pages of the projected columns are read.
+
+        Args:
+            table_name (str): The name of the table.
+            fingerprint (str): The query fingerprint.
+            columns (List[str], optional): Columns to load. Defaults to all columns.
+
+        Returns:
+            pd.DataFrame or None: The cached DataFrame, or None if the entry does not exist.
+        """
+        part_files = self._part_files(table_name, fingerprint)
+        if not part_files:
+            return None
+
+        tables = [pq.read_table(part_file, columns=columns, memory_map=True) for part_file in part_files]
+        arrow_table = pa.concat_tables(tables, promote_options='permissive') if len(tables) > 1 else tables[0]
+        return arrow_table.to_pandas()
+
+    def iter_chunks(self, table_name: str, fingerprint: str, chunk_size: int = 50000,
+                    columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Read a cache entry back as DataFrame chunks, holding one record batch in memory at a time.
+
+        Args:
+            table_name (str): The name of the table.
+            fingerprint (str): The query fingerprint.
+            chunk_size (int, optional): Maximum number of rows per chunk. Defaults to 50000.
+            columns (List[str], optional): Columns to load. Defaults to all columns.
+
+        Yields:
+            pd.DataFrame: The next chunk of the cached data.
+        """
+        for part_file in self._part_files(table_name, fingerprint):
+            parquet_file = pq.ParquetFile(part_file, memory_map=True)
+            for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+                yield batch.to_pandas()
+
+    def cached_columns(self, table_name: str, fingerprint: str) -> List[str]:
+        """
+        List the columns stored in a cache entry without reading any data.
+
+        Args:
+            table_name (str): The name of the table.
+            fingerprint (str): The query fingerprint.
+
+        Returns:
+            List[str]: The cached column names, or an empty list if the entry does not exist.
+        """
+        part_files = self._part_files(table_name, fingerprint)
+        if not part_files:
+            return []
+        return pq.read_schema(part_files[0]).names
+
+    def clear(self, table_name: str, fingerprint: str):
+        """
+        Remove a cache entry.
+
+        Args:
+            table_name (str): The name of the table.
+            fingerprint (str): The query fingerprint.
+        """
+        path = self.entry_path(table_name, fingerprint)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
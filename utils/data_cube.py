@@ -0,0 +1,177 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+# The categorical dimensions of the customer_activity table
+DEFAULT_DIMENSIONS = ['month', 'operating_systems', 'browser', 'region', 'traffic_type', 'visitor_type', 'weekend']
+
+class DataCube:
+    """
+    A class for answering group-by aggregations from a pre-aggregated cube.
+
+    The cube is built in one pass as the base cuboid: the row count and the per-measure sum and
+    non-null count for every observed combination of the dimensions. Any group-by over a subset
+    of the dimensions, with optional filters, is then a roll-up of that small table instead of a
+    scan of the rows. Roll-ups are memoized, so repeated queries are dictionary lookups, and new
+    rows are merged into the base cuboid with `update()`.
+    """
+
+    def __init__(self, dimensions: Optional[List[str]] = None, measures: Optional[List[str]] = None):
+        """
+        Initialize an empty DataCube.
+
+        Args:
+            dimensions (List[str], optional): The columns to group by. Defaults to the categorical
+                columns of customer_activity.
+            measures (List[str], optional): The columns to aggregate. Defaults to every numeric and
+                boolean column of the first frame added.
+        """
+        self.dimensions = list(dimensions or DEFAULT_DIMENSIONS)
+        self.measures = list(measures) if measures is not None else None
+        self.base = None
+        self.cuboids = {}
+
+    @classmethod
+    def from_frame(cls, data_frame: pd.DataFrame, dimensions: Optional[List[str]] = None,
+                   measures: Optional[List[str]] = None) -> 'DataCube':
+        """
+        Build a cube from a DataFrame.
+
+        Args:
+            data_frame (pd.DataFrame): The rows to aggregate.
+            dimensions (List[str], optional): The columns to group by. Defaults to None.
+            measures (List[str], optional): The columns to aggregate. Defaults to None.
+
+        Returns:
+            DataCube: The cube.
+        """
+        return cls(dimensions, measures).update(data_frame)
+
+    def update(self, data_frame: pd.DataFrame) -> 'DataCube':
+        """
+        Aggregate new rows into the cube.
+
+        Args:
+            data_frame (pd.DataFrame): The rows to add, e.g. a chunk from a stream or the delta of a sync.
+
+        Returns:
+            DataCube: The cube.
+        """
+        if self.measures is None:
+            self.measures = [column for column in data_frame.select_dtypes(include=['number', 'bool']).columns
+                             if column not in self.dimensions]
+
+        # Aggregate the new rows over every dimension in a single group-by
+        values = pd.DataFrame({measure: data_frame[measure].astype(np.float64) for measure in self.measures})
+        keys = [data_frame[dimension] for dimension in self.dimensions]
+        grouped = values.groupby(keys, observed=True, dropna=False, sort=False)
+
+        partial = pd.concat([
+            grouped.size().rename('rows'),
+            grouped.sum().add_suffix('_sum'),
+            grouped.count().add_suffix('_count'),
+        ], axis=1)
+        partial.index.names = self.dimensions
+
+        if self.base is None:
+            self.base = self._plain_index(partial)
+        else:
+            # Cells present in both are added together, new cells are appended
+            combined = pd.concat([self._plain_index(self.base), self._plain_index(partial)])
+            self.base = combined.groupby(level=self.dimensions, dropna=False, sort=False).sum()
+
+        self.cuboids = {}
+        return self
+
+    @staticmethod
+    def _plain_index(frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Replace categorical index levels with plain values so cuboids built from different chunks line up.
+        """
+        index = pd.MultiIndex.from_arrays(
+            [np.asarray(frame.index.get_level_values(level), dtype=object) for level in range(frame.index.nlevels)],
+            names=frame.index.names,
+        )
+        return frame.set_axis(index, axis=0)
+
+    def _cuboid(self, dimensions: tuple, filters: Optional[Dict] = None) -> pd.DataFrame:
+        """
+        Roll the base cuboid up to the given dimensions, after applying the filters.
+        """
+        key = (dimensions, tuple(sorted((k, tuple(np.atleast_1d(v).tolist())) for k, v in (filters or {}).items())))
+        if key in self.cuboids:
+            return self.cuboids[key]
+
+        base = self.base
+        for dimension, value in (filters or {}).items():
+            allowed = list(np.atleast_1d(value))
+            base = base[base.index.get_level_values(dimension).isin(allowed)]
+
+        if dimensions:
+            cuboid = base.groupby(level=list(dimensions), observed=True, dropna=False).sum()
+        else:
+            cuboid = base.sum().to_frame().T
+
+        self.cuboids[key] = cuboid
+        return cuboid
+
+    def query(self, dimensions: Optional[List[str]] = None, measure: Optional[str] = None, agg: str = 'count',
+              filters: Optional[Dict] = None) -> pd.Series:
+        """
+        Answer a group-by aggregation from the cube.
+
+        Args:
+            dimensions (List[str], optional): The dimensions to group by. Defaults to a grand total.
+            measure (str, optional): The column to aggregate. Not needed for 'count'.
+            agg (str, optional): 'count' (rows), 'sum', 'mean' or 'non_null' (non-null values of the measure).
+                Defaults to 'count'.
+            filters (Dict, optional): Mapping of dimensions to a value or list of allowed values. Defaults to None.
+
+        Returns:
+            pd.Series: The aggregate for each group, e.g. `cube.query(['region'], 'revenue', 'sum')`.
+        """
+        if self.base is None:
+            print("The cube is empty, add rows with update() first")
+            return None
+
+        unknown = [dimension for dimension in list(dimensions or []) + list(filters or {}) if dimension not in self.dimensions]
+        if unknown:
+            print(f"Dimensions {unknown} are not in the cube")
+            return None
+        if agg != 'count' and measure not in (self.measures or []):
+            print(f"Measure '{measure}' is not in the cube")
+            return None
+
+        cuboid = self._cuboid(tuple(dimensions or []), filters)
+        if agg == 'count':
+            result = cuboid['rows']
+        elif agg == 'sum':
+            result = cuboid[f'{measure}_sum']
+        elif agg == 'non_null':
+            result = cuboid[f'{measure}_count']
+        elif agg == 'mean':
+            result = cuboid[f'{measure}_sum'] / cuboid[f'{measure}_count'].replace(0, np.nan)
+        else:
+            print(f"Aggregation '{agg}' is not recognized. Use 'count', 'sum', 'mean' or 'non_null'.")
+            return None
+
+        if not dimensions:
+            return result.iloc[0]
+        return result.rename(measure or 'count')
+
+    def rollup(self, dimensions: List[str], measure: Optional[str] = None, agg: str = 'count',
+               filters: Optional[Dict] = None) -> Dict[tuple, pd.Series]:
+        """
+        Compute an aggregate at every level of a hierarchy of dimensions, like SQL's ROLLUP.
+
+        Args:
+            dimensions (List[str]): The dimensions, from the outermost to the innermost.
+            measure (str, optional): The column to aggregate. Not needed for 'count'.
+            agg (str, optional): The aggregation, as in `query()`. Defaults to 'count'.
+            filters (Dict, optional): Mapping of dimensions to allowed values. Defaults to None.
+
+        Returns:
+            Dict[tuple, pd.Series]: The aggregate for each prefix of `dimensions`, the empty prefix being the total.
+        """
+        return {tuple(dimensions[:level]): self.query(dimensions[:level], measure, agg, filters)
+                for level in range(len(dimensions), -1, -1)}
@@ -1,40 +1,642 @@
+import numpy as np
 import pandas as pd
-from sqlalchemy.engine import Engine
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Union
+from .instrumentation import instrument_class
+from .sampling import StratifiedReservoir, StratifiedSample
 
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+# The names of the SQL aggregate functions, by aggregation name
+SQL_AGGREGATES = {'sum': 'sum', 'mean': 'avg', 'min': 'min', 'max': 'max', 'count': 'count'}
+
+@instrument_class
 class DataExtractor:
     """
     A class for extracting data from various sources.
     """
 
-    def __init__(self, engine: Engine):
+    def __init__(self, engine: 'Engine', cache=None):
         """
         Initialize the DataExtractor with a SQLAlchemy engine.
 
         Args:
             engine (sqlalchemy.engine.Engine): The SQLAlchemy engine to use for data extraction.
+            cache (DataCache, optional): A local columnar cache for extracted tables. Defaults to None.
         """
         # Initialize the SQLAlchemy engine
         self.engine = engine
+        self.cache = cache
+        self._column_types = {}
+
+    def _build_select_query(self, table_name: str, columns: Optional[List[str]] = None, where: Optional[str] = None,
+                            limit: Optional[int] = None, offset: Optional[int] = None):
+        """
+        Build a SELECT statement with the table and column names safely quoted.
+
+        Args:
+            table_name (str): The name of the table to read from.
+            columns (List[str], optional): Columns to project. Defaults to all columns.
+            where (str, optional): A SQL predicate using named bind parameters (e.g. "month = :month").
+            limit (int, optional): Maximum number of rows to return.
+            offset (int, optional): Number of rows to skip before returning rows.
+
+        Returns:
+            sqlalchemy.sql.Select: The SELECT statement.
+        """
+        from sqlalchemy import column, select, table, text
+
+        if columns:
+            # Project only the requested columns so they are filtered on the server
+            source = table(table_name, *[column(name) for name in columns])
+            query = select(*source.columns)
+        else:
+            query = select(text('*')).select_from(table(table_name))
+
+        if where:
+            query = query.where(text(where))
+        if limit is not None:
+            query = query.limit(limit)
+        if offset is not None:
+            query = query.offset(offset)
+
+        return query
 
-    def read_rds_table(self, table_name: str) -> pd.DataFrame:
+    def read_rds_table(self, table_name: str, columns: Optional[List[str]] = None, where: Optional[str] = None,
+                       params: Optional[Dict] = None, dtypes: Optional[Dict] = None) -> pd.DataFrame:
         """
         Read a table from the RDS database and load it into a pandas DataFrame.
 
         Args:
             table_name (str): The name of the table to read from the database.
+            columns (List[str], optional): Columns to read. Defaults to all columns.
+            where (str, optional): A SQL predicate using named bind parameters. Defaults to None.
+            params (Dict, optional): Values for the bind parameters used in `where`. Defaults to None.
+            dtypes (Dict, optional): Mapping of column names to the dtypes to convert them to. Defaults to None.
 
         Returns:
             pd.DataFrame: A DataFrame containing the table data.
         """
         # Construct the SQL query
-        query = f"SELECT * FROM {table_name}"
-        
+        query = self._build_select_query(table_name, columns, where)
+
         # Execute the query and load the data into a DataFrame
         with self.engine.connect() as connection:
-            data_frame = pd.read_sql(query, connection)
-        
+            data_frame = pd.read_sql(query, connection, params=params)
+
+        if dtypes:
+            data_frame = self._apply_dtypes(data_frame, dtypes)
+
+        return data_frame
+
+    def _apply_dtypes(self, data_frame: pd.DataFrame, dtypes: Dict) -> pd.DataFrame:
+        """
+        Convert the columns of a DataFrame to the given dtypes, skipping columns that already match.
+
+        Args:
+            data_frame (pd.DataFrame): The DataFrame to convert.
+            dtypes (Dict): Mapping of column names to dtypes, e.g. from `DtypePlanner.plan()`.
+
+        Returns:
+            pd.DataFrame: The converted DataFrame.
+        """
+        conversions = {column: dtype for column, dtype in dtypes.items()
+                       if column in data_frame.columns and data_frame[column].dtype != pd.api.types.pandas_dtype(dtype)}
+        if not conversions:
+            return data_frame
+        return data_frame.astype(conversions)
+
+    def _partition_predicates(self, table_name: str, partition_column: Optional[str], num_partitions: int,
+                              where: Optional[str] = None, params: Optional[Dict] = None) -> list:
+        """
+        Split a table into non-overlapping ranges that can be read independently.
+
+        Ranges are taken over `partition_column` when it is given, otherwise over the
+        physical ctid block ranges of a PostgreSQL table.
+
+        Args:
+            table_name (str): The name of the table to partition.
+            partition_column (str, optional): A numeric column to split on.
+            num_partitions (int): The number of partitions to create.
+            where (str, optional): A SQL predicate using named bind parameters. Defaults to None.
+            params (Dict, optional): Values for the bind parameters used in `where`. Defaults to None.
+
+        Returns:
+            list: A list of (predicate, params) tuples, or an empty list if the table cannot be partitioned.
+        """
+        from sqlalchemy import column, func, select, table, text
+
+        if partition_column is None:
+            if self.engine.dialect.name != 'postgresql':
+                print("ctid partitioning is only available on PostgreSQL, pass a partition_column instead")
+                return []
+
+            # Split the heap into ranges of pages, each page is addressed by a ctid of (block, 0)
+            pages_query = text("SELECT pg_relation_size(CAST(:table_name AS regclass)) / current_setting('block_size')::int")
+            with self.engine.connect() as connection:
+                num_pages = connection.execute(pages_query, {'table_name': table_name}).scalar() or 0
+
+            bounds = np.unique(np.linspace(0, num_pages + 1, num_partitions + 1).astype(np.int64))
+            predicate = text("ctid >= CAST(:ctid_low AS tid) AND ctid < CAST(:ctid_high AS tid)")
+            return [(predicate, {'ctid_low': f'({low},0)', 'ctid_high': f'({high},0)'})
+                    for low, high in zip(bounds[:-1], bounds[1:])]
+
+        # Find the range of the partition column
+        key = column(partition_column)
+        range_query = select(func.min(key), func.max(key)).select_from(table(table_name))
+        if where:
+            range_query = range_query.where(text(where))
+        with self.engine.connect() as connection:
+            low, high = connection.execute(range_query, params or {}).one()
+
+        if low is None:
+            return []
+        if not isinstance(low, (int, float, np.number)):
+            print(f"Column '{partition_column}' is not numeric and cannot be used to partition the table")
+            return []
+
+        bounds = np.linspace(low, high, num_partitions + 1)
+        if isinstance(low, (int, np.integer)):
+            bounds = np.unique(np.ceil(bounds).astype(np.int64))
+        bounds = bounds.tolist()
+
+        # Every range is half-open except the last one, which has to include the maximum
+        predicates = [key.between(bounds[-2], bounds[-1])] if len(bounds) > 1 else [key == low]
+        predicates = [(key >= lower) & (key < upper) for lower, upper in zip(bounds[:-2], bounds[1:-1])] + predicates
+        return [(predicate, {}) for predicate in predicates]
+
+    def read_rds_table_parallel(self, table_name: str, partition_column: Optional[str] = None,
+                                num_partitions: Optional[int] = None, columns: Optional[List[str]] = None,
+                                where: Optional[str] = None, params: Optional[Dict] = None,
+                                dtypes: Optional[Dict] = None) -> pd.DataFrame:
+        """
+        Read a table by fetching ranges of it concurrently over the engine's connection pool.
+
+        The table is split on `partition_column`, or on ctid ranges for PostgreSQL when no column
+        is given, and one thread per pooled connection reads the partitions.
+
+        Args:
+            table_name (str): The name of the table to read from the database.
+            partition_column (str, optional): A numeric column to split the table on. Defaults to None.
+            num_partitions (int, optional): The number of partitions. Defaults to the pool size.
+            columns (List[str], optional): Columns to read. Defaults to all columns.
+            where (str, optional): A SQL predicate using named bind parameters. Defaults to None.
+            params (Dict, optional): Values for the bind parameters used in `where`. Defaults to None.
+            dtypes (Dict, optional): Mapping of column names to the dtypes to convert them to. Defaults to None.
+
+        Returns:
+            pd.DataFrame: A DataFrame containing the table data, in partition order.
+        """
+        # Use as many threads as the pool keeps connections open for
+        pool_size = self.engine.pool.size() if hasattr(self.engine.pool, 'size') else 1
+        num_partitions = num_partitions or pool_size
+
+        partitions = self._partition_predicates(table_name, partition_column, num_partitions, where, params)
+        if not partitions:
+            return self.read_rds_table(table_name, columns, where, params, dtypes)
+
+        def read_partition(partition):
+            predicate, partition_params = partition
+            query = self._build_select_query(table_name, columns, where).where(predicate)
+            with self.engine.connect() as connection:
+                return pd.read_sql(query, connection, params={**(params or {}), **partition_params})
+
+        with ThreadPoolExecutor(max_workers=min(pool_size, len(partitions))) as executor:
+            frames = list(executor.map(read_partition, partitions))
+
+        # Concatenate once into the final frame rather than growing it partition by partition
+        data_frame = pd.concat(frames, ignore_index=True)
+
+        # Convert after concatenating so categorical columns share one set of categories
+        if dtypes:
+            data_frame = self._apply_dtypes(data_frame, dtypes)
+
         return data_frame
 
+    def stream_rds_table(self, table_name: str, chunk_size: int = 50000, columns: Optional[List[str]] = None,
+                         where: Optional[str] = None, params: Optional[Dict] = None, limit: Optional[int] = None,
+                         offset: Optional[int] = None, dtypes: Optional[Dict] = None) -> Iterator[pd.DataFrame]:
+        """
+        Stream a table from the RDS database as DataFrame chunks using a server-side cursor.
+
+        Only one chunk is held in memory at a time, so peak memory is bounded by `chunk_size`
+        rather than by the size of the table.
+
+        Args:
+            table_name (str): The name of the table to read from the database.
+            chunk_size (int, optional): Number of rows per chunk. Defaults to 50000.
+            columns (List[str], optional): Columns to read. Defaults to all columns.
+            where (str, optional): A SQL predicate using named bind parameters. Defaults to None.
+            params (Dict, optional): Values for the bind parameters used in `where`. Defaults to None.
+            limit (int, optional): Maximum number of rows to read. Defaults to None.
+            offset (int, optional): Number of rows to skip. Defaults to None.
+            dtypes (Dict, optional): Mapping of column names to the dtypes to convert them to. Defaults to None.
+
+        Yields:
+            pd.DataFrame: The next chunk of at most `chunk_size` rows.
+        """
+        # Construct the SQL query
+        query = self._build_select_query(table_name, columns, where, limit, offset)
+
+        # stream_results makes the driver use a server-side cursor instead of buffering the full result
+        with self.engine.connect().execution_options(stream_results=True, max_row_buffer=chunk_size) as connection:
+            for chunk in pd.read_sql(query, connection, params=params, chunksize=chunk_size):
+                if dtypes:
+                    chunk = self._apply_dtypes(chunk, dtypes)
+                yield chunk
+
+    def read_cached_table(self, table_name: str, columns: Optional[List[str]] = None, where: Optional[str] = None,
+                          params: Optional[Dict] = None, dtypes: Optional[Dict] = None,
+                          refresh: bool = False) -> pd.DataFrame:
+        """
+        Read a table through the local cache, only querying the database on a cache miss.
+
+        The cache entry is keyed on the table name and a fingerprint of `where` and `params`. The
+        `dtypes` conversion is applied before the frame is cached, so a warm start returns the
+        converted frame without touching the database or converting any columns.
+
+        Args:
+            table_name (str): The name of the table to read.
+            columns (List[str], optional): Columns to read. Defaults to all columns.
+            where (str, optional): A SQL predicate using named bind parameters. Defaults to None.
+            params (Dict, optional): Values for the bind parameters used in `where`. Defaults to None.
+            dtypes (Dict, optional): Mapping of column names to the dtypes to convert them to. Defaults to None.
+            refresh (bool, optional): Re-read the table from the database even on a cache hit. Defaults to False.
+
+        Returns:
+            pd.DataFrame: A DataFrame containing the table data.
+        """
+        if self.cache is None:
+            return self.read_rds_table(table_name, columns, where, params, dtypes)
+
+        fingerprint = self.cache.fingerprint(table_name, where, params)
+        cached_columns = self.cache.cached_columns(table_name, fingerprint)
+
+        # Serve the request from the cache when it holds every requested column
+        if not refresh and cached_columns and set(columns or cached_columns) <= set(cached_columns):
+            data_frame = self.cache.load(table_name, fingerprint, columns)
+            return self._apply_dtypes(data_frame, dtypes) if dtypes else data_frame
+
+        data_frame = self.read_rds_table(table_name, columns, where, params, dtypes)
+        self.cache.save(data_frame, table_name, fingerprint, {'where': where, 'params': params})
+        return data_frame
+
+    def sync_rds_table(self, table_name: str, watermark_column: str, key_columns: Optional[List[str]] = None,
+                       columns: Optional[List[str]] = None, where: Optional[str] = None,
+                       params: Optional[Dict] = None, dtypes: Optional[Dict] = None) -> pd.DataFrame:
+        """
+        Incrementally sync a table into the local cache, fetching only rows past the stored high-watermark.
+
+        The first sync reads the whole table. Later syncs read the rows whose `watermark_column` is
+        greater than the largest value seen so far and either append them to the cache, or upsert them
+        on `key_columns` when some of the fetched keys are already cached.
+
+        Args:
+            table_name (str): The name of the table to sync.
+            watermark_column (str): A monotonically increasing column, such as an id or a timestamp.
+            key_columns (List[str], optional): Columns identifying a row, used to upsert updated rows. Defaults to None.
+            columns (List[str], optional): Columns to read. The watermark and key columns are always read.
+                Defaults to all columns.
+            where (str, optional): A SQL predicate using named bind parameters. Defaults to None.
+            params (Dict, optional): Values for the bind parameters used in `where`. Defaults to None.
+            dtypes (Dict, optional): Mapping of column names to the dtypes to convert them to. Defaults to None.
+
+        Returns:
+            pd.DataFrame: The rows fetched by this sync.
+        """
+        if self.cache is None:
+            print("No cache has been configured for this DataExtractor")
+            return None
+
+        if columns:
+            columns = list(dict.fromkeys(list(columns) + [watermark_column] + list(key_columns or [])))
+
+        fingerprint = self.cache.fingerprint(table_name, where, params)
+        metadata = self.cache.read_metadata(table_name, fingerprint)
+        watermark = metadata.get('watermark') if metadata.get('watermark_column') == watermark_column else None
+
+        if watermark is None or not self.cache.exists(table_name, fingerprint):
+            # Nothing has been synced yet, so start from a full read
+            delta = self.read_rds_table(table_name, columns, where, params, dtypes)
+            mode = 'full'
+            self.cache.save(delta, table_name, fingerprint, {'where': where, 'params': params})
+        else:
+            # Only fetch the rows that arrived after the last sync
+            quoted_column = self.engine.dialect.identifier_preparer.quote(watermark_column)
+            delta_where = f"{quoted_column} > :watermark" + (f" AND ({where})" if where else '')
+            delta = self.read_rds_table(table_name, columns, delta_where, {**(params or {}), 'watermark': watermark}, dtypes)
+            mode = self._merge_delta(delta, table_name, fingerprint, key_columns)
+
+        # Record the new watermark and the sync in the entry metadata
+        metadata = self.cache.read_metadata(table_name, fingerprint)
+        if len(delta) > 0:
+            new_watermark = delta[watermark_column].max()
+            if isinstance(new_watermark, pd.Timestamp):
+                new_watermark = new_watermark.isoformat()
+            elif hasattr(new_watermark, 'item'):
+                new_watermark = new_watermark.item()
+            watermark = new_watermark
+        synced_at = datetime.now(timezone.utc).isoformat()
+        metadata.update({'watermark_column': watermark_column, 'watermark': watermark, 'last_synced_at': synced_at})
+        metadata['syncs'] = metadata.get('syncs', []) + [{'synced_at': synced_at, 'mode': mode, 'rows_fetched': len(delta)}]
+        self.cache.write_metadata(table_name, fingerprint, metadata)
+
+        return delta
+
+    def _merge_delta(self, delta: pd.DataFrame, table_name: str, fingerprint: str,
+                     key_columns: Optional[List[str]] = None) -> str:
+        """
+        Merge newly fetched rows into a cache entry.
+
+        The rows are appended as a new part file unless some of their keys are already cached, in
+        which case the entry is rewritten with the cached versions of those rows replaced.
+
+        Args:
+            delta (pd.DataFrame): The newly fetched rows.
+            table_name (str): The name of the table.
+            fingerprint (str): The query fingerprint of the cache entry.
+            key_columns (List[str], optional): Columns identifying a row. Defaults to None.
+
+        Returns:
+            str: 'none', 'append' or 'upsert', describing how the rows were merged.
+        """
+        if len(delta) == 0:
+            return 'none'
+
+        if key_columns:
+            # Only the key columns are loaded to check for rows that already exist
+            cached_keys = pd.MultiIndex.from_frame(self.cache.load(table_name, fingerprint, key_columns))
+            delta_keys = pd.MultiIndex.from_frame(delta[key_columns])
+            if delta_keys.isin(cached_keys).any():
+                cached = self.cache.load(table_name, fingerprint)
+                merged = pd.concat([cached, delta], ignore_index=True).drop_duplicates(subset=key_columns, keep='last')
+
+                # Concatenating categoricals with different categories falls back to object, so restore them
+                for column_name in cached.select_dtypes(include=['category']).columns:
+                    merged[column_name] = merged[column_name].astype('category')
+
+                metadata = self.cache.read_metadata(table_name, fingerprint)
+                self.cache.save(merged.reset_index(drop=True), table_name, fingerprint, metadata)
+                return 'upsert'
+
+        self.cache.append(delta, table_name, fingerprint)
+        return 'append'
+
+    def _table_column_types(self, table_name: str) -> Dict:
+        """
+        Look up the column types of a table once and remember them.
+        """
+        from sqlalchemy import inspect
+
+        if table_name not in self._column_types:
+            columns = inspect(self.engine).get_columns(table_name)
+            self._column_types[table_name] = {info['name']: info['type'] for info in columns}
+        return self._column_types[table_name]
+
+    @staticmethod
+    def _normalize_measures(measures: Dict[str, Union[str, List[str]]]) -> List[tuple]:
+        """
+        Turn a mapping of columns to one or more aggregations into (column, aggregation, output name) tuples.
+        """
+        normalized = []
+        for measure, aggregations in measures.items():
+            for aggregation in ([aggregations] if isinstance(aggregations, str) else aggregations):
+                normalized.append((measure, aggregation, f'{measure}_{aggregation}'))
+        return normalized
+
+    def _build_aggregate_query(self, table_name: str, dimensions: List[str], measures: List[tuple],
+                               filters: Optional[Dict] = None):
+        """
+        Compile an aggregation into a parameterized GROUP BY statement with quoted identifiers.
+        """
+        from sqlalchemy import Boolean, Float, Integer, cast, column, func, select, table
+
+        column_types = self._table_column_types(table_name)
+        source = table(table_name, *[column(name) for name in set(dimensions) | {m[0] for m in measures} | set(filters or {})])
+
+        selected = [source.c[dimension] for dimension in dimensions] + [func.count().label('rows')]
+        for measure, aggregation, name in measures:
+            expression = source.c[measure]
+            if isinstance(column_types.get(measure), Boolean) and aggregation in ('sum', 'mean'):
+                # Booleans cannot be summed directly in PostgreSQL, count them as 0/1 instead
+                expression = cast(expression, Integer)
+            aggregate = getattr(func, SQL_AGGREGATES[aggregation])(expression)
+            if aggregation in ('sum', 'mean'):
+                aggregate = cast(aggregate, Float)
+            selected.append(aggregate.label(name))
+
+        query = select(*selected)
+        for name, value in (filters or {}).items():
+            # Values are sent as bound parameters, never formatted into the SQL
+            if isinstance(value, (list, tuple, set)):
+                query = query.where(source.c[name].in_(list(value)))
+            else:
+                query = query.where(source.c[name] == value)
+
+        if dimensions:
+            query = query.group_by(*[source.c[dimension] for dimension in dimensions])
+            # Null groups sort last on every dialect, as they do in pandas
+            query = query.order_by(*[source.c[dimension].asc().nulls_last() for dimension in dimensions])
+        return query
+
+    @staticmethod
+    def _aggregate_frame(data_frame: pd.DataFrame, dimensions: List[str], measures: List[tuple],
+                         filters: Optional[Dict] = None) -> pd.DataFrame:
+        """
+        Run an aggregation locally with pandas, producing the same columns as the SQL query.
+
+        Like GROUP BY, rows with a null dimension form their own group, and sums and means are
+        returned as floats like the SQL query casts them.
+        """
+        for name, value in (filters or {}).items():
+            allowed = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            data_frame = data_frame[data_frame[name].isin(allowed)]
+
+        named_aggregations = {name: (measure, aggregation) for measure, aggregation, name in measures}
+        if not dimensions:
+            result = pd.DataFrame([{'rows': len(data_frame)}])
+            for name, (measure, aggregation) in named_aggregations.items():
+                result[name] = [data_frame[measure].agg(aggregation)]
+        else:
+            grouped = data_frame.groupby(dimensions, observed=True, sort=True, dropna=False)
+            result = grouped.size().rename('rows').to_frame()
+            if named_aggregations:
+                result = result.join(grouped.agg(**named_aggregations))
+            result = result.reset_index()
+
+        floats = [name for _, aggregation, name in measures if aggregation in ('sum', 'mean')]
+        return result.astype({name: np.float64 for name in floats})
+
+    def aggregate(self, table_name: str, dimensions: Optional[List[str]] = None,
+                  measures: Optional[Dict[str, Union[str, List[str]]]] = None, filters: Optional[Dict] = None,
+                  source: str = 'auto') -> pd.DataFrame:
+        """
+        Aggregate a table by dimensions, computing the aggregation where the data lives.
+
+        When the table is in the local cache the aggregation runs on the cached file with pandas,
+        otherwise it is compiled to a parameterized GROUP BY and only the small result is transferred.
+
+        Args:
+            table_name (str): The name of the table to aggregate.
+            dimensions (List[str], optional): The columns to group by. Defaults to a grand total.
+            measures (Dict, optional): Mapping of columns to an aggregation or list of aggregations
+                ('sum', 'mean', 'min', 'max', 'count'), e.g. {'revenue': 'sum'}. Defaults to None.
+            filters (Dict, optional): Mapping of columns to a value, or to a list of allowed values. Defaults to None.
+            source (str, optional): 'auto' (the cache if it holds the columns used, otherwise the database),
+                'database' or 'cache'. Defaults to 'auto'.
+
+        Returns:
+            pd.DataFrame: One row per group with the dimensions, a 'rows' count and a '<column>_<aggregation>'
+            column per measure.
+        """
+        dimensions = list(dimensions or [])
+        measures = self._normalize_measures(measures or {})
+
+        unknown = [aggregation for _, aggregation, _ in measures if aggregation not in SQL_AGGREGATES]
+        if unknown:
+            print(f"Aggregations {unknown} are not recognized. Use 'sum', 'mean', 'min', 'max' or 'count'.")
+            return None
+
+        # The cache can answer only if its entry holds every column the aggregation touches
+        needed = list(dict.fromkeys(dimensions + [m[0] for m in measures] + list(filters or {})))
+        fingerprint = self.cache.fingerprint(table_name) if self.cache is not None else None
+        cached_columns = self.cache.cached_columns(table_name, fingerprint) if fingerprint is not None else None
+        cached = bool(cached_columns) and set(needed) <= set(cached_columns)
+        if source == 'cache' or (source == 'auto' and cached):
+            if not cached:
+                print(f"Table '{table_name}' is not in the cache with the columns {needed}")
+                return None
+            # Only the columns the aggregation touches are read from the cached file
+            data_frame = self.cache.load(table_name, fingerprint, needed)
+            return self._aggregate_frame(data_frame, dimensions, measures, filters)
+
+        query = self._build_aggregate_query(table_name, dimensions, measures, filters)
+        with self.engine.connect() as connection:
+            return pd.read_sql(query, connection)
+
+    def _stratum_counts(self, table_name: str, strata: List[str], where: Optional[str] = None,
+                        params: Optional[Dict] = None) -> pd.Series:
+        """
+        Count the rows of every stratum of a table with a GROUP BY.
+        """
+        from sqlalchemy import column, func, select, table, text
+
+        source = table(table_name, *[column(name) for name in strata])
+        query = select(*source.columns, func.count().label('rows')).group_by(*source.columns)
+        if where:
+            query = query.where(text(where))
+        with self.engine.connect() as connection:
+            counts = pd.read_sql(query, connection, params=params)
+        return counts.set_index(strata)['rows']
+
+    def _build_sample_query(self, table_name: str, columns: Optional[List[str]], where: Optional[str],
+                            percent: float, method: str, seed: int):
+        """
+        Build a SELECT statement reading a TABLESAMPLE of a PostgreSQL table.
+        """
+        from sqlalchemy import column, func, literal, select, table, text
+
+        sampling = func.bernoulli(percent) if method == 'bernoulli' else func.system(percent)
+        source = table(table_name, *[column(name) for name in columns or []])
+        sampled = source.tablesample(sampling, name='sampled', seed=literal(seed))
+        query = select(*sampled.columns) if columns else select(text('*')).select_from(sampled)
+        if where:
+            query = query.where(text(where))
+        return query
+
+    def sample_rds_table(self, table_name: str, strata: List[str], size_per_stratum: int = 1000,
+                         columns: Optional[List[str]] = None, where: Optional[str] = None,
+                         params: Optional[Dict] = None, percent: Optional[float] = None, method: str = 'bernoulli',
+                         chunk_size: int = 50000, seed: int = 0) -> StratifiedSample:
+        """
+        Draw a stratified sample of a table, for approximate answers with confidence intervals.
+
+        On PostgreSQL the rows of every stratum are counted with a GROUP BY and only a
+        TABLESAMPLE of `percent` of the table is read. By default the percentage is chosen so
+        that an average stratum gets about twice `size_per_stratum` rows. Other databases are
+        streamed once through per-stratum reservoirs. Either way at most `size_per_stratum`
+        rows are kept per stratum, and the sample can still compute exact answers by streaming
+        the full table.
+
+        Args:
+            table_name (str): The name of the table to sample.
+            strata (List[str]): The columns defining the strata, e.g. ['region', 'month', 'revenue'].
+            size_per_stratum (int, optional): The maximum number of rows kept per stratum. Defaults to 1000.
+            columns (List[str], optional): Columns to read, the strata columns are always read. Defaults to all columns.
+            where (str, optional): A SQL predicate using named bind parameters. Defaults to None.
+            params (Dict, optional): Values for the bind parameters used in `where`. Defaults to None.
+            percent (float, optional): The percentage of the table TABLESAMPLE reads on PostgreSQL. Defaults to None.
+            method (str, optional): The TABLESAMPLE method, 'bernoulli' (rows) or 'system' (pages, faster
+                but clustered). Defaults to 'bernoulli'.
+            chunk_size (int, optional): Number of rows per chunk read. Defaults to 50000.
+            seed (int, optional): Seed for the sample. Defaults to 0.
+
+        Returns:
+            StratifiedSample: The sample, answering queries with estimates and confidence intervals.
+        """
+        if columns:
+            columns = list(dict.fromkeys(list(columns) + list(strata)))
+        reservoir = StratifiedReservoir(strata, size_per_stratum, seed)
+
+        def source():
+            return self.stream_rds_table(table_name, chunk_size, columns, where, params)
+
+        if self.engine.dialect.name != 'postgresql':
+            # Without TABLESAMPLE, stream the whole table through the reservoirs once
+            reservoir.update_chunks(source())
+            return reservoir.result(source=source)
+
+        population = self._stratum_counts(table_name, strata, where, params)
+        if percent is None:
+            percent = min(100.0, 200.0 * size_per_stratum * len(population) / max(int(population.sum()), 1))
+
+        query = self._build_sample_query(table_name, columns, where, percent, method, seed)
+        with self.engine.connect().execution_options(stream_results=True, max_row_buffer=chunk_size) as connection:
+            reservoir.update_chunks(pd.read_sql(query, connection, params=params, chunksize=chunk_size))
+
+        # Weight the sampled rows by the exact size of their strata, not by the rows TABLESAMPLE returned
+        return reservoir.result(population=population, source=source)
+
+    def save_to_cache(self, data_frame: pd.DataFrame, table_name: str, where: Optional[str] = None,
+                      params: Optional[Dict] = None):
+        """
+        Save an already extracted (and possibly converted) DataFrame as the cache entry for a table.
+
+        Args:
+            data_frame (pd.DataFrame): The DataFrame to cache.
+            table_name (str): The name of the table the data was read from.
+            where (str, optional): The predicate the data was read with. Defaults to None.
+            params (Dict, optional): The bind parameters the data was read with. Defaults to None.
+        """
+        if self.cache is None:
+            print("No cache has been configured for this DataExtractor")
+            return
+
+        fingerprint = self.cache.fingerprint(table_name, where, params)
+        self.cache.save(data_frame, table_name, fingerprint, {'where': where, 'params': params})
+
+    def read_csv(self, file_path: str, columns: Optional[List[str]] = None, dtypes: Optional[Dict] = None,
+                 chunk_size: Optional[int] = None):
+        """
+        Read a CSV file saved by `save_to_csv`, parsing the columns straight into the given dtypes.
+
+        Args:
+            file_path (str): The path of the CSV file.
+            columns (List[str], optional): Columns to read. Defaults to all columns.
+            dtypes (Dict, optional): Mapping of column names to dtypes, e.g. from `DtypePlanner.plan()`. Defaults to None.
+            chunk_size (int, optional): When given, return an iterator of chunks of this many rows. Defaults to None.
+
+        Returns:
+            pd.DataFrame or Iterator[pd.DataFrame]: The file contents, or an iterator over them in chunks.
+        """
+        if dtypes and columns:
+            dtypes = {column: dtype for column, dtype in dtypes.items() if column in columns}
+
+        # Passing the dtypes to the parser avoids materializing the default float64/object columns first
+        return pd.read_csv(file_path, usecols=columns, dtype=dtypes, chunksize=chunk_size)
+
     def save_to_csv(self, data_frame: pd.DataFrame, file_path: str):
         """
         Save a pandas DataFrame to a CSV file.
@@ -45,3 +647,22 @@ class DataExtractor:
         """
         # Save the DataFrame to a CSV file
         data_frame.to_csv(file_path, index=False)
+
+    def save_chunks_to_csv(self, chunks: Iterator[pd.DataFrame], file_path: str) -> int:
+        """
+        Save an iterator of DataFrame chunks to a single CSV file, one chunk at a time.
+
+        Args:
+            chunks (Iterator[pd.DataFrame]): The chunks to save, e.g. from `stream_rds_table`.
+            file_path (str): The file path to save the CSV file.
+
+        Returns:
+            int: The number of rows written.
+        """
+        rows_written = 0
+        for index, chunk in enumerate(chunks):
+            # Only write the header with the first chunk
+            chunk.to_csv(file_path, mode='w' if index == 0 else 'a', header=index == 0, index=False)
+            rows_written += len(chunk)
+
+        return rows_written
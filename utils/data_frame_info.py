@@ -1,5 +1,12 @@
 import pandas as pd
+from typing import Iterable, List, Optional
+from .instrumentation import instrument_class
+from .missingness import MissingnessAnalyzer
+from .parallel import ColumnExecutor, count_distinct
+from .profiler import DataFrameProfiler, ProfileResult
+from .sampling import StratifiedReservoir, StratifiedSample
 
+@instrument_class
 class DataFrameInfo:
     """
     A class for analyzing a pandas DataFrame.
@@ -15,24 +22,29 @@ class DataFrameInfo:
         # Initialize the DataFrame
         self.df = data_frame
 
-    def describe_columns(self) -> pd.DataFrame:
+    def describe_columns(self, verbose: bool = True) -> pd.DataFrame:
         """
         Describe all columns in the DataFrame to check their data types and other summary statistics.
 
+        Args:
+            verbose (bool, optional): Print the description. Defaults to True.
+
         Returns:
             pd.DataFrame: Summary statistics of the DataFrame.
         """
         # Describe the DataFrame
         description = self.df.describe(include='all')
-        print("Column Description:\n", description)
+        if verbose:
+            print("Column Description:\n", description)
         return description
 
-    def statistics(self, column: str = None) -> pd.Series:
+    def statistics(self, column: str = None, verbose: bool = True) -> pd.Series:
         """
         Extract median, standard deviation, and mean from the DataFrame or a specified column.
 
         Args:
             column (str, optional): The column name. Defaults to None.
+            verbose (bool, optional): Print the statistics. Defaults to True.
 
         Returns:
             pd.Series or pd.DataFrame: Summary statistics of the column or the entire DataFrame.
@@ -40,36 +52,46 @@ class DataFrameInfo:
         if not column:  
             # If no argument was added, return the stats for the entire DataFrame
             stats = self.df.describe()
-            print("Statistics for the entire DataFrame:\n", stats)
+            if verbose:
+                print("Statistics for the entire DataFrame:\n", stats)
             return stats
         elif column in self.df.columns:  
             # If a particular column is specified, return the stats for it alone
             stats = self.df[column].describe()
-            print(f"Statistics for column '{column}':\n", stats)
+            if verbose:
+                print(f"Statistics for column '{column}':\n", stats)
             return stats
         else:
             print("The column name you entered does not exist in the DataFrame")
             return None
 
-    def count_distinct_values(self, column: str = None) -> int:
+    def count_distinct_values(self, column: str = None, verbose: bool = True, n_jobs: Optional[int] = None) -> int:
         """
         Count distinct values in the DataFrame or a specified categorical column.
 
         Args:
             column (str, optional): The column name. Defaults to None.
+            verbose (bool, optional): Print the counts. Defaults to True.
+            n_jobs (int, optional): Count the columns in this many processes. Defaults to None.
 
         Returns:
             int or dict: The count of distinct values in the column or a dictionary of counts for all categorical columns.
         """
         if not column:  
             # If no column is specified, return distinct counts for all categorical columns
-            distinct_counts = {col: self.df[col].nunique() for col in self.df.select_dtypes(include=['category']).columns}
-            print("Distinct values for all categorical columns:\n", distinct_counts)
+            categorical_columns = list(self.df.select_dtypes(include=['category']).columns)
+            if n_jobs and n_jobs > 1:
+                distinct_counts = ColumnExecutor(n_jobs).map_columns(count_distinct, self.df, categorical_columns)
+            else:
+                distinct_counts = {col: self.df[col].nunique() for col in categorical_columns}
+            if verbose:
+                print("Distinct values for all categorical columns:\n", distinct_counts)
             return distinct_counts
         elif column in self.df.columns:  
             # If a particular column is specified, return the distinct count for that column
             distinct_count = self.df[column].nunique()
-            print(f"Distinct values in column '{column}': {distinct_count}")
+            if verbose:
+                print(f"Distinct values in column '{column}': {distinct_count}")
             return distinct_count
         else:
             print("The column name you entered does not exist in the DataFrame")
@@ -97,3 +119,68 @@ class DataFrameInfo:
         # Calculate the percentage of NULL values for each column
         null_percent = self.df.isnull().mean() * 100
         return null_percent
+
+    def missingness(self, columns: Optional[List[str]] = None,
+                    chunks: Optional[Iterable[pd.DataFrame]] = None) -> MissingnessAnalyzer:
+        """
+        Analyze the null patterns, to test whether values are missing completely at random and choose how to clean them.
+
+        For example, `info.missingness().little_mcar_test()['p_value']` runs Little's MCAR test on
+        the numeric columns, and `info.missingness().recommend()` suggests whether to drop or impute
+        the nulls of each column.
+
+        Args:
+            columns (List[str], optional): The columns to analyze. Defaults to every column.
+            chunks (Iterable[pd.DataFrame], optional): Analyze a stream of chunks instead of the DataFrame,
+                e.g. from `DataExtractor.stream_rds_table`. Defaults to None.
+
+        Returns:
+            MissingnessAnalyzer: The analyzed null patterns.
+        """
+        analyzer = MissingnessAnalyzer(columns)
+        if chunks is None:
+            return analyzer.update(self.df)
+        return analyzer.update_chunks(chunks)
+
+    def profile(self, chunks: Optional[Iterable[pd.DataFrame]] = None, verbose: bool = False, **kwargs) -> ProfileResult:
+        """
+        Profile every column in a single pass: counts, nulls, mean/std, min/max, quantiles and distinct counts.
+
+        Args:
+            chunks (Iterable[pd.DataFrame], optional): Profile a stream of chunks instead of the DataFrame,
+                e.g. from `DataExtractor.stream_rds_table`. Defaults to None.
+            verbose (bool, optional): Print the profile. Defaults to False.
+            **kwargs: Options passed on to `DataFrameProfiler`.
+
+        Returns:
+            ProfileResult: The profile of every column.
+        """
+        profiler = DataFrameProfiler(**kwargs)
+        if chunks is None:
+            profiler.update(self.df)
+        else:
+            profiler.update_chunks(chunks)
+
+        result = profiler.result()
+        if verbose:
+            result.print()
+        return result
+
+    def sample(self, strata: List[str], size_per_stratum: int = 1000, seed: int = 0) -> StratifiedSample:
+        """
+        Draw a stratified sample of the DataFrame, for approximate answers with confidence intervals.
+
+        For example, `info.sample(['region', 'month', 'revenue']).null_percentage()` estimates the
+        null percentages from at most `size_per_stratum` rows per stratum, and
+        `null_percentage(exact=True)` computes them over the whole DataFrame.
+
+        Args:
+            strata (List[str]): The columns defining the strata.
+            size_per_stratum (int, optional): The maximum number of rows kept per stratum. Defaults to 1000.
+            seed (int, optional): Seed for the sample. Defaults to 0.
+
+        Returns:
+            StratifiedSample: The sample.
+        """
+        reservoir = StratifiedReservoir(strata, size_per_stratum, seed).update(self.df)
+        return reservoir.result(source=lambda: [self.df])
@@ -1,23 +1,49 @@
+import datetime
+import json
 import pandas as pd
 import numpy as np
 from pandas.api.types import is_numeric_dtype
-from scipy import stats
-from typing import List
+from typing import Callable, Dict, List, Optional, Union
+from .diagnostics import Diagnostics
+from .instrumentation import instrument_class
+from .outliers import outlier_bounds
+from .parallel import ColumnExecutor, column_statistic, fit_power_lambda
 
+@instrument_class
 class DataTransformer:
     """
     A class for transforming data within a pandas DataFrame.
+
+    By default every method is applied immediately. In lazy mode the methods only record
+    their step into `self.plan`, and `execute()` runs an optimized version of the plan once.
+
+    The `fit_*` methods learn imputation values, power-transform lambdas and outlier bounds once
+    and store them in `self.fitted_params`, which `transform()` then applies to new batches
+    without refitting.
     """
 
-    def __init__(self, data_frame: pd.DataFrame):
+    def __init__(self, data_frame: pd.DataFrame, lazy: bool = False, copy: bool = True):
         """
         Initialize the DataTransformer with a pandas DataFrame.
 
         Args:
             data_frame (pd.DataFrame): The DataFrame to be transformed.
+            lazy (bool, optional): Record the transformations and run them with `execute()`. Defaults to False.
+            copy (bool, optional): Work on a copy of the DataFrame. Pass False to transform the
+                columns of the given DataFrame in place. Defaults to True.
         """
         # Make a copy of the input DataFrame to avoid modifying the original data
-        self.df = data_frame.copy()
+        self.df = data_frame.copy() if copy else data_frame
+        self.lazy = lazy
+        self.plan = []
+        self.fitted_params = {'impute': {}, 'power': {}, 'outliers': {}}
+
+    def _record(self, op: str, **kwargs) -> 'DataTransformer':
+        """
+        Record a step into the lazy plan.
+        """
+        self.plan.append({'op': op, **kwargs})
+        return self
 
     def convert_columns(self, columns: List[str], dtype, errors: str = 'coerce') -> pd.DataFrame:
         """
@@ -29,16 +55,14 @@ class DataTransformer:
             errors (str, optional): How to handle errors ('raise', 'ignore', 'coerce'). Defaults to 'coerce'.
 
         Returns:
-            pd.DataFrame: The DataFrame with converted columns.
+            pd.DataFrame: The DataFrame with converted columns (the DataTransformer itself in lazy mode).
         """
+        if self.lazy:
+            return self._record('convert_columns', columns=list(columns), dtype=dtype, errors=errors)
+
         for column in columns:
             try:
-                if is_numeric_dtype(dtype):
-                    # Convert column to numeric type
-                    self.df[column] = pd.to_numeric(self.df[column], errors=errors)
-                else:
-                    # Convert column to specified type
-                    self.df[column] = self.df[column].astype(dtype)
+                self.df[column] = self._convert_series(self.df[column], dtype, errors)
             except KeyError:
                 print(f"Column '{column}' does not exist in the DataFrame")
             except Exception as e:
@@ -46,35 +70,128 @@ class DataTransformer:
 
         return self.df
 
-    def impute_null(self, columns: List[str], method: str = 'mean') -> pd.DataFrame:
+    @staticmethod
+    def _category_codes(series: pd.Series) -> tuple:
+        """
+        Return the integer codes of a column and the categories they index, with -1 for nulls.
+
+        Categorical columns already hold both, other columns are factorized.
+        """
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series.cat.codes.to_numpy(), series.cat.categories
+        codes, uniques = pd.factorize(series)
+        return codes, pd.Index(uniques)
+
+    def derive_column(self, column: str, mapping: Union[Dict, Callable], new_column: str,
+                      default=None) -> pd.DataFrame:
+        """
+        Derive a categorical column by mapping the categories of a column to new labels.
+
+        The mapping is applied once per category and the labels are gathered by the integer
+        codes of the rows, so the cost is one call per category plus one vectorized take,
+        e.g. `derive_column('operating_systems', {'Android': 'Mobile', 'iOS': 'Mobile'}, 'device_type', 'Desktop')`.
+
+        Args:
+            column (str): The column to derive from.
+            mapping (Dict or Callable): A mapping of categories to labels, or a function called with each category.
+            new_column (str): The name of the derived column.
+            default (optional): The label of categories missing from a dict mapping. Defaults to None,
+                which leaves them null.
+
+        Returns:
+            pd.DataFrame: The DataFrame with the derived column (the DataTransformer itself in lazy mode).
+            Null values stay null.
+        """
+        if self.lazy:
+            return self._record('derive_column', columns=[column], mapping=mapping, new_column=new_column,
+                                default=default)
+
+        if column not in self.df.columns:
+            print(f"Column '{column}' does not exist in the DataFrame")
+            return self.df
+
+        codes, categories = self._category_codes(self.df[column])
+        if callable(mapping):
+            labels = [mapping(category) for category in categories]
+        else:
+            labels = [mapping.get(category, default) for category in categories]
+
+        # Factorize the labels, then look up the new code of every row, keeping -1 (null) as -1
+        label_codes, new_categories = pd.factorize(pd.Series(labels, dtype=object))
+        lookup = np.append(label_codes, -1)
+        derived = pd.Categorical.from_codes(lookup.take(codes), categories=new_categories)
+        self.df[new_column] = pd.Series(derived, index=self.df.index)
+        return self.df
+
+    def derive_flag(self, column: str, values: Union[List, Callable], new_column: str) -> pd.DataFrame:
+        """
+        Derive a boolean column flagging the rows whose category is in a set of values.
+
+        The flag is computed once per category and gathered by the integer codes of the rows,
+        e.g. `derive_flag('traffic_type', ['Facebook ads', 'Instagram ads'], 'ad_traffic')`.
+
+        Args:
+            column (str): The column to derive from.
+            values (List or Callable): The categories to flag, or a predicate called with each category.
+            new_column (str): The name of the derived column.
+
+        Returns:
+            pd.DataFrame: The DataFrame with the derived column (the DataTransformer itself in lazy mode).
+            Null values are flagged False.
+        """
+        if self.lazy:
+            return self._record('derive_flag', columns=[column], values=values, new_column=new_column)
+
+        if column not in self.df.columns:
+            print(f"Column '{column}' does not exist in the DataFrame")
+            return self.df
+
+        codes, categories = self._category_codes(self.df[column])
+        if callable(values):
+            flags = np.array([bool(values(category)) for category in categories], dtype=bool)
+        else:
+            flags = categories.isin(list(values))
+
+        # Code -1 (null) picks the appended False
+        lookup = np.append(flags, False)
+        self.df[new_column] = pd.Series(lookup.take(codes), index=self.df.index)
+        return self.df
+
+    def impute_null(self, columns: List[str], method: str = 'mean', n_jobs: Optional[int] = None) -> pd.DataFrame:
         """
         Impute missing values in the specified DataFrame columns using the specified method.
 
         Args:
             columns (List[str]): List of columns to impute missing values for.
             method (str): The method to use for imputation ('mean', 'median', 'mode').
+            n_jobs (int, optional): Compute the statistics of numeric columns in this many processes. Defaults to None.
 
         Returns:
-            pd.DataFrame: The DataFrame with imputed columns.
+            pd.DataFrame: The DataFrame with imputed columns (the DataTransformer itself in lazy mode).
         """
+        if self.lazy:
+            return self._record('impute_null', columns=list(columns), method=method, n_jobs=n_jobs)
+
+        # Fan the numeric columns out across processes, the rest are computed below
+        values = {}
+        if n_jobs and n_jobs > 1 and method in ('mean', 'median', 'mode'):
+            numeric_columns = [column for column in columns
+                               if column in self.df.columns and is_numeric_dtype(self.df[column].dtype)]
+            values = ColumnExecutor(n_jobs).map_columns(column_statistic, self.df, numeric_columns, method)
+
         for column in columns:
             if column not in self.df.columns:
                 print(f"Column '{column}' does not exist in the DataFrame")
                 continue
 
-            if method == 'mean':
-                value = self.df[column].mean()
-            elif method == 'median':
-                value = self.df[column].median()
-            elif method == 'mode':
-                value = self.df[column].mode()[0]
-            else:
+            value = values[column] if column in values else self._fit_statistic(self.df[column], method)
+            if value is None:
                 print(f"Method '{method}' is not recognized. Use 'mean', 'median', or 'mode'.")
                 continue
 
             # Fill null values with the computed value
             self.df[column] = self.df[column].fillna(value)
-        
+
         return self.df
 
     def remove_null(self, columns: List[str]) -> pd.DataFrame:
@@ -85,31 +202,68 @@ class DataTransformer:
             columns (List[str]): List of columns to check for null values.
 
         Returns:
-            pd.DataFrame: The DataFrame with rows containing null values in the specified columns removed.
+            pd.DataFrame: The DataFrame with rows containing null values in the specified columns removed
+            (the DataTransformer itself in lazy mode).
         """
+        if self.lazy:
+            return self._record('remove_null', columns=list(columns))
+
         # Drop rows where any of the specified columns have null values
         self.df = self.df.dropna(subset=columns)
         return self.df
 
-    def transform_skewed_columns(self, columns: List[str], method: str = 'box-cox') -> pd.DataFrame:
+    def skewed_columns(self, threshold: float = 1.0, columns: Optional[List[str]] = None,
+                       diagnostics: Optional[Diagnostics] = None) -> List[str]:
+        """
+        Find the columns skewed enough to be transformed.
+
+        Args:
+            threshold (float, optional): The absolute skewness above which a column is skewed. Defaults to 1.0.
+            columns (List[str], optional): The columns to check. Defaults to every numeric column.
+            diagnostics (Diagnostics, optional): Diagnostics already computed, e.g. for the Q-Q plots.
+                Defaults to computing them on the DataFrame.
+
+        Returns:
+            List[str]: The skewed columns, ready to pass to `transform_skewed_columns`.
+        """
+        if diagnostics is None:
+            diagnostics = Diagnostics().compute(self.df, columns)
+
+        skewed = diagnostics.skewed_columns(threshold)
+        return [column for column in skewed if columns is None or column in columns]
+
+    def transform_skewed_columns(self, columns: List[str], method: str = 'box-cox', n_jobs: Optional[int] = None) -> pd.DataFrame:
         """
         Apply transformation to specified skewed columns to reduce skewness.
 
         Args:
             columns (List[str]): List of columns to transform.
             method (str): The transformation method to use ('box-cox', 'log', or 'yeo-johnson').
+            n_jobs (int, optional): Fit the Box-Cox/Yeo-Johnson lambdas in this many processes. Defaults to None.
 
         Returns:
-            pd.DataFrame: The DataFrame with transformed columns.
+            pd.DataFrame: The DataFrame with transformed columns (the DataTransformer itself in lazy mode).
         """
+        from scipy import stats
+
+        if self.lazy:
+            return self._record('transform_skewed_columns', columns=list(columns), method=method, n_jobs=n_jobs)
+
+        if n_jobs and n_jobs > 1 and method in ('box-cox', 'yeo-johnson'):
+            # Only the lambda search is expensive, so fit it in parallel and apply the transforms here
+            existing = [column for column in columns if column in self.df.columns]
+            lambdas = ColumnExecutor(n_jobs).map_columns(fit_power_lambda, self.df, existing, method)
+
         for column in columns:
             if column not in self.df.columns:
                 print(f"Column '{column}' does not exist in the DataFrame")
                 continue
 
-            if method == 'log':
+            if n_jobs and n_jobs > 1 and method in ('box-cox', 'yeo-johnson'):
+                self.df[column] = self._power_transform(self.df[column], method, lambdas[column])
+            elif method == 'log':
                 # Apply log transformation
-                self.df[column] = self.df[column].apply(lambda x: np.log(x) if x > 0 else 0)
+                self.df[column] = self._log_transform(self.df[column])
             elif method == 'box-cox':
                 # Apply Box-Cox transformation
                 self.df[column], _ = stats.boxcox(self.df[column])
@@ -121,3 +275,456 @@ class DataTransformer:
                 continue
 
         return self.df
+
+    def handle_outliers(self, columns: List[str], method: str = 'iqr', action: str = 'clip',
+                        threshold: Optional[float] = None) -> pd.DataFrame:
+        """
+        Detect outliers in the specified columns and clip, flag or drop them.
+
+        Args:
+            columns (List[str]): List of columns to check.
+            method (str): The detection method ('iqr', 'zscore', 'mad' or 'isolation').
+            action (str): 'clip' values to the bounds, 'flag' them in a boolean `<column>_outlier` column,
+                or 'drop' the rows holding them.
+            threshold (float, optional): The IQR multiplier, z-score, robust z-score or isolation score
+                beyond which a value is an outlier. Defaults to 1.5, 3, 3.5 and 0.7 respectively.
+
+        Returns:
+            pd.DataFrame: The DataFrame with outliers handled (the DataTransformer itself in lazy mode).
+        """
+        if self.lazy:
+            return self._record('handle_outliers', columns=list(columns), method=method, action=action,
+                                threshold=threshold)
+
+        fitted = self.fit_outliers(columns, method, threshold, action)
+        self.df = self._apply_outliers(self.df, {column: fitted[column] for column in columns if column in fitted})
+        return self.df
+
+    def fit_outliers(self, columns: List[str], method: str = 'iqr', threshold: Optional[float] = None,
+                     action: str = 'clip', data_frame: Optional[pd.DataFrame] = None,
+                     sample_size: Optional[int] = None, random_state: int = 0) -> Dict:
+        """
+        Learn the bounds outside of which values of the specified columns are outliers.
+
+        The bounds of every column are computed together in one vectorized pass.
+
+        Args:
+            columns (List[str]): List of columns to fit.
+            method (str): The detection method ('iqr', 'zscore', 'mad' or 'isolation').
+            threshold (float, optional): The threshold of the method. Defaults to the method's default.
+            action (str): What `transform()` does with the outliers ('clip', 'flag' or 'drop').
+            data_frame (pd.DataFrame, optional): The data to fit on. Defaults to the transformer's DataFrame.
+            sample_size (int, optional): Fit on a random sample of this many rows. Defaults to None.
+            random_state (int, optional): Seed for the sample and the isolation trees. Defaults to 0.
+
+        Returns:
+            Dict: The fitted outlier parameters.
+        """
+        data_frame = self.df if data_frame is None else data_frame
+
+        if action not in ('clip', 'flag', 'drop'):
+            print(f"Action '{action}' is not recognized. Use 'clip', 'flag' or 'drop'.")
+            return self.fitted_params['outliers']
+
+        existing = []
+        for column in columns:
+            if column not in data_frame.columns:
+                print(f"Column '{column}' does not exist in the DataFrame")
+            else:
+                existing.append(column)
+        if not existing:
+            return self.fitted_params['outliers']
+
+        rows = data_frame[existing]
+        if sample_size is not None and sample_size < len(rows):
+            rows = rows.sample(sample_size, random_state=random_state)
+        values = np.column_stack([rows[column].to_numpy(dtype=np.float64, na_value=np.nan) for column in existing])
+
+        bounds = outlier_bounds(values, method, threshold, seed=random_state)
+        if bounds is None:
+            return self.fitted_params['outliers']
+
+        for column, lower, upper in zip(existing, *bounds):
+            self.fitted_params['outliers'][column] = {'method': method, 'lower': float(lower), 'upper': float(upper),
+                                                      'action': action}
+
+        return self.fitted_params['outliers']
+
+    def outlier_mask(self, data_frame: Optional[pd.DataFrame] = None, columns: Optional[List[str]] = None) -> pd.Series:
+        """
+        Return which rows hold an outlier in any fitted column, without copying the DataFrame.
+
+        Args:
+            data_frame (pd.DataFrame, optional): A batch or chunk to check. Defaults to the transformer's DataFrame.
+            columns (List[str], optional): The fitted columns to check. Defaults to every fitted column.
+
+        Returns:
+            pd.Series: True for the rows holding at least one outlier. Missing values are not outliers.
+        """
+        data_frame = self.df if data_frame is None else data_frame
+        params = self.fitted_params.get('outliers', {})
+        columns = [column for column in (columns or params) if column in params and column in data_frame.columns]
+
+        mask = np.zeros(len(data_frame), dtype=bool)
+        for column in columns:
+            values = data_frame[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            mask |= (values < params[column]['lower']) | (values > params[column]['upper'])
+        return pd.Series(mask, index=data_frame.index, name='outlier')
+
+    def _apply_outliers(self, data_frame: pd.DataFrame, params: Dict) -> pd.DataFrame:
+        """
+        Clip, flag or drop the outliers of the fitted columns of a DataFrame.
+        """
+        drop = [column for column, column_params in params.items() if column_params['action'] == 'drop']
+        for column, column_params in params.items():
+            if column not in data_frame.columns or column_params['action'] == 'drop':
+                continue
+            if column_params['action'] == 'clip':
+                data_frame[column] = data_frame[column].clip(column_params['lower'], column_params['upper'])
+            else:
+                data_frame[f'{column}_outlier'] = self.outlier_mask(data_frame, [column]).to_numpy()
+
+        if drop:
+            data_frame = data_frame[~self.outlier_mask(data_frame, drop).to_numpy()]
+        return data_frame
+
+    @staticmethod
+    def _fit_statistic(series: pd.Series, method: str):
+        """
+        Compute the imputation value of a column, or None if the method is not recognized.
+        """
+        if method == 'mean':
+            return series.mean()
+        elif method == 'median':
+            return series.median()
+        elif method == 'mode':
+            return series.mode()[0]
+        return None
+
+    @staticmethod
+    def _power_transform(series: pd.Series, method: str, lmbda: Optional[float] = None) -> pd.Series:
+        """
+        Apply a log, Box-Cox or Yeo-Johnson transform with a known lambda to a column.
+
+        Box-Cox and Yeo-Johnson keep missing values as missing. The log transform maps them to 0,
+        like every other value that is not positive.
+        """
+        from scipy import special, stats
+
+        if method == 'log':
+            return DataTransformer._log_transform(series)
+
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        if method == 'box-cox':
+            result = special.boxcox(values, lmbda)
+        else:
+            result = stats.yeojohnson(values, lmbda=lmbda)
+        return pd.Series(result, index=series.index, name=series.name)
+
+    def _fit_values(self, data_frame: pd.DataFrame, column: str, sample_size: Optional[int], random_state: int) -> pd.Series:
+        """
+        Return the non-null values of a column to fit on, down-sampled to `sample_size` rows if given.
+        """
+        values = data_frame[column].dropna()
+        if sample_size and len(values) > sample_size:
+            values = values.sample(sample_size, random_state=random_state)
+        return values
+
+    def fit_imputer(self, columns: List[str], method: str = 'mean', data_frame: Optional[pd.DataFrame] = None,
+                    sample_size: Optional[int] = None, random_state: int = 0) -> Dict:
+        """
+        Learn the values used to impute missing values in the specified columns.
+
+        Args:
+            columns (List[str]): List of columns to fit.
+            method (str): The method to use for imputation ('mean', 'median', 'mode').
+            data_frame (pd.DataFrame, optional): The data to fit on. Defaults to the transformer's DataFrame.
+            sample_size (int, optional): Fit on a random sample of this many non-null values. Defaults to None.
+            random_state (int, optional): Seed for the sample. Defaults to 0.
+
+        Returns:
+            Dict: The fitted imputation parameters.
+        """
+        data_frame = self.df if data_frame is None else data_frame
+
+        for column in columns:
+            if column not in data_frame.columns:
+                print(f"Column '{column}' does not exist in the DataFrame")
+                continue
+
+            value = self._fit_statistic(self._fit_values(data_frame, column, sample_size, random_state), method)
+            if value is None:
+                print(f"Method '{method}' is not recognized. Use 'mean', 'median', or 'mode'.")
+                continue
+
+            self.fitted_params['impute'][column] = {'method': method, 'value': value.item() if hasattr(value, 'item') else value}
+
+        return self.fitted_params['impute']
+
+    def fit_skew_transform(self, columns: List[str], method: str = 'yeo-johnson', data_frame: Optional[pd.DataFrame] = None,
+                           sample_size: Optional[int] = None, random_state: int = 0) -> Dict:
+        """
+        Learn the power-transform lambdas for the specified skewed columns.
+
+        Args:
+            columns (List[str]): List of columns to fit.
+            method (str): The transformation method to use ('box-cox', 'log', or 'yeo-johnson').
+            data_frame (pd.DataFrame, optional): The data to fit on. Defaults to the transformer's DataFrame.
+            sample_size (int, optional): Fit on a random sample of this many non-null values. Defaults to None.
+            random_state (int, optional): Seed for the sample. Defaults to 0.
+
+        Returns:
+            Dict: The fitted power-transform parameters.
+        """
+        data_frame = self.df if data_frame is None else data_frame
+
+        if method not in ('log', 'box-cox', 'yeo-johnson'):
+            print(f"Method '{method}' is not recognized. Use 'box-cox', 'log', or 'yeo-johnson'.")
+            return self.fitted_params['power']
+
+        for column in columns:
+            if column not in data_frame.columns:
+                print(f"Column '{column}' does not exist in the DataFrame")
+                continue
+
+            lmbda = None
+            if method != 'log':
+                values = self._fit_values(data_frame, column, sample_size, random_state)
+                lmbda = fit_power_lambda(values.to_numpy(dtype=np.float64), method)
+
+            self.fitted_params['power'][column] = {'method': method, 'lambda': lmbda}
+
+        return self.fitted_params['power']
+
+    def transform(self, data_frame: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Apply the fitted imputation values, then the fitted power transforms, then the fitted
+        outlier handling, to a DataFrame.
+
+        Args:
+            data_frame (pd.DataFrame, optional): A new batch to transform. Defaults to the transformer's DataFrame,
+                which is transformed in place.
+
+        Returns:
+            pd.DataFrame: The transformed DataFrame.
+        """
+        if data_frame is None:
+            data_frame = self.df
+        else:
+            # A shallow copy lets the fitted columns be replaced without touching the caller's frame
+            data_frame = data_frame.copy(deep=False)
+
+        for column, params in self.fitted_params['impute'].items():
+            if column in data_frame.columns:
+                data_frame[column] = data_frame[column].fillna(params['value'])
+
+        for column, params in self.fitted_params['power'].items():
+            if column in data_frame.columns:
+                data_frame[column] = self._power_transform(data_frame[column], params['method'], params['lambda'])
+
+        transformed = self._apply_outliers(data_frame, self.fitted_params.get('outliers', {}))
+        if data_frame is self.df:
+            # Dropping outliers returns a new frame, which replaces the transformer's own
+            self.df = transformed
+        return transformed
+
+    @staticmethod
+    def _encode_param(value):
+        """
+        Encode a fitted value JSON cannot store, such as the mode of a datetime column, as a tagged object.
+        """
+        if isinstance(value, np.datetime64):
+            value = pd.Timestamp(value)
+        elif isinstance(value, np.timedelta64):
+            value = pd.Timedelta(value)
+
+        if isinstance(value, (pd.Timestamp, datetime.datetime)):
+            value = pd.Timestamp(value)
+            return {'__type__': 'timestamp', 'value': value.isoformat(), 'tz': str(value.tz) if value.tz else None}
+        if isinstance(value, datetime.date):
+            return {'__type__': 'date', 'value': value.isoformat()}
+        if isinstance(value, (pd.Timedelta, datetime.timedelta)):
+            return {'__type__': 'timedelta', 'value': pd.Timedelta(value).isoformat()}
+        if isinstance(value, np.generic):
+            return value.item()
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    @staticmethod
+    def _decode_param(obj: Dict):
+        """
+        Restore a value encoded by `_encode_param`, leaving every other object unchanged.
+        """
+        value_type = obj.get('__type__')
+        if value_type == 'timestamp':
+            value = pd.Timestamp(obj['value'])
+            return value.tz_convert(obj['tz']) if obj.get('tz') else value
+        if value_type == 'date':
+            return datetime.date.fromisoformat(obj['value'])
+        if value_type == 'timedelta':
+            return pd.Timedelta(obj['value'])
+        return obj
+
+    def save_params(self, file_path: str):
+        """
+        Save the fitted parameters to a JSON file.
+
+        Timestamps, dates and timedeltas, e.g. the mode of a datetime column, are saved as tagged
+        objects that `load_params` restores.
+
+        Args:
+            file_path (str): The path of the JSON file.
+        """
+        # Encode everything before opening the file, so a failure does not leave it half written
+        try:
+            content = json.dumps(self.fitted_params, indent=2, default=self._encode_param)
+        except TypeError as e:
+            print(f"The fitted parameters could not be saved: {e}")
+            return
+        with open(file_path, 'w') as f:
+            f.write(content)
+
+    def load_params(self, file_path: str) -> Dict:
+        """
+        Load fitted parameters saved by `save_params`.
+
+        Args:
+            file_path (str): The path of the JSON file.
+
+        Returns:
+            Dict: The loaded parameters.
+        """
+        with open(file_path, 'r') as f:
+            self.fitted_params = json.load(f, object_hook=self._decode_param)
+        return self.fitted_params
+
+    @staticmethod
+    def _convert_series(series: pd.Series, dtype, errors: str = 'coerce') -> pd.Series:
+        """
+        Convert a single column to the specified data type.
+        """
+        if is_numeric_dtype(dtype):
+            # Convert column to numeric type
+            return pd.to_numeric(series, errors=errors)
+        # Convert column to specified type
+        return series.astype(dtype)
+
+    @staticmethod
+    def _log_transform(series: pd.Series) -> pd.Series:
+        """
+        Take the natural log of the positive values of a column, mapping every other value,
+        including missing values, to 0.
+        """
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        result = np.zeros_like(values)
+        np.log(values, out=result, where=values > 0)
+        return pd.Series(result, index=series.index, name=series.name)
+
+    @staticmethod
+    def _is_row_independent(step: Dict) -> bool:
+        """
+        Check whether a plan step transforms each value on its own, without statistics over the rows.
+        """
+        if step['op'] == 'convert_columns':
+            return True
+        return step['op'] == 'transform_skewed_columns' and step['method'] == 'log'
+
+    def optimize_plan(self) -> List[Dict]:
+        """
+        Optimize the recorded plan without executing it.
+
+        Row filters from `remove_null` are moved ahead of the row-independent steps they do not
+        depend on, adjacent filters are merged, and runs of row-independent steps are fused so
+        each affected column is computed once and written back once. Steps that compute statistics
+        over the rows (imputation, Box-Cox and Yeo-Johnson) are never reordered with filters,
+        because that would change the statistics.
+
+        Returns:
+            List[Dict]: The optimized plan.
+        """
+        optimized = []
+        for step in self.plan:
+            if step['op'] != 'remove_null':
+                optimized.append(dict(step))
+                continue
+
+            # Move the filter before the row-independent steps that do not write the columns it checks
+            position = len(optimized)
+            while (position > 0 and self._is_row_independent(optimized[position - 1])
+                   and not set(optimized[position - 1]['columns']) & set(step['columns'])):
+                position -= 1
+
+            if position > 0 and optimized[position - 1]['op'] == 'remove_null':
+                previous = optimized[position - 1]
+                previous['columns'] = previous['columns'] + [c for c in step['columns'] if c not in previous['columns']]
+            else:
+                optimized.insert(position, dict(step))
+
+        # Fuse runs of row-independent steps
+        fused = []
+        for step in optimized:
+            if self._is_row_independent(step):
+                if fused and fused[-1]['op'] == 'fused':
+                    fused[-1]['steps'].append(step)
+                else:
+                    fused.append({'op': 'fused', 'steps': [step]})
+            else:
+                fused.append(step)
+
+        return fused
+
+    def _execute_fused(self, steps: List[Dict]):
+        """
+        Run a fused run of row-independent steps, writing each affected column back once.
+        """
+        # Collect the operations of each column in plan order
+        column_ops = {}
+        for step in steps:
+            for column in step['columns']:
+                column_ops.setdefault(column, []).append(step)
+
+        for column, ops in column_ops.items():
+            if column not in self.df.columns:
+                print(f"Column '{column}' does not exist in the DataFrame")
+                continue
+
+            series = self.df[column]
+            for step in ops:
+                if step['op'] == 'convert_columns':
+                    try:
+                        series = self._convert_series(series, step['dtype'], step['errors'])
+                    except Exception as e:
+                        print(f"An error occurred while converting column '{column}': {e}")
+                else:
+                    series = self._log_transform(series)
+
+            self.df[column] = series
+
+    def execute(self) -> pd.DataFrame:
+        """
+        Optimize and run the recorded plan, then clear it.
+
+        Returns:
+            pd.DataFrame: The transformed DataFrame.
+        """
+        lazy, self.lazy = self.lazy, False
+        try:
+            for step in self.optimize_plan():
+                if step['op'] == 'fused':
+                    self._execute_fused(step['steps'])
+                elif step['op'] == 'remove_null':
+                    self.remove_null(step['columns'])
+                elif step['op'] == 'impute_null':
+                    self.impute_null(step['columns'], step['method'], step.get('n_jobs'))
+                elif step['op'] == 'transform_skewed_columns':
+                    self.transform_skewed_columns(step['columns'], step['method'], step.get('n_jobs'))
+                elif step['op'] == 'handle_outliers':
+                    self.handle_outliers(step['columns'], step['method'], step['action'], step['threshold'])
+                elif step['op'] == 'derive_column':
+                    self.derive_column(step['columns'][0], step['mapping'], step['new_column'], step['default'])
+                elif step['op'] == 'derive_flag':
+                    self.derive_flag(step['columns'][0], step['values'], step['new_column'])
+        finally:
+            self.lazy = lazy
+
+        self.plan = []
+        return self.df
@@ -1,6 +1,5 @@
 import yaml
-from sqlalchemy import create_engine, inspect, URL
-from sqlalchemy.exc import SQLAlchemyError, PendingRollbackError
+from .instrumentation import instrument_engine
 
 
 class RDSDatabaseConnector:
@@ -39,17 +38,33 @@ class RDSDatabaseConnector:
         """
         Initialize the database engine using the database credentials.
 
+        The connection pool is configured from the optional RDS_POOL_SIZE, RDS_MAX_OVERFLOW,
+        RDS_POOL_PRE_PING and RDS_POOL_RECYCLE entries of the credentials file. Query timings
+        are recorded in the trace when instrumentation is on.
+
         Returns:
             sqlalchemy.engine.Engine: The initialized database engine.
         """
+        from sqlalchemy import create_engine, URL
+
         url_object = URL.create(
             "postgresql",
             username=self.creds['RDS_USER'],
             password=self.creds['RDS_PASSWORD'],
             host=self.creds['RDS_HOST'],
+            port=self.creds.get('RDS_PORT'),
             database=self.creds['RDS_DATABASE'],
         )
-        engine = create_engine(url_object)
+        engine = create_engine(
+            url_object,
+            pool_size=self.creds.get('RDS_POOL_SIZE', 5),
+            max_overflow=self.creds.get('RDS_MAX_OVERFLOW', 10),
+            pool_pre_ping=self.creds.get('RDS_POOL_PRE_PING', True),
+            pool_recycle=self.creds.get('RDS_POOL_RECYCLE', 1800),
+        )
+
+        # Record every query in the trace of instrumented runs
+        instrument_engine(engine)
         return engine
 
 
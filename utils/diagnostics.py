@@ -0,0 +1,250 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Optional
+from .sketches import MomentAccumulator, ReservoirSample
+
+def plotting_positions(num_quantiles: int) -> np.ndarray:
+    """
+    Return Filliben's estimate of the uniform order statistic medians, as used by `scipy.stats.probplot`.
+
+    Args:
+        num_quantiles (int): The number of points.
+
+    Returns:
+        np.ndarray: The probabilities at which the quantiles are computed.
+    """
+    positions = np.empty(num_quantiles)
+    positions[-1] = 0.5 ** (1.0 / num_quantiles)
+    positions[0] = 1 - positions[-1]
+    positions[1:-1] = (np.arange(2, num_quantiles) - 0.3175) / (num_quantiles + 0.365)
+    return positions
+
+
+class ColumnDiagnostics:
+    """
+    The distribution diagnostics of a single column: its moments, its skewness and a fixed
+    number of quantiles, from which its normal Q-Q plot is drawn.
+    """
+
+    def __init__(self, column: str, moments: MomentAccumulator, probabilities: np.ndarray, quantiles: np.ndarray,
+                 approximate: bool = False):
+        """
+        Initialize the diagnostics of a column.
+
+        Args:
+            column (str): The column name.
+            moments (MomentAccumulator): The moments of the non-null values.
+            probabilities (np.ndarray): The probabilities of the quantiles.
+            quantiles (np.ndarray): The quantiles of the non-null values.
+            approximate (bool, optional): Whether the quantiles come from a sample. Defaults to False.
+        """
+        self.column = column
+        self.count = moments.count
+        self.mean = moments.mean if moments.count else np.nan
+        self.std = moments.std
+        self.skewness = moments.skewness
+        self.min = moments.min
+        self.max = moments.max
+        self.probabilities = probabilities
+        self.quantiles = quantiles
+        self.approximate = approximate
+
+    @property
+    def theoretical_quantiles(self) -> np.ndarray:
+        """
+        The standard normal quantiles at the same probabilities.
+        """
+        from scipy import stats
+        return stats.norm.ppf(self.probabilities)
+
+    def qq_fit(self) -> tuple:
+        """
+        Fit the least-squares line of the Q-Q plot, like `scipy.stats.probplot(fit=True)`.
+
+        Returns:
+            tuple: The slope, the intercept and the correlation coefficient r.
+        """
+        from scipy import stats
+
+        if len(self.quantiles) < 2 or np.isnan(self.quantiles).any():
+            return np.nan, np.nan, np.nan
+        result = stats.linregress(self.theoretical_quantiles, self.quantiles)
+        return result.slope, result.intercept, result.rvalue
+
+    def summary(self) -> Dict:
+        """
+        Summarize the diagnostics.
+
+        Returns:
+            Dict: The moments, the skewness and the Q-Q correlation of the column.
+        """
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'std': self.std,
+            'min': self.min,
+            'max': self.max,
+            'skewness': self.skewness,
+            'qq_r': self.qq_fit()[2],
+            'approximate': self.approximate,
+        }
+
+
+class Diagnostics:
+    """
+    A class for computing distribution diagnostics once per column and sharing them.
+
+    The moments and skewness of each column, and its quantiles at a fixed number of
+    probabilities, are computed in one pass. They are then used by `Plotter.plot_qq`,
+    `Plotter.plot_skewness` and `DataTransformer.skewed_columns` instead of each one
+    sorting or rescanning the column.
+
+    `compute()` takes the exact quantiles with a partial sort (np.partition), which never
+    sorts the full column. `update()` accumulates a stream of chunks, with the quantiles
+    estimated from a reservoir sample.
+    """
+
+    def __init__(self, num_quantiles: int = 200, sample_size: int = 100000, seed: int = 0):
+        """
+        Initialize the Diagnostics.
+
+        Args:
+            num_quantiles (int, optional): The number of quantile points per column. Defaults to 200.
+            sample_size (int, optional): Size of the reservoir sample used by `update()`. Defaults to 100000.
+            seed (int, optional): Seed for the reservoir samples. Defaults to 0.
+        """
+        self.num_quantiles = num_quantiles
+        self.sample_size = sample_size
+        self.seed = seed
+        self.probabilities = plotting_positions(num_quantiles)
+        self.columns = {}
+        self._moments = {}
+        self._samples = {}
+
+    @staticmethod
+    def _numeric_columns(data_frame: pd.DataFrame, columns: Optional[List[str]]) -> List[str]:
+        """
+        Return the requested columns, or every numeric column that is not boolean.
+        """
+        if columns is not None:
+            return list(columns)
+        return data_frame.select_dtypes(include='number', exclude='bool').columns.tolist()
+
+    def compute(self, data_frame: pd.DataFrame, columns: Optional[List[str]] = None) -> 'Diagnostics':
+        """
+        Compute the exact diagnostics of the columns of a DataFrame.
+
+        Args:
+            data_frame (pd.DataFrame): The DataFrame.
+            columns (List[str], optional): The columns to diagnose. Defaults to every numeric column.
+
+        Returns:
+            Diagnostics: The diagnostics.
+        """
+        for column in self._numeric_columns(data_frame, columns):
+            if column not in data_frame.columns:
+                print(f"Column '{column}' does not exist in the DataFrame")
+                continue
+
+            values = data_frame[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            values = values[~np.isnan(values)]
+            moments = MomentAccumulator().update(values)
+
+            # np.quantile partitions around the requested ranks only, it does not sort the column
+            quantiles = np.quantile(values, self.probabilities) if len(values) else np.full(self.num_quantiles, np.nan)
+            self.columns[column] = ColumnDiagnostics(column, moments, self.probabilities, quantiles)
+
+        return self
+
+    def update(self, chunk: pd.DataFrame, columns: Optional[List[str]] = None) -> 'Diagnostics':
+        """
+        Add a chunk of rows, estimating the quantiles from a reservoir sample.
+
+        Args:
+            chunk (pd.DataFrame): The rows to add.
+            columns (List[str], optional): The columns to diagnose. Defaults to every numeric column.
+
+        Returns:
+            Diagnostics: The diagnostics.
+        """
+        for column in self._numeric_columns(chunk, columns):
+            values = chunk[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            values = values[~np.isnan(values)]
+            if column not in self._moments:
+                self._moments[column] = MomentAccumulator()
+                self._samples[column] = ReservoirSample(self.sample_size, self.seed)
+            self._moments[column].update(values)
+            self._samples[column].update(values)
+
+            sample = self._samples[column]
+            self.columns[column] = ColumnDiagnostics(column, self._moments[column], self.probabilities,
+                                                     sample.quantile(self.probabilities),
+                                                     approximate=sample.count > len(sample.values))
+
+        return self
+
+    def update_chunks(self, chunks: Iterable[pd.DataFrame], columns: Optional[List[str]] = None) -> 'Diagnostics':
+        """
+        Add every chunk of a stream.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): The chunks to add.
+            columns (List[str], optional): The columns to diagnose. Defaults to every numeric column.
+
+        Returns:
+            Diagnostics: The diagnostics.
+        """
+        for chunk in chunks:
+            self.update(chunk, columns)
+        return self
+
+    def __getitem__(self, column: str) -> ColumnDiagnostics:
+        return self.columns[column]
+
+    def __contains__(self, column: str) -> bool:
+        return column in self.columns
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Return the diagnostics as a DataFrame with one row per column.
+
+        Returns:
+            pd.DataFrame: The moments, the skewness and the Q-Q correlation of each column.
+        """
+        return pd.DataFrame.from_dict({column: diagnostics.summary() for column, diagnostics in self.columns.items()},
+                                      orient='index')
+
+    def quantiles(self) -> pd.DataFrame:
+        """
+        Return the quantiles of every column, indexed by their probabilities.
+
+        Returns:
+            pd.DataFrame: One column of quantiles per diagnosed column.
+        """
+        return pd.DataFrame({column: diagnostics.quantiles for column, diagnostics in self.columns.items()},
+                            index=pd.Index(self.probabilities, name='probability'))
+
+    def skewness(self) -> pd.Series:
+        """
+        Return the skewness of every column.
+
+        Returns:
+            pd.Series: The skewness of each column.
+        """
+        return pd.Series({column: diagnostics.skewness for column, diagnostics in self.columns.items()}, dtype=np.float64)
+
+    def skewed_columns(self, threshold: float = 1.0) -> List[str]:
+        """
+        Return the columns whose absolute skewness is above a threshold.
+
+        Args:
+            threshold (float, optional): The absolute skewness above which a column is skewed. Defaults to 1.0.
+
+        Returns:
+            List[str]: The skewed columns.
+        """
+        skewness = self.skewness()
+        return skewness[skewness.abs() > threshold].index.tolist()
+
+    def __repr__(self) -> str:
+        return f"Diagnostics({len(self.columns)} columns, {self.num_quantiles} quantiles)"
@@ -0,0 +1,191 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_float_dtype, is_integer_dtype, is_numeric_dtype
+from typing import Dict, Iterable, Union
+
+# Candidate integer types, from the smallest to the largest
+INTEGER_TYPES = [np.int8, np.int16, np.int32, np.int64]
+
+class DtypePlanner:
+    """
+    A class for planning memory-efficient dtypes for the columns of a DataFrame.
+
+    The planner profiles the columns, either in one pass over a full frame or chunk by chunk,
+    and downcasts them: integer columns and integral float columns without nulls to the smallest
+    integer type, floats to float32 where no value moves by more than an absolute tolerance in
+    the round trip, and low-cardinality strings to categories.
+    Only columns that already have a bool dtype are planned as booleans: 'True'/'False' strings
+    are planned like other strings, since `astype('bool')` turns every non-empty string into True.
+    """
+
+    def __init__(self, category_threshold: float = 0.5, max_categories: int = 1000, float_tolerance: float = 1e-6):
+        """
+        Initialize the DtypePlanner.
+
+        Args:
+            category_threshold (float, optional): Largest ratio of distinct values to rows for a string
+                column to be stored as a category. Defaults to 0.5.
+            max_categories (int, optional): Largest number of distinct values for a category column. Defaults to 1000.
+            float_tolerance (float, optional): Largest absolute error allowed when downcasting floats
+                to float32. Defaults to 1e-6.
+        """
+        self.category_threshold = category_threshold
+        self.max_categories = max_categories
+        self.float_tolerance = float_tolerance
+        self.stats = {}
+
+    def profile(self, data_frame: pd.DataFrame) -> 'DtypePlanner':
+        """
+        Profile a complete DataFrame, discarding any previously gathered statistics.
+
+        Args:
+            data_frame (pd.DataFrame): The DataFrame to profile.
+
+        Returns:
+            DtypePlanner: The planner, to allow chaining `plan()`.
+        """
+        self.stats = {}
+        return self.update(data_frame)
+
+    def profile_chunks(self, chunks: Iterable[pd.DataFrame]) -> 'DtypePlanner':
+        """
+        Profile a stream of DataFrame chunks, e.g. from `DataExtractor.stream_rds_table`.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): The chunks to profile.
+
+        Returns:
+            DtypePlanner: The planner, to allow chaining `plan()`.
+        """
+        self.stats = {}
+        for chunk in chunks:
+            self.update(chunk)
+        return self
+
+    def update(self, chunk: pd.DataFrame) -> 'DtypePlanner':
+        """
+        Add a chunk of rows to the column statistics.
+
+        Args:
+            chunk (pd.DataFrame): The rows to add.
+
+        Returns:
+            DtypePlanner: The planner.
+        """
+        for column in chunk.columns:
+            series = chunk[column]
+            stats = self.stats.setdefault(column, {
+                'dtype': str(series.dtype), 'rows': 0, 'has_nulls': False, 'min': None, 'max': None,
+                'integral': True, 'float32_safe': True, 'values': set(),
+            })
+            stats['rows'] += len(series)
+
+            nulls = series.isna()
+            stats['has_nulls'] = stats['has_nulls'] or bool(nulls.any())
+            values = series[~nulls]
+            if len(values) == 0:
+                continue
+
+            if is_bool_dtype(series.dtype):
+                stats['kind'] = 'bool'
+            elif is_numeric_dtype(series.dtype):
+                stats.setdefault('kind', 'integer' if is_integer_dtype(series.dtype) else 'float')
+                array = values.to_numpy(dtype=np.float64)
+                low, high = array.min(), array.max()
+                stats['min'] = low if stats['min'] is None else min(stats['min'], low)
+                stats['max'] = high if stats['max'] is None else max(stats['max'], high)
+
+                if is_float_dtype(series.dtype):
+                    stats['kind'] = 'float'
+                    stats['integral'] = stats['integral'] and bool(np.all(array == np.floor(array)))
+                    # The relative error of float32 is always below 1e-7, so only an absolute bound is a real check
+                    with np.errstate(over='ignore', invalid='ignore'):
+                        error = np.abs(array.astype(np.float32).astype(np.float64) - array)
+                    stats['float32_safe'] = stats['float32_safe'] and bool(np.all(error <= self.float_tolerance))
+            elif isinstance(series.dtype, pd.CategoricalDtype) or series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+                stats['kind'] = 'string'
+                # Stop tracking the distinct values once there are too many for a category
+                if stats['values'] is not None:
+                    stats['values'].update(values.unique().tolist())
+                    if len(stats['values']) > self.max_categories:
+                        stats['values'] = None
+            else:
+                stats['kind'] = 'other'
+
+        return self
+
+    def _plan_column(self, stats: Dict):
+        """
+        Choose the dtype for one column from its statistics.
+        """
+        kind = stats.get('kind')
+
+        if kind == 'bool':
+            return 'boolean' if stats['has_nulls'] else 'bool'
+
+        # Integral floats with nulls stay floats, so imputing a mean or median into them still works
+        if kind == 'integer' or (kind == 'float' and stats['integral'] and not stats['has_nulls']):
+            for integer_type in INTEGER_TYPES:
+                info = np.iinfo(integer_type)
+                if info.min <= stats['min'] and stats['max'] <= info.max:
+                    name = np.dtype(integer_type).name
+                    # Integer columns that already hold nulls keep them in a nullable integer type
+                    return name.capitalize() if stats['has_nulls'] else name
+
+        if kind == 'float':
+            return 'float32' if stats['float32_safe'] else 'float64'
+
+        if kind == 'string' and stats['values'] is not None:
+            if len(stats['values']) <= self.category_threshold * stats['rows']:
+                # Fix the categories, so chunks read with the plan share one dtype and concatenate as categories
+                return pd.CategoricalDtype(sorted(stats['values'], key=str))
+
+        return stats['dtype']
+
+    def plan(self) -> Dict[str, Union[str, pd.CategoricalDtype]]:
+        """
+        Build the dtype plan from the gathered statistics.
+
+        Category columns are planned as a CategoricalDtype holding every value seen while profiling.
+
+        Returns:
+            Dict[str, Union[str, pd.CategoricalDtype]]: Mapping of column names to their planned dtypes,
+            suitable for the `dtypes` argument of the DataExtractor read methods.
+        """
+        return {column: self._plan_column(stats) for column, stats in self.stats.items()}
+
+    def apply(self, data_frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert a DataFrame to the planned dtypes.
+
+        Args:
+            data_frame (pd.DataFrame): The DataFrame to convert.
+
+        Returns:
+            pd.DataFrame: The converted DataFrame.
+        """
+        plan = {column: dtype for column, dtype in self.plan().items() if column in data_frame.columns}
+        return data_frame.astype(plan)
+
+    def report(self, data_frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Report the memory used by each column before and after applying the plan.
+
+        Args:
+            data_frame (pd.DataFrame): The DataFrame the plan was profiled on.
+
+        Returns:
+            pd.DataFrame: Current and planned dtypes and bytes, and the bytes saved, per column.
+        """
+        planned_frame = self.apply(data_frame)
+        current_bytes = data_frame.memory_usage(index=False, deep=True)
+        planned_bytes = planned_frame.memory_usage(index=False, deep=True)
+
+        report = pd.DataFrame({
+            'current_dtype': data_frame.dtypes.astype(str),
+            'planned_dtype': planned_frame.dtypes.astype(str),
+            'current_bytes': current_bytes,
+            'planned_bytes': planned_bytes,
+            'bytes_saved': current_bytes - planned_bytes,
+        })
+        return report
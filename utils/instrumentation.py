@@ -0,0 +1,413 @@
+import atexit
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import tracemalloc
+import pandas as pd
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+class Tracer:
+    """
+    A class recording timed spans of work for a run.
+
+    Each span records its wall time, CPU time of the calling thread, the peak memory allocated
+    while it ran (from tracemalloc) and, for calls on DataFrames, the rows and bytes going in and
+    out. Spans nest, and the trace can be saved as a JSON list of spans or as a Chrome trace
+    (chrome://tracing or https://ui.perfetto.dev).
+
+    tracemalloc counts every thread, so the peak memory of spans running concurrently in
+    several threads includes the allocations of the others.
+    """
+
+    def __init__(self, memory: bool = True):
+        """
+        Initialize the Tracer.
+
+        Args:
+            memory (bool, optional): Record the peak memory of each span with tracemalloc, which slows
+                allocation-heavy code down. Defaults to True.
+        """
+        self.memory = memory
+        self.spans = []
+        self.origin = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+
+    def start(self) -> 'Tracer':
+        """
+        Start tracing memory, if enabled.
+
+        Returns:
+            Tracer: The tracer.
+        """
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        return self
+
+    def stop(self) -> 'Tracer':
+        """
+        Stop tracing memory, if this tracer started it.
+
+        Returns:
+            Tracer: The tracer.
+        """
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        return self
+
+    def _stack(self) -> List[Dict]:
+        """
+        Return the stack of open spans of the current thread.
+        """
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def span(self, name: str, category: str = 'call', **args) -> Iterator[Dict]:
+        """
+        Record a span around a block of code.
+
+        Args:
+            name (str): The name of the span, e.g. 'DataTransformer.impute_null'.
+            category (str, optional): The category of the span, e.g. 'call' or 'sql'. Defaults to 'call'.
+            **args: Extra values stored with the span. The block can add more to the yielded dictionary.
+
+        Yields:
+            Dict: The span's arguments, e.g. to set 'rows_out' once it is known.
+        """
+        stack = self._stack()
+        frame = {'args': dict(args)}
+        tracing_memory = self.memory and tracemalloc.is_tracing()
+        if tracing_memory:
+            # Hand the peak so far to the enclosing span, then measure this span's own peak
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+            frame['start_memory'], frame['peak'] = current, current
+
+        stack.append(frame)
+        start_wall, start_cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield frame['args']
+        finally:
+            wall, cpu = time.perf_counter() - start_wall, time.thread_time() - start_cpu
+            stack.pop()
+
+            span = {
+                'name': name,
+                'category': category,
+                'start': start_wall - self.origin,
+                'wall_time': wall,
+                'cpu_time': cpu,
+                'thread': threading.get_ident(),
+                'depth': len(stack),
+            }
+            if tracing_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                frame['peak'] = max(frame['peak'], peak)
+                span['peak_memory'] = frame['peak'] - frame['start_memory']
+                if stack:
+                    stack[-1]['peak'] = max(stack[-1]['peak'], frame['peak'])
+                tracemalloc.reset_peak()
+            span.update(frame['args'])
+
+            with self._lock:
+                self.spans.append(span)
+
+    def record(self, name: str, category: str, start: float, wall_time: float, **args):
+        """
+        Record a span measured elsewhere, e.g. by the SQLAlchemy event hooks.
+
+        Args:
+            name (str): The name of the span.
+            category (str): The category of the span.
+            start (float): The `time.perf_counter()` value when it started.
+            wall_time (float): Its duration in seconds.
+            **args: Extra values stored with the span.
+        """
+        span = {'name': name, 'category': category, 'start': start - self.origin, 'wall_time': wall_time,
+                'thread': threading.get_ident(), 'depth': len(self._stack()), **args}
+        with self._lock:
+            self.spans.append(span)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Return the spans as a DataFrame, in the order they started.
+
+        Returns:
+            pd.DataFrame: One row per span.
+        """
+        return pd.DataFrame(self.spans).sort_values('start', kind='stable').reset_index(drop=True) \
+            if self.spans else pd.DataFrame()
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Summarize the spans by name, from the most total wall time down.
+
+        Returns:
+            pd.DataFrame: The calls, total and mean wall time, total CPU time and largest peak memory of each name.
+        """
+        spans = self.to_frame()
+        if spans.empty:
+            return spans
+        aggregations = {'calls': ('wall_time', 'size'), 'wall_time': ('wall_time', 'sum'),
+                        'mean_wall_time': ('wall_time', 'mean')}
+        if 'cpu_time' in spans:
+            aggregations['cpu_time'] = ('cpu_time', 'sum')
+        if 'peak_memory' in spans:
+            aggregations['peak_memory'] = ('peak_memory', 'max')
+        return spans.groupby(['category', 'name']).agg(**aggregations).sort_values('wall_time', ascending=False)
+
+    def chrome_trace(self) -> Dict:
+        """
+        Convert the spans to the Chrome trace event format.
+
+        Returns:
+            Dict: The trace, with one complete ('X') event per span.
+        """
+        events = []
+        for span in self.spans:
+            args = {key: value for key, value in span.items()
+                    if key not in ('name', 'category', 'start', 'wall_time', 'thread', 'depth')}
+            events.append({
+                'name': span['name'],
+                'cat': span['category'],
+                'ph': 'X',
+                'ts': span['start'] * 1e6,
+                'dur': span['wall_time'] * 1e6,
+                'pid': os.getpid(),
+                'tid': span['thread'],
+                'args': args,
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def save(self, file_path: str, file_format: str = 'chrome'):
+        """
+        Save the trace to a file.
+
+        Args:
+            file_path (str): The path of the JSON file.
+            file_format (str, optional): 'chrome' for the Chrome trace format, or 'json' for a list of spans.
+                Defaults to 'chrome'.
+        """
+        trace = self.chrome_trace() if file_format == 'chrome' else self.to_frame().to_dict(orient='records')
+        with open(file_path, 'w') as f:
+            json.dump(trace, f, indent=1, default=str)
+
+
+# The tracer of the current run, or None when instrumentation is off
+_active_tracer = None
+
+
+def get_tracer() -> Optional[Tracer]:
+    """
+    Return the active tracer, or None if tracing is off.
+    """
+    return _active_tracer
+
+
+def start_trace(memory: bool = True) -> Tracer:
+    """
+    Turn instrumentation on for the process.
+
+    Args:
+        memory (bool, optional): Record peak memory with tracemalloc. Defaults to True.
+
+    Returns:
+        Tracer: The new active tracer.
+    """
+    global _active_tracer
+    if _active_tracer is not None:
+        _active_tracer.stop()
+    _active_tracer = Tracer(memory).start()
+    return _active_tracer
+
+
+def stop_trace() -> Optional[Tracer]:
+    """
+    Turn instrumentation off.
+
+    Returns:
+        Tracer: The tracer that was active, holding the recorded spans.
+    """
+    global _active_tracer
+    tracer, _active_tracer = _active_tracer, None
+    if tracer is not None:
+        tracer.stop()
+    return tracer
+
+
+@contextmanager
+def trace_run(file_path: Optional[str] = None, file_format: str = 'chrome', memory: bool = True) -> Iterator[Tracer]:
+    """
+    Trace a block of code and optionally save the trace when it ends.
+
+    Args:
+        file_path (str, optional): Where to save the trace. Defaults to not saving it.
+        file_format (str, optional): 'chrome' or 'json'. Defaults to 'chrome'.
+        memory (bool, optional): Record peak memory with tracemalloc. Defaults to True.
+
+    Yields:
+        Tracer: The active tracer.
+    """
+    tracer = start_trace(memory)
+    try:
+        yield tracer
+    finally:
+        stop_trace()
+        if file_path:
+            tracer.save(file_path, file_format)
+
+
+def _frame_size(value) -> Optional[tuple]:
+    """
+    Return the rows and bytes of a DataFrame or Series, or None for anything else.
+    """
+    if isinstance(value, pd.DataFrame):
+        return len(value), int(value.memory_usage(index=True, deep=False).sum())
+    if isinstance(value, pd.Series):
+        return len(value), int(value.memory_usage(index=True, deep=False))
+    return None
+
+
+def _input_size(args: tuple, kwargs: Dict) -> Optional[tuple]:
+    """
+    Find the frame a call works on: its first DataFrame argument, or the `df`/`data_frame` of its instance.
+    """
+    for value in list(args[1:]) + list(kwargs.values()):
+        size = _frame_size(value)
+        if size is not None:
+            return size
+    if args:
+        for attribute in ('df', 'data_frame'):
+            size = _frame_size(getattr(args[0], attribute, None))
+            if size is not None:
+                return size
+    return None
+
+
+def traced(name: Optional[str] = None, category: str = 'call') -> Callable:
+    """
+    Decorate a function so each call is recorded as a span while tracing is on.
+
+    The rows and bytes of the frame going in and of the frame returned are recorded with the span.
+    A generator function is recorded as one span per chunk it yields. When tracing is off the
+    only cost is one check per call.
+
+    Args:
+        name (str, optional): The name of the spans. Defaults to the function's qualified name.
+        category (str, optional): The category of the spans. Defaults to 'call'.
+
+    Returns:
+        Callable: The decorator.
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                if _active_tracer is None:
+                    yield from func(*args, **kwargs)
+                    return
+                iterator = func(*args, **kwargs)
+                while True:
+                    tracer = _active_tracer
+                    if tracer is None:
+                        yield from iterator
+                        return
+                    with tracer.span(f"{span_name}.next", category) as span_args:
+                        try:
+                            chunk = next(iterator)
+                        except StopIteration:
+                            return
+                        size = _frame_size(chunk)
+                        if size is not None:
+                            span_args['rows_out'], span_args['bytes_out'] = size
+                    yield chunk
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = _active_tracer
+            if tracer is None:
+                return func(*args, **kwargs)
+            with tracer.span(span_name, category) as span_args:
+                size = _input_size(args, kwargs)
+                if size is not None:
+                    span_args['rows_in'], span_args['bytes_in'] = size
+                result = func(*args, **kwargs)
+                size = _frame_size(result)
+                if size is not None:
+                    span_args['rows_out'], span_args['bytes_out'] = size
+                return result
+        return wrapper
+
+    return decorator
+
+
+def instrument_class(cls: type) -> type:
+    """
+    Decorate every public method of a class with `traced`, naming the spans 'Class.method'.
+
+    Args:
+        cls (type): The class.
+
+    Returns:
+        type: The same class.
+    """
+    for attribute, value in list(vars(cls).items()):
+        if attribute.startswith('_'):
+            continue
+        if isinstance(value, (staticmethod, classmethod)):
+            setattr(cls, attribute, type(value)(traced(f"{cls.__name__}.{attribute}")(value.__func__)))
+        elif inspect.isfunction(value):
+            setattr(cls, attribute, traced(f"{cls.__name__}.{attribute}")(value))
+    return cls
+
+
+def instrument_engine(engine):
+    """
+    Record every SQL statement run on a SQLAlchemy engine as a 'sql' span while tracing is on.
+
+    Args:
+        engine (sqlalchemy.engine.Engine): The engine to instrument.
+
+    Returns:
+        sqlalchemy.engine.Engine: The same engine.
+    """
+    from sqlalchemy import event
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _active_tracer is not None:
+            conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('query_start')
+        if _active_tracer is None or not starts:
+            return
+        start = starts.pop()
+        _active_tracer.record('sql', 'sql', start, time.perf_counter() - start,
+                              statement=' '.join(statement.split())[:500], rowcount=cursor.rowcount,
+                              executemany=executemany)
+
+    return engine
+
+
+# Trace a whole run by setting EDA_TRACE to the path of the trace file (and EDA_TRACE_FORMAT to 'json'
+# for a list of spans instead of a Chrome trace)
+if os.environ.get('EDA_TRACE'):
+    start_trace(memory=os.environ.get('EDA_TRACE_MEMORY', '1') != '0')
+    atexit.register(lambda: _active_tracer is not None and _active_tracer.save(
+        os.environ['EDA_TRACE'], os.environ.get('EDA_TRACE_FORMAT', 'chrome')))
@@ -0,0 +1,43 @@
+import importlib
+
+
+class LazyModule:
+    """
+    A stand-in for a module that is only imported when one of its attributes is first used.
+
+    Heavy dependencies (matplotlib, seaborn, scipy) take longer to import than most short jobs
+    take to run, so modules that only need them for some of their functions bind them with
+    `plt = LazyModule('matplotlib.pyplot')` instead of `import matplotlib.pyplot as plt`.
+
+    Example:
+        sns = LazyModule('seaborn')
+        sns.heatmap(corr)  # seaborn is imported here
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize the stand-in without importing the module.
+
+        Args:
+            name (str): The absolute name of the module, e.g. 'matplotlib.pyplot'.
+        """
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        """
+        Import the module on first use and return it.
+        """
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attribute: str):
+        return getattr(self._load(), attribute)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<LazyModule '{self._name}' ({state})>"
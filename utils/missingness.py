@@ -0,0 +1,374 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+from typing import Dict, Iterable, List, Optional, Union
+
+# Null patterns are stored as the bits of an int64, one per column
+MAX_COLUMNS = 62
+
+
+class MissingnessAnalyzer:
+    """
+    A class for analyzing which values are missing, and whether they are missing completely at random.
+
+    Each row's null pattern is encoded as a bitmask with one bit per column, and the rows of
+    every pattern are summarized by their count and the sums and sums of squares of their
+    numeric columns. Alongside these, the pairwise-complete sums give the covariance of the
+    numeric columns. All of these are additive, so chunks are folded in one at a time in time
+    linear in the rows, and the results do not depend on how the rows were split.
+
+    Little's MCAR test, the tests of each column's missingness against the other columns and
+    the drop-or-impute recommendations are then computed from the per-pattern statistics alone.
+    """
+
+    def __init__(self, columns: Optional[List[str]] = None):
+        """
+        Initialize an empty analyzer.
+
+        Args:
+            columns (List[str], optional): The columns to analyze. Defaults to every column of the first chunk.
+        """
+        self.columns = list(columns) if columns is not None else None
+        self.numeric_columns = None
+        self.rows = 0
+        self.patterns = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0)
+        self.sums = None
+        self.squares = None
+        self.pair_counts = None
+        self.pair_sums = None
+        self.products = None
+        self.cubes = None
+        self.shift = None
+
+    def _start(self, chunk: pd.DataFrame):
+        """
+        Fix the columns, their bits and the shift of the numeric columns from the first chunk.
+        """
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+        if len(self.columns) > MAX_COLUMNS:
+            print(f"Only the first {MAX_COLUMNS} of {len(self.columns)} columns are analyzed")
+            self.columns = self.columns[:MAX_COLUMNS]
+
+        self.numeric_columns = [column for column in self.columns
+                                if is_numeric_dtype(chunk[column].dtype) and not is_bool_dtype(chunk[column].dtype)]
+        width = len(self.numeric_columns)
+        self.sums = np.empty((0, width))
+        self.squares = np.empty((0, width))
+        self.pair_counts = np.zeros((width, width))
+        self.pair_sums = np.zeros((width, width))
+        self.products = np.zeros((width, width))
+        self.cubes = np.zeros(width)
+
+        # Shifting each column by a typical value keeps the sums of squares accurate
+        self.shift = np.nan_to_num(chunk[self.numeric_columns].astype(np.float64).mean().to_numpy())
+
+    def update(self, chunk: pd.DataFrame) -> 'MissingnessAnalyzer':
+        """
+        Add a chunk of rows.
+
+        Args:
+            chunk (pd.DataFrame): The rows to add.
+
+        Returns:
+            MissingnessAnalyzer: The analyzer.
+        """
+        if self.numeric_columns is None:
+            self._start(chunk)
+        self.rows += len(chunk)
+
+        # Encode the null pattern of every row as a bitmask and number the distinct patterns
+        nulls = chunk[self.columns].isna().to_numpy()
+        codes = nulls.astype(np.int64) @ (np.int64(1) << np.arange(len(self.columns), dtype=np.int64))
+        patterns, inverse = np.unique(codes, return_inverse=True)
+
+        # Subtracting the shift copies the values, so the nulls can be zeroed in place
+        filled = chunk[self.numeric_columns].to_numpy(dtype=np.float64, na_value=np.nan) - self.shift
+        present = ~np.isnan(filled)
+        filled[~present] = 0.0
+        squared = filled * filled
+
+        counts = np.bincount(inverse, minlength=len(patterns)).astype(np.float64)
+        sums = self._sum_by(inverse, filled, len(patterns))
+        squares = self._sum_by(inverse, squared, len(patterns))
+        self._merge_patterns(patterns, counts, sums, squares)
+
+        # Pairwise-complete sums, for the covariance of every pair of numeric columns
+        weights = present.astype(np.float64)
+        self.pair_counts += weights.T @ weights
+        self.pair_sums += filled.T @ weights
+        self.products += filled.T @ filled
+        self.cubes += np.einsum('ij,ij->j', squared, filled)
+        return self
+
+    @staticmethod
+    def _sum_by(groups: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+        """
+        Sum the rows of a 2D array by group, into a (groups x columns) array.
+        """
+        sums = np.zeros((size, values.shape[1]))
+        for index in range(values.shape[1]):
+            sums[:, index] = np.bincount(groups, weights=values[:, index], minlength=size)
+        return sums
+
+    def _merge_patterns(self, patterns: np.ndarray, counts: np.ndarray, sums: np.ndarray, squares: np.ndarray):
+        """
+        Add the statistics of some patterns to the statistics of the patterns seen so far.
+        """
+        merged, inverse = np.unique(np.concatenate([self.patterns, patterns]), return_inverse=True)
+        self.counts = np.bincount(inverse, weights=np.concatenate([self.counts, counts]), minlength=len(merged))
+        self.sums = self._sum_by(inverse, np.concatenate([self.sums, sums]), len(merged))
+        self.squares = self._sum_by(inverse, np.concatenate([self.squares, squares]), len(merged))
+        self.patterns = merged
+
+    def update_chunks(self, chunks: Iterable[pd.DataFrame]) -> 'MissingnessAnalyzer':
+        """
+        Add every chunk of an iterator, e.g. from `DataExtractor.stream_rds_table`.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): The chunks to add.
+
+        Returns:
+            MissingnessAnalyzer: The analyzer.
+        """
+        for chunk in chunks:
+            self.update(chunk)
+        return self
+
+    def _missing(self, columns: List[str], patterns: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Return whether each column is null in each pattern, as a (patterns x columns) boolean array.
+        """
+        patterns = self.patterns if patterns is None else patterns
+        bits = np.array([self.columns.index(column) for column in columns], dtype=np.int64)
+        return ((patterns[:, None] >> bits[None, :]) & 1).astype(bool)
+
+    def pattern_table(self) -> pd.DataFrame:
+        """
+        Return the null patterns, most frequent first.
+
+        Returns:
+            pd.DataFrame: One row per pattern, with a boolean per column marking the nulls,
+            the number of rows and their fraction of all rows.
+        """
+        table = pd.DataFrame(self._missing(self.columns), columns=self.columns)
+        table['rows'] = self.counts.astype(np.int64)
+        table['fraction'] = self.counts / max(self.rows, 1)
+        return table.sort_values('rows', ascending=False, ignore_index=True)
+
+    def null_fraction(self) -> pd.Series:
+        """
+        Return the fraction of null values of each column.
+
+        Returns:
+            pd.Series: The null fraction of each column.
+        """
+        missing = self._missing(self.columns)
+        return pd.Series(self.counts @ missing / max(self.rows, 1), index=self.columns)
+
+    def mean(self) -> pd.Series:
+        """
+        Return the mean of the non-null values of each numeric column.
+
+        Returns:
+            pd.Series: The mean of each numeric column.
+        """
+        observed = ~self._missing(self.numeric_columns)
+        counts = self.counts @ observed
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return pd.Series(self.sums.sum(axis=0) / counts + self.shift, index=self.numeric_columns)
+
+    def skewness(self) -> pd.Series:
+        """
+        Return the adjusted Fisher-Pearson skewness of each numeric column, like `DataFrame.skew()`.
+
+        Returns:
+            pd.Series: The skewness of each numeric column.
+        """
+        # The pairwise-complete sums of a column with itself are its count, sum and sum of squares
+        n = np.diag(self.pair_counts)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.diag(self.pair_sums) / n
+            m2 = np.diag(self.products) - n * mean ** 2
+            m3 = self.cubes - 3 * mean * np.diag(self.products) + 2 * n * mean ** 3
+            skewness = np.sqrt(n) * m3 / m2 ** 1.5 * np.sqrt(n * (n - 1)) / (n - 2)
+        skewness = np.where(m2 > 0, skewness, 0.0)
+        return pd.Series(np.where(n > 2, skewness, np.nan), index=self.numeric_columns)
+
+    def covariance(self) -> pd.DataFrame:
+        """
+        Return the pairwise-complete covariance of the numeric columns, as `DataFrame.cov()` computes it.
+
+        Returns:
+            pd.DataFrame: The covariance matrix.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            covariance = (self.products - self.pair_sums * self.pair_sums.T / self.pair_counts) / (self.pair_counts - 1)
+        return pd.DataFrame(covariance, index=self.numeric_columns, columns=self.numeric_columns)
+
+    def little_mcar_test(self, columns: Optional[List[str]] = None) -> Dict:
+        """
+        Run Little's test of the null hypothesis that the numeric columns are missing completely at random.
+
+        The statistic sums, over the null patterns, the squared Mahalanobis distance between the
+        pattern's means and the overall means of its observed columns, weighted by the pattern's
+        number of rows. Like pyampute's `MCARTest.little_mcar_test`, the overall means and
+        covariance are taken over the available values of each column and pair of columns.
+
+        Args:
+            columns (List[str], optional): The numeric columns to test. Defaults to every numeric column.
+
+        Returns:
+            Dict: The 'statistic', its degrees of freedom 'df', the 'p_value' and the number of 'patterns',
+            or None if the covariance of the columns is singular.
+        """
+        from scipy import stats
+
+        columns = [column for column in (columns or self.numeric_columns) if column in self.numeric_columns]
+        indices = [self.numeric_columns.index(column) for column in columns]
+
+        # Patterns differing only in other columns are the same pattern for the test
+        missing = self._missing(columns)
+        patterns, inverse = np.unique(missing, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        counts = np.bincount(inverse, weights=self.counts, minlength=len(patterns))
+        sums = self._sum_by(inverse, self.sums[:, indices], len(patterns))
+
+        overall_mean = self.mean()[columns].to_numpy()
+        covariance = self.covariance().loc[columns, columns].to_numpy()
+
+        statistic, observed_total = 0.0, 0
+        for pattern, count, pattern_sums in zip(patterns, counts, sums):
+            observed = ~pattern
+            if not observed.any():
+                continue
+            difference = pattern_sums[observed] / count + self.shift[indices][observed] - overall_mean[observed]
+            try:
+                statistic += count * difference @ np.linalg.solve(covariance[np.ix_(observed, observed)], difference)
+            except np.linalg.LinAlgError:
+                print("The covariance of the columns is singular. Remove the columns that are linear combinations of others.")
+                return None
+            observed_total += int(observed.sum())
+
+        df = observed_total - len(columns)
+        p_value = float(stats.chi2.sf(statistic, df)) if df > 0 else 1.0
+        return {'statistic': float(statistic), 'df': df, 'p_value': p_value, 'patterns': len(patterns)}
+
+    def column_tests(self) -> pd.DataFrame:
+        """
+        Test, for each column with nulls, whether its missingness depends on the other numeric columns.
+
+        For every other numeric column a Welch t-test compares its mean over the rows where the
+        column is null with its mean over the rows where it is not. The smallest p-value is
+        Bonferroni-corrected for the number of columns compared.
+
+        Returns:
+            pd.DataFrame: For each column with nulls, the 'p_value' and the numeric column its
+            missingness is most associated with ('related_column').
+        """
+        from scipy import stats
+
+        results = {}
+        observed = ~self._missing(self.numeric_columns)
+        for column in self.columns:
+            column_missing = self._missing([column])[:, 0]
+            if not (self.counts * column_missing).any():
+                continue
+
+            p_values = {}
+            for index, other in enumerate(self.numeric_columns):
+                if other == column:
+                    continue
+                groups = []
+                for in_group in (column_missing, ~column_missing):
+                    mask = in_group & observed[:, index]
+                    n = self.counts[mask].sum()
+                    total = self.sums[mask, index].sum()
+                    squares = self.squares[mask, index].sum()
+                    groups.append((n, total, squares))
+                (n1, sum1, sq1), (n0, sum0, sq0) = groups
+                if n1 < 2 or n0 < 2:
+                    continue
+
+                mean1, mean0 = sum1 / n1, sum0 / n0
+                var1 = max(sq1 - n1 * mean1 ** 2, 0) / (n1 - 1)
+                var0 = max(sq0 - n0 * mean0 ** 2, 0) / (n0 - 1)
+                error = var1 / n1 + var0 / n0
+                if error == 0:
+                    continue
+                t = (mean1 - mean0) / np.sqrt(error)
+                df = error ** 2 / ((var1 / n1) ** 2 / (n1 - 1) + (var0 / n0) ** 2 / (n0 - 1))
+                p_values[other] = 2 * stats.t.sf(abs(t), df)
+
+            if p_values:
+                related = min(p_values, key=p_values.get)
+                results[column] = {'p_value': min(1.0, p_values[related] * len(p_values)), 'related_column': related}
+            else:
+                results[column] = {'p_value': np.nan, 'related_column': None}
+
+        return pd.DataFrame.from_dict(results, orient='index', columns=['p_value', 'related_column'])
+
+    def recommend(self, drop_threshold: float = 0.05, column_threshold: float = 0.5, alpha: float = 0.05,
+                  skew_threshold: float = 1.0) -> pd.DataFrame:
+        """
+        Recommend, for each column with nulls, whether to drop the rows, impute the values or drop the column.
+
+        A column missing in more than `column_threshold` of the rows is dropped. Rows are dropped
+        when the column is missing in at most `drop_threshold` of the rows and its missingness is
+        not related to the other columns (the p-value of `column_tests` is at least `alpha`), since
+        removing them then loses little data and introduces no bias. Otherwise the values are
+        imputed: with the median for numeric columns whose absolute skewness exceeds `skew_threshold`,
+        the mean for other numeric columns and the mode for the rest.
+
+        Args:
+            drop_threshold (float, optional): The largest null fraction for which rows are dropped. Defaults to 0.05.
+            column_threshold (float, optional): The null fraction above which the column is dropped. Defaults to 0.5.
+            alpha (float, optional): The significance level of the column tests. Defaults to 0.05.
+            skew_threshold (float, optional): The absolute skewness above which the median is imputed. Defaults to 1.0.
+
+        Returns:
+            pd.DataFrame: For each column with nulls, the 'null_fraction', the column test 'p_value',
+            the 'recommendation' ('drop_rows', 'impute' or 'drop_column') and the imputation 'method'.
+        """
+        null_fraction = self.null_fraction()
+        skewness = self.skewness()
+        tests = self.column_tests()
+
+        rows = {}
+        for column in tests.index:
+            fraction, p_value = null_fraction[column], tests.loc[column, 'p_value']
+            method = None
+            if fraction > column_threshold:
+                recommendation = 'drop_column'
+            elif fraction <= drop_threshold and not p_value < alpha:
+                recommendation = 'drop_rows'
+            else:
+                recommendation = 'impute'
+                if column not in self.numeric_columns:
+                    method = 'mode'
+                else:
+                    method = 'median' if abs(skewness[column]) > skew_threshold else 'mean'
+            rows[column] = {'null_fraction': fraction, 'p_value': p_value, 'recommendation': recommendation,
+                            'method': method}
+
+        return pd.DataFrame.from_dict(rows, orient='index',
+                                      columns=['null_fraction', 'p_value', 'recommendation', 'method'])
+
+
+def analyze_missingness(data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+                        columns: Optional[List[str]] = None) -> MissingnessAnalyzer:
+    """
+    Analyze the null patterns of a DataFrame or a stream of chunks.
+
+    Args:
+        data (pd.DataFrame or Iterable[pd.DataFrame]): The rows, or chunks of rows.
+        columns (List[str], optional): The columns to analyze. Defaults to every column.
+
+    Returns:
+        MissingnessAnalyzer: The analyzer, e.g. `analyze_missingness(df).little_mcar_test()['p_value']`.
+    """
+    analyzer = MissingnessAnalyzer(columns)
+    if isinstance(data, pd.DataFrame):
+        return analyzer.update(data)
+    return analyzer.update_chunks(data)
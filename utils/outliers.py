@@ -0,0 +1,134 @@
+import numpy as np
+from typing import Optional
+
+# The default threshold of each method: IQR multiplier, z-score, robust z-score and isolation score
+DEFAULT_THRESHOLDS = {'iqr': 1.5, 'zscore': 3.0, 'mad': 3.5, 'isolation': 0.7}
+
+
+def outlier_bounds(values: np.ndarray, method: str = 'iqr', threshold: Optional[float] = None,
+                   seed: int = 0) -> tuple:
+    """
+    Compute the lower and upper bounds of the normal values of every column at once.
+
+    Args:
+        values (np.ndarray): A 2D array with one column per DataFrame column. NaNs are ignored.
+        method (str, optional): 'iqr' (Tukey's fences), 'zscore', 'mad' (median absolute deviation)
+            or 'isolation' (isolation-forest scores). Defaults to 'iqr'.
+        threshold (float, optional): The IQR multiplier, the z-score, the robust z-score, or the isolation
+            score above which a value is an outlier. Defaults to `DEFAULT_THRESHOLDS[method]`.
+        seed (int, optional): Seed for the isolation trees. Defaults to 0.
+
+    Returns:
+        tuple: The lower and upper bounds, as arrays with one value per column, or None if the method
+            is not recognized.
+    """
+    threshold = DEFAULT_THRESHOLDS.get(method) if threshold is None else threshold
+    values = np.asarray(values, dtype=np.float64)
+
+    with np.errstate(all='ignore'):
+        if method == 'iqr':
+            q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+            spread = threshold * (q3 - q1)
+            return q1 - spread, q3 + spread
+        elif method == 'zscore':
+            mean, std = np.nanmean(values, axis=0), np.nanstd(values, axis=0, ddof=1)
+            return mean - threshold * std, mean + threshold * std
+        elif method == 'mad':
+            # 1.4826 scales the MAD to the standard deviation of a normal distribution
+            median = np.nanmedian(values, axis=0)
+            mad = 1.4826 * np.nanmedian(np.abs(values - median), axis=0)
+            return median - threshold * mad, median + threshold * mad
+        elif method == 'isolation':
+            bounds = [isolation_bounds(column[~np.isnan(column)], threshold, seed=seed) for column in values.T]
+            return np.array([b[0] for b in bounds]), np.array([b[1] for b in bounds])
+
+    print(f"Method '{method}' is not recognized. Use 'iqr', 'zscore', 'mad' or 'isolation'.")
+    return None
+
+
+def _average_path_length(size: np.ndarray) -> np.ndarray:
+    """
+    The average path length of an unsuccessful search in a binary search tree of `size` values.
+    """
+    size = np.asarray(size, dtype=np.float64)
+    result = np.zeros_like(size)
+    result[size == 2] = 1.0
+    large = size > 2
+    result[large] = 2 * (np.log(size[large] - 1) + np.euler_gamma) - 2 * (size[large] - 1) / size[large]
+    return result
+
+
+def _isolation_depth(points: np.ndarray, sample: np.ndarray, max_depth: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Grow one random isolation tree on a sorted sample and return the path length of each point.
+
+    A node of a 1D tree is a contiguous range of the sorted sample, so every point is tracked by
+    the range of its node and all the points are pushed down one level at a time.
+    """
+    low = np.zeros(len(points), dtype=np.int64)
+    high = np.full(len(points), len(sample), dtype=np.int64)
+    depth = np.zeros(len(points))
+    active = np.ones(len(points), dtype=bool)
+
+    for _ in range(max_depth):
+        # Nodes with a single distinct value cannot be split further
+        active &= (high - low > 1) & (sample[np.maximum(high - 1, 0)] > sample[low])
+        if not active.any():
+            break
+
+        # Draw one split value per node, shared by every point in that node
+        nodes, node_of_point = np.unique(low[active] * (len(sample) + 1) + high[active], return_inverse=True)
+        node_low, node_high = nodes // (len(sample) + 1), nodes % (len(sample) + 1)
+        split = rng.uniform(sample[node_low], sample[node_high - 1])
+        split_index = np.searchsorted(sample, split, side='left')
+
+        point_split = split[node_of_point]
+        go_left = points[active] < point_split
+        index = np.flatnonzero(active)
+        high[index[go_left]] = split_index[node_of_point][go_left]
+        low[index[~go_left]] = split_index[node_of_point][~go_left]
+        depth[active] += 1
+
+    # Points left in a node of several values would need this many more splits on average
+    return depth + _average_path_length(high - low)
+
+
+def isolation_bounds(values: np.ndarray, threshold: float = 0.7, num_trees: int = 100, subsample: int = 256,
+                     num_points: int = 512, seed: int = 0) -> tuple:
+    """
+    Compute the bounds of a column from the scores of a 1D isolation forest.
+
+    The forest is grown on random subsamples and scores `num_points` quantiles of the column,
+    and the bounds are the outermost scored values whose anomaly score is at most `threshold`.
+
+    Args:
+        values (np.ndarray): The non-null values of the column.
+        threshold (float, optional): The anomaly score, between 0 and 1, above which a value is an outlier.
+            Defaults to 0.7, about 2.5 standard deviations on normal data.
+        num_trees (int, optional): The number of trees. Defaults to 100.
+        subsample (int, optional): The number of values each tree is grown on. Defaults to 256.
+        num_points (int, optional): The number of quantiles scored. Defaults to 512.
+        seed (int, optional): Seed for the subsamples and splits. Defaults to 0.
+
+    Returns:
+        tuple: The lower and upper bound.
+    """
+    if len(values) == 0:
+        return np.nan, np.nan
+
+    rng = np.random.default_rng(seed)
+    points = np.unique(np.quantile(values, np.linspace(0, 1, num_points)))
+    size = min(subsample, len(values))
+    max_depth = int(np.ceil(np.log2(max(size, 2))))
+
+    total_depth = np.zeros(len(points))
+    for _ in range(num_trees):
+        sample = np.sort(rng.choice(values, size, replace=False))
+        total_depth += _isolation_depth(points, sample, max_depth, rng)
+
+    normaliser = max(_average_path_length(np.array([size]))[0], 1.0)
+    scores = 2.0 ** (-(total_depth / num_trees) / normaliser)
+    normal = points[scores <= threshold]
+    if len(normal) == 0:
+        return np.nan, np.nan
+    return normal.min(), normal.max()
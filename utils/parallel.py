@@ -0,0 +1,166 @@
+import multiprocessing
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional
+
+
+def process_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Create a process pool whose workers are started as fresh interpreters.
+
+    Forked workers inherit the locks held by the parent's other threads (thread pools, pyarrow's
+    I/O threads) at the moment of the fork, and deadlock when they next take one, so the workers
+    are spawned rather than forked. They import the functions they run by module name, so a
+    script using the pool must guard its entry point with `if __name__ == '__main__':`.
+
+    Args:
+        max_workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+
+    Returns:
+        ProcessPoolExecutor: The process pool.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+def fit_power_lambda(values: np.ndarray, method: str) -> float:
+    """
+    Find the Box-Cox or Yeo-Johnson lambda of a column, like `stats.boxcox`/`stats.yeojohnson` do.
+
+    Args:
+        values (np.ndarray): The column values.
+        method (str): 'box-cox' or 'yeo-johnson'.
+
+    Returns:
+        float: The fitted lambda.
+    """
+    from scipy import stats
+
+    if method == 'box-cox':
+        return float(stats.boxcox_normmax(values, method='mle'))
+    return float(stats.yeojohnson_normmax(values))
+
+
+def column_statistic(values: np.ndarray, method: str) -> float:
+    """
+    Compute the mean, median or mode of a numeric column, ignoring NaNs.
+
+    Args:
+        values (np.ndarray): The column values.
+        method (str): 'mean', 'median' or 'mode'.
+
+    Returns:
+        float: The statistic, or NaN if the column has no values.
+    """
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return np.nan
+    if method == 'mean':
+        return float(values.mean())
+    if method == 'median':
+        return float(np.median(values))
+
+    # np.unique sorts the values, so ties resolve to the smallest value like pd.Series.mode
+    unique, counts = np.unique(values, return_counts=True)
+    return unique[np.argmax(counts)].item()
+
+
+def count_distinct(values: np.ndarray) -> int:
+    """
+    Count the distinct values of a column buffer, ignoring NaNs and the -1 code of missing categories.
+
+    Args:
+        values (np.ndarray): The column values, or the codes of a categorical column.
+
+    Returns:
+        int: The number of distinct values.
+    """
+    if values.dtype.kind == 'f':
+        values = values[~np.isnan(values)]
+    elif values.dtype.kind in 'iu':
+        values = values[values >= 0]
+    return int(len(np.unique(values)))
+
+
+def _run_on_shared(func: Callable, name: str, shape: tuple, dtype: str, args: tuple):
+    """
+    Run a column function in a worker process on a column buffer held in shared memory.
+    """
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        values = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        return func(values, *args)
+    finally:
+        del values
+        block.close()
+
+
+class ColumnExecutor:
+    """
+    A class for fanning per-column work out across processes.
+
+    Column buffers are copied once into shared memory and the workers attach to them, so the
+    column data is never pickled. Results are gathered in the order of the columns, so the
+    output does not depend on which worker finishes first.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialize the ColumnExecutor.
+
+        Args:
+            max_workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+                With 1 worker the functions run in the calling process.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    @staticmethod
+    def column_buffer(series: pd.Series) -> np.ndarray:
+        """
+        Return a column as a plain NumPy buffer: category codes for categoricals, float64 otherwise.
+
+        Args:
+            series (pd.Series): The column.
+
+        Returns:
+            np.ndarray: The column buffer.
+        """
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series.cat.codes.to_numpy()
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    def map_columns(self, func: Callable, data_frame: pd.DataFrame, columns: List[str], *args) -> Dict:
+        """
+        Call `func(buffer, *args)` for the buffer of each column and gather the results.
+
+        Args:
+            func (Callable): A module-level function taking a NumPy array, so it can be sent to the workers.
+            data_frame (pd.DataFrame): The DataFrame holding the columns.
+            columns (List[str]): The columns to process.
+            *args: Extra arguments passed to `func`.
+
+        Returns:
+            Dict: Mapping of each column name to its result, in the order of `columns`.
+        """
+        if self.max_workers == 1 or len(columns) <= 1:
+            return {column: func(self.column_buffer(data_frame[column]), *args) for column in columns}
+
+        blocks = []
+        try:
+            tasks = []
+            for column in columns:
+                values = self.column_buffer(data_frame[column])
+                block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+                blocks.append(block)
+                np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[:] = values
+                tasks.append((block.name, values.shape, values.dtype.str))
+
+            with process_pool(min(self.max_workers, len(columns))) as executor:
+                futures = [executor.submit(_run_on_shared, func, name, shape, dtype, args) for name, shape, dtype in tasks]
+                return {column: future.result() for column, future in zip(columns, futures)}
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
@@ -0,0 +1,458 @@
+"""
+Run the EDA workflow as a pipeline of cached stages.
+
+Usage:
+    python -m utils.pipeline pipeline.yaml --targets plot_correlation --max-workers 4
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import time
+import pandas as pd
+import yaml
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+from .correlation import correlate
+from .data_cache import DataCache
+from .data_cube import DataCube
+from .data_extraction import DataExtractor
+from .data_transformer import DataTransformer
+from .db_utils import RDSDatabaseConnector
+from .instrumentation import trace_run
+from .parallel import process_pool
+
+
+def read_csv(file_path: str, columns: Optional[List[str]] = None, dtypes: Optional[Dict] = None) -> pd.DataFrame:
+    """
+    Load a CSV file.
+    """
+    return DataExtractor(None).read_csv(file_path, columns=columns, dtypes=dtypes)
+
+
+def extract_table(credentials: str, table_name: str, columns: Optional[List[str]] = None,
+                  where: Optional[str] = None) -> pd.DataFrame:
+    """
+    Extract a table from the RDS database.
+    """
+    connector = RDSDatabaseConnector(credentials)
+    return DataExtractor(connector.engine).read_rds_table(table_name, columns=columns, where=where)
+
+
+def save_csv(data_frame: pd.DataFrame, file_path: str) -> str:
+    """
+    Save a DataFrame to a CSV file and return its path.
+    """
+    DataExtractor(None).save_to_csv(data_frame, file_path)
+    return file_path
+
+
+def convert_columns(data_frame: pd.DataFrame, columns: List[str], dtype: str) -> pd.DataFrame:
+    """
+    Convert columns to a data type.
+    """
+    return DataTransformer(data_frame).convert_columns(columns, dtype)
+
+
+def remove_null(data_frame: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """
+    Remove the rows with missing values in the columns.
+    """
+    return DataTransformer(data_frame).remove_null(columns)
+
+
+def impute_null(data_frame: pd.DataFrame, columns: List[str], method: str = 'mean') -> pd.DataFrame:
+    """
+    Impute the missing values of the columns.
+    """
+    return DataTransformer(data_frame).impute_null(columns, method)
+
+
+def transform_skewed_columns(data_frame: pd.DataFrame, columns: Optional[List[str]] = None,
+                             method: str = 'yeo-johnson', threshold: Optional[float] = None) -> pd.DataFrame:
+    """
+    Power-transform the columns, by default every float and integer column, or only those
+    whose absolute skewness is above `threshold`.
+    """
+    transformer = DataTransformer(data_frame)
+    if columns is None:
+        columns = data_frame.select_dtypes(include=['float64', 'int64']).columns.tolist()
+    if threshold is not None:
+        columns = transformer.skewed_columns(threshold, columns)
+    return transformer.transform_skewed_columns(columns, method)
+
+
+def handle_outliers(data_frame: pd.DataFrame, columns: List[str], method: str = 'iqr', action: str = 'clip',
+                    threshold: Optional[float] = None) -> pd.DataFrame:
+    """
+    Clip, flag or drop the outliers of the columns.
+    """
+    return DataTransformer(data_frame).handle_outliers(columns, method, action, threshold)
+
+
+def drop_correlated_columns(data_frame: pd.DataFrame, threshold: float = 0.85, method: str = 'pearson',
+                            columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Drop one column from each pair of numeric columns correlated above the threshold.
+    """
+    if columns is None:
+        columns = data_frame.select_dtypes(include=['float64', 'int64']).columns.tolist()
+    return data_frame.drop(columns=correlate(data_frame[columns]).suggest_drop(threshold, method))
+
+
+def aggregate(data_frame: pd.DataFrame, dimensions: List[str], measure: Optional[str] = None,
+              agg: str = 'count') -> pd.DataFrame:
+    """
+    Group the rows by the dimensions and aggregate a measure, with one column per dimension.
+    """
+    cube = DataCube.from_frame(data_frame, dimensions, [measure] if measure is not None else None)
+    return cube.query(dimensions, measure, agg).reset_index()
+
+
+def plot(data_frame: pd.DataFrame, method: str, output_dir: str = 'plots', columns=None,
+         name: Optional[str] = None, **kwargs) -> str:
+    """
+    Draw one Plotter plot headlessly and return the path of the saved image.
+
+    `columns` is passed as the second argument of the plot method, and 'numeric' stands for
+    every float and integer column, like the selections in the notebook.
+    """
+    # plotter.py lives at the repository root, next to utils
+    from plotter import Plotter
+
+    args = []
+    if columns == 'numeric':
+        columns = data_frame.select_dtypes(include=['float64', 'int64']).columns.tolist()
+    if columns is not None:
+        args.append(columns)
+    return Plotter(headless=True, output_dir=output_dir).render(method, data_frame, *args, name=name or method, **kwargs)
+
+
+# The functions stages can name in a YAML pipeline, and whether they run in a separate process
+STAGE_FUNCTIONS = {
+    'read_csv': (read_csv, False),
+    'extract_table': (extract_table, False),
+    'save_csv': (save_csv, False),
+    'convert_columns': (convert_columns, False),
+    'remove_null': (remove_null, False),
+    'impute_null': (impute_null, False),
+    'transform_skewed_columns': (transform_skewed_columns, False),
+    'handle_outliers': (handle_outliers, False),
+    'drop_correlated_columns': (drop_correlated_columns, False),
+    'aggregate': (aggregate, False),
+    # pyplot is not thread-safe, so plots are drawn in worker processes
+    'plot': (plot, True),
+}
+
+
+class Stage:
+    """
+    A step of a Pipeline: a function called with the outputs of its input stages and its parameters.
+    """
+
+    def __init__(self, name: str, func: Callable, inputs: Optional[List[str]] = None, params: Optional[Dict] = None,
+                 processes: bool = False):
+        """
+        Initialize the Stage.
+
+        Args:
+            name (str): The name of the stage.
+            func (Callable): A module-level function called as `func(*inputs, **params)`.
+            inputs (List[str], optional): The names of the stages whose outputs are passed in. Defaults to None.
+            params (Dict, optional): The keyword arguments of the function. Defaults to None.
+            processes (bool, optional): Run the stage in a worker process instead of a thread. Defaults to False.
+        """
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs or [])
+        self.params = dict(params or {})
+        self.processes = processes
+
+
+class Pipeline:
+    """
+    A class for running a graph of stages with an on-disk cache of their outputs.
+
+    Each stage's output is cached under a key hashing its function, its parameters, the
+    size and modification time of any file a parameter names, and the keys of its inputs.
+    Changing a parameter therefore re-runs that stage and the stages downstream of it only.
+    Stages are started as soon as their inputs are ready, so independent branches such as
+    separate aggregations and plots run concurrently.
+
+    DataFrame outputs are stored as Parquet through DataCache without their index, so they are
+    passed on with a fresh RangeIndex whether they were just computed or loaded from the cache.
+    Other outputs are pickled.
+    """
+
+    def __init__(self, cache_dir: str = os.path.join('cache', 'pipeline'), max_workers: Optional[int] = None):
+        """
+        Initialize an empty Pipeline.
+
+        Args:
+            cache_dir (str, optional): The directory of the stage cache. Defaults to 'cache/pipeline'.
+            max_workers (int, optional): The number of stages run at once. Defaults to the number of CPUs.
+        """
+        self.cache = DataCache(cache_dir)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.stages = {}
+        self.report = []
+
+    def add_stage(self, name: str, func: Callable, inputs: Optional[List[str]] = None, params: Optional[Dict] = None,
+                  processes: bool = False) -> 'Pipeline':
+        """
+        Add a stage to the pipeline.
+
+        Args:
+            name (str): The name of the stage.
+            func (Callable): A module-level function called as `func(*inputs, **params)`.
+            inputs (List[str], optional): The names of the stages whose outputs are passed in. Defaults to None.
+            params (Dict, optional): The keyword arguments of the function. Defaults to None.
+            processes (bool, optional): Run the stage in a worker process instead of a thread. Defaults to False.
+
+        Returns:
+            Pipeline: The pipeline.
+        """
+        for stage_input in inputs or []:
+            if stage_input not in self.stages:
+                print(f"Stage '{name}' reads '{stage_input}', which must be added before it")
+                return self
+        self.stages[name] = Stage(name, func, inputs, params, processes)
+        return self
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'Pipeline':
+        """
+        Build a pipeline from a configuration dictionary.
+
+        Args:
+            config (Dict): The optional 'cache_dir' and 'max_workers', and 'stages': a mapping of stage
+                names to their 'function' (a name in STAGE_FUNCTIONS), 'inputs' and 'params', in order.
+
+        Returns:
+            Pipeline: The pipeline.
+        """
+        pipeline = cls(config.get('cache_dir', os.path.join('cache', 'pipeline')), config.get('max_workers'))
+        for name, stage in config['stages'].items():
+            if stage['function'] not in STAGE_FUNCTIONS:
+                print(f"Function '{stage['function']}' of stage '{name}' is not recognized. "
+                      f"Use one of {sorted(STAGE_FUNCTIONS)}.")
+                continue
+            func, processes = STAGE_FUNCTIONS[stage['function']]
+            pipeline.add_stage(name, func, stage.get('inputs'), stage.get('params'), stage.get('processes', processes))
+        return pipeline
+
+    @classmethod
+    def from_yaml(cls, file_path: str) -> 'Pipeline':
+        """
+        Build a pipeline from a YAML file, see `from_config` for its layout.
+
+        Args:
+            file_path (str): The path of the YAML file.
+
+        Returns:
+            Pipeline: The pipeline.
+        """
+        with open(file_path, 'r') as f:
+            return cls.from_config(yaml.safe_load(f))
+
+    @staticmethod
+    def _function_name(func: Callable) -> str:
+        """
+        Name a stage function by its STAGE_FUNCTIONS entry, so keys match under `python -m utils.pipeline` too.
+        """
+        for name, (registered, _) in STAGE_FUNCTIONS.items():
+            if registered is func:
+                return name
+        return f"{func.__module__}.{func.__qualname__}"
+
+    def stage_key(self, name: str, keys: Optional[Dict[str, str]] = None) -> str:
+        """
+        Compute the cache key of a stage from its definition and the keys of its inputs.
+
+        Args:
+            name (str): The name of the stage.
+            keys (Dict[str, str], optional): Keys already computed, filled in as a memo. Defaults to None.
+
+        Returns:
+            str: A hexadecimal key.
+        """
+        keys = {} if keys is None else keys
+        if name not in keys:
+            stage = self.stages[name]
+            files = {value: [os.stat(value).st_size, os.stat(value).st_mtime_ns] for value in stage.params.values()
+                     if isinstance(value, str) and os.path.isfile(value)}
+            definition = json.dumps({
+                'function': self._function_name(stage.func),
+                'params': stage.params,
+                'files': files,
+                'inputs': [self.stage_key(stage_input, keys) for stage_input in stage.inputs],
+            }, sort_keys=True, default=str)
+            keys[name] = hashlib.sha256(definition.encode('utf-8')).hexdigest()[:16]
+        return keys[name]
+
+    def _dependencies(self, targets: List[str]) -> List[str]:
+        """
+        List the targets and every stage they depend on, in the order the stages were added.
+        """
+        needed = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.stages[name].inputs)
+        return [name for name in self.stages if name in needed]
+
+    def _pickle_path(self, name: str, key: str) -> str:
+        """
+        Return the path of a pickled stage output.
+        """
+        return os.path.join(self.cache.cache_dir, f"{name}-{key}.pkl")
+
+    def is_cached(self, name: str, key: Optional[str] = None) -> bool:
+        """
+        Check whether the output of a stage is in the cache.
+
+        Args:
+            name (str): The name of the stage.
+            key (str, optional): The stage key. Defaults to computing it.
+
+        Returns:
+            bool: True if the stage does not need to run.
+        """
+        key = key or self.stage_key(name)
+        return self.cache.exists(name, key) or os.path.isfile(self._pickle_path(name, key))
+
+    def _save(self, name: str, key: str, output: Any) -> Any:
+        """
+        Store the output of a stage and return it as later stages will see it.
+        """
+        if isinstance(output, pd.DataFrame):
+            output = output.reset_index(drop=True)
+            self.cache.save(output, name, key, {'stage': name})
+        else:
+            os.makedirs(self.cache.cache_dir, exist_ok=True)
+            with open(self._pickle_path(name, key), 'wb') as f:
+                pickle.dump(output, f)
+        return output
+
+    def _load(self, name: str, key: str) -> Any:
+        """
+        Load the cached output of a stage.
+        """
+        if self.cache.exists(name, key):
+            return self.cache.load(name, key)
+        with open(self._pickle_path(name, key), 'rb') as f:
+            return pickle.load(f)
+
+    def run(self, targets: Optional[List[str]] = None, force: bool = False, verbose: bool = False) -> Dict[str, Any]:
+        """
+        Run the stages needed for the targets, reusing every cached output that is still valid.
+
+        Args:
+            targets (List[str], optional): The stages whose outputs are wanted. Defaults to every stage.
+            force (bool, optional): Re-run the stages even if their outputs are cached. Defaults to False.
+            verbose (bool, optional): Print whether each stage ran or was cached. Defaults to False.
+
+        Returns:
+            Dict[str, Any]: The output of each target.
+        """
+        targets = list(targets or self.stages)
+        unknown = [name for name in targets if name not in self.stages]
+        if unknown:
+            print(f"Stages {unknown} are not in the pipeline")
+            return {}
+
+        needed = self._dependencies(targets)
+        keys = {}
+        for name in needed:
+            self.stage_key(name, keys)
+        pending = [name for name in needed if force or not self.is_cached(name, keys[name])]
+        finished = set(needed) - set(pending)
+        outputs = {}
+        self.report = [{'stage': name, 'status': 'cached', 'seconds': 0.0} for name in needed if name in finished]
+
+        def output_of(name):
+            if name not in outputs:
+                outputs[name] = self._load(name, keys[name])
+            return outputs[name]
+
+        threads = ThreadPoolExecutor(max_workers=self.max_workers)
+        processes = None
+        running = {}
+        try:
+            while pending or running:
+                # Start every stage whose inputs are ready
+                for name in [name for name in pending if all(i in finished for i in self.stages[name].inputs)]:
+                    stage = self.stages[name]
+                    if stage.processes and processes is None:
+                        processes = process_pool(self.max_workers)
+                    executor = processes if stage.processes else threads
+                    inputs = [output_of(stage_input) for stage_input in stage.inputs]
+                    running[executor.submit(stage.func, *inputs, **stage.params)] = (name, time.perf_counter())
+                    pending.remove(name)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, started = running.pop(future)
+                    try:
+                        output = future.result()
+                    except Exception as e:
+                        print(f"Stage '{name}' failed: {e}")
+                        for other in running:
+                            other.cancel()
+                        raise
+                    outputs[name] = self._save(name, keys[name], output)
+                    finished.add(name)
+                    self.report.append({'stage': name, 'status': 'ran', 'seconds': time.perf_counter() - started})
+                    if verbose:
+                        print(f"{name}: ran in {self.report[-1]['seconds']:.2f} s")
+        finally:
+            threads.shutdown(cancel_futures=True)
+            if processes is not None:
+                processes.shutdown(cancel_futures=True)
+
+        if verbose:
+            for entry in self.report:
+                if entry['status'] == 'cached':
+                    print(f"{entry['stage']}: cached")
+        return {name: output_of(name) for name in targets}
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Run a pipeline from a YAML file on the command line.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('config', help='The YAML file declaring the stages')
+    parser.add_argument('--targets', nargs='+', help='The stages to produce. Defaults to every stage.')
+    parser.add_argument('--force', action='store_true', help='Re-run the stages even if their outputs are cached')
+    parser.add_argument('--max-workers', type=int, help='The number of stages run at once')
+    parser.add_argument('--cache-dir', help='Override the cache directory of the YAML file')
+    parser.add_argument('--trace', help='Save a Chrome trace of the run to this file. Stages run in worker processes are not traced.')
+    args = parser.parse_args(argv)
+
+    with open(args.config, 'r') as f:
+        config = yaml.safe_load(f)
+    if args.cache_dir:
+        config['cache_dir'] = args.cache_dir
+    if args.max_workers:
+        config['max_workers'] = args.max_workers
+
+    pipeline = Pipeline.from_config(config)
+    start = time.perf_counter()
+    if args.trace:
+        with trace_run(args.trace) as tracer:
+            outputs = pipeline.run(args.targets, force=args.force, verbose=True)
+        print(tracer.summary())
+    else:
+        outputs = pipeline.run(args.targets, force=args.force, verbose=True)
+    print(f"Finished {len(outputs)} targets in {time.perf_counter() - start:.2f} s")
+    for name, output in outputs.items():
+        description = f"DataFrame {output.shape}" if isinstance(output, pd.DataFrame) else repr(output)
+        print(f"  {name}: {description}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,298 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+from typing import Dict, Iterable, List, Optional
+from .sketches import FrequencyAccumulator, HyperLogLog, MomentAccumulator, ReservoirSample
+
+class ColumnProfile:
+    """
+    A mergeable profile of a single column.
+
+    Every chunk of the column is read once to update the row and null counts, the moments
+    (Welford), the quantile sample and the distinct count. Distinct values are counted exactly
+    until there are more than `exact_distinct_limit` of them, then with HyperLogLog.
+    """
+
+    def __init__(self, dtype: str, sample_size: int = 100000, exact_distinct_limit: int = 10000, seed: int = 0):
+        """
+        Initialize an empty column profile.
+
+        Args:
+            dtype (str): The dtype of the column.
+            sample_size (int, optional): Size of the reservoir sample used for quantiles. Defaults to 100000.
+            exact_distinct_limit (int, optional): Largest number of distinct values counted exactly. Defaults to 10000.
+            seed (int, optional): Seed for the reservoir sample. Defaults to 0.
+        """
+        self.dtype = dtype
+        self.numeric = False
+        self.rows = 0
+        self.nulls = 0
+        self.exact_distinct_limit = exact_distinct_limit
+        self.moments = MomentAccumulator()
+        self.sample = ReservoirSample(sample_size, seed)
+        self.frequencies = FrequencyAccumulator()
+        self.hll = None
+        self.value_dtype = None
+
+    def update(self, series: pd.Series) -> 'ColumnProfile':
+        """
+        Add a chunk of the column.
+
+        Args:
+            series (pd.Series): The chunk to add.
+
+        Returns:
+            ColumnProfile: The profile.
+        """
+        nulls = series.isna().to_numpy()
+        self.rows += len(series)
+        self.nulls += int(nulls.sum())
+        values = series.to_numpy()[~nulls]
+        self.value_dtype = values.dtype
+
+        self.numeric = is_numeric_dtype(series.dtype) and not is_bool_dtype(series.dtype)
+        if self.numeric:
+            numbers = values.astype(np.float64)
+            self.moments.update(numbers)
+            self.sample.update(numbers)
+
+        if self.hll is None:
+            self.frequencies.update(values)
+            if len(self.frequencies.counts) > self.exact_distinct_limit:
+                # Too many distinct values to count exactly, switch to HyperLogLog
+                self._switch_to_hll()
+        else:
+            self.hll.update(values)
+
+        return self
+
+    def merge(self, other: 'ColumnProfile') -> 'ColumnProfile':
+        """
+        Merge the profile of another chunk or partition of the same column.
+
+        Args:
+            other (ColumnProfile): The profile to merge.
+
+        Returns:
+            ColumnProfile: The profile.
+        """
+        self.rows += other.rows
+        self.nulls += other.nulls
+        self.numeric = self.numeric or other.numeric
+        self.moments.merge(other.moments)
+        self.sample.merge(other.sample)
+
+        if self.hll is None and other.hll is None:
+            self.frequencies.merge(other.frequencies)
+            if len(self.frequencies.counts) > self.exact_distinct_limit:
+                self._switch_to_hll()
+            return self
+
+        # At least one side is approximate, so the result is a HyperLogLog sketch
+        if self.hll is None:
+            self._switch_to_hll()
+        self.hll.merge(other.hll if other.hll is not None else other._sketch_values())
+        return self
+
+    def _sketch_values(self) -> HyperLogLog:
+        """
+        Build a HyperLogLog sketch of the exactly counted values.
+        """
+        # Hash the values with the column's own dtype so later chunks hash the same way
+        values = self.frequencies.counts.index.to_numpy()
+        if self.value_dtype is not None:
+            values = values.astype(self.value_dtype)
+        return HyperLogLog().update(values)
+
+    def _switch_to_hll(self):
+        """
+        Replace the exact value counts with a HyperLogLog sketch of the same values.
+        """
+        self.hll = self._sketch_values()
+        self.frequencies = None
+
+    def summary(self) -> Dict:
+        """
+        Summarize the profile.
+
+        Returns:
+            Dict: The statistics of the column.
+        """
+        summary = {
+            'dtype': self.dtype,
+            'count': self.rows - self.nulls,
+            'nulls': self.nulls,
+            'null_percentage': self.nulls / self.rows * 100 if self.rows else np.nan,
+            'distinct': self.hll.count() if self.hll is not None else len(self.frequencies.counts),
+            'distinct_approximate': self.hll is not None,
+            'top': None,
+            'freq': None,
+        }
+
+        if self.frequencies is not None and not self.frequencies.counts.empty:
+            summary['top'] = self.frequencies.mode()
+            summary['freq'] = int(self.frequencies.counts.max())
+
+        if self.numeric:
+            quantiles = self.sample.quantile([0.25, 0.5, 0.75])
+            summary.update({
+                'mean': self.moments.mean if self.moments.count else np.nan,
+                'std': self.moments.std,
+                'min': self.moments.min,
+                '25%': quantiles[0],
+                '50%': quantiles[1],
+                '75%': quantiles[2],
+                'max': self.moments.max,
+            })
+
+        return summary
+
+
+class ProfileResult:
+    """
+    A class holding the result of profiling a DataFrame.
+    """
+
+    def __init__(self, columns: Dict[str, Dict]):
+        """
+        Initialize the result from the summaries of each column.
+
+        Args:
+            columns (Dict[str, Dict]): Mapping of column names to their `ColumnProfile.summary()`.
+        """
+        self.columns = columns
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Return the profile as a DataFrame with one row per column.
+
+        Returns:
+            pd.DataFrame: The profile.
+        """
+        return pd.DataFrame.from_dict(self.columns, orient='index')
+
+    def statistics(self, column: Optional[str] = None):
+        """
+        Return the numeric summary statistics, like `DataFrameInfo.statistics`.
+
+        Args:
+            column (str, optional): The column name. Defaults to all numeric columns.
+
+        Returns:
+            pd.Series or pd.DataFrame: The statistics of the column, or of every numeric column.
+        """
+        keys = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+        if column is not None:
+            return pd.Series({key: self.columns[column].get(key) for key in keys}, name=column)
+        numeric = {name: summary for name, summary in self.columns.items() if 'mean' in summary}
+        return pd.DataFrame({name: [summary[key] for key in keys] for name, summary in numeric.items()}, index=keys)
+
+    def null_percentage(self) -> pd.Series:
+        """
+        Return the percentage of null values in each column.
+
+        Returns:
+            pd.Series: The null percentage of each column.
+        """
+        return pd.Series({name: summary['null_percentage'] for name, summary in self.columns.items()})
+
+    def distinct_counts(self, columns: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        Return the number of distinct values in each column.
+
+        Args:
+            columns (List[str], optional): The columns to return. Defaults to all columns.
+
+        Returns:
+            Dict[str, int]: The distinct count of each column.
+        """
+        return {name: summary['distinct'] for name, summary in self.columns.items() if columns is None or name in columns}
+
+    def print(self):
+        """
+        Print the profile.
+        """
+        print("Column Profile:\n", self.to_frame())
+
+    def __repr__(self) -> str:
+        return f"ProfileResult({len(self.columns)} columns)"
+
+
+class DataFrameProfiler:
+    """
+    A class for profiling a DataFrame, or a stream of chunks, in a single pass per column.
+
+    Profilers built over separate chunks or partitions can be merged into one.
+    """
+
+    def __init__(self, sample_size: int = 100000, exact_distinct_limit: int = 10000, seed: int = 0):
+        """
+        Initialize the DataFrameProfiler.
+
+        Args:
+            sample_size (int, optional): Size of the reservoir sample used for quantiles. Defaults to 100000.
+            exact_distinct_limit (int, optional): Largest number of distinct values counted exactly. Defaults to 10000.
+            seed (int, optional): Seed for the reservoir samples. Defaults to 0.
+        """
+        self.sample_size = sample_size
+        self.exact_distinct_limit = exact_distinct_limit
+        self.seed = seed
+        self.profiles = {}
+
+    def update(self, chunk: pd.DataFrame) -> 'DataFrameProfiler':
+        """
+        Add a chunk of rows to the profile.
+
+        Args:
+            chunk (pd.DataFrame): The rows to add.
+
+        Returns:
+            DataFrameProfiler: The profiler.
+        """
+        for column in chunk.columns:
+            profile = self.profiles.get(column)
+            if profile is None:
+                profile = ColumnProfile(str(chunk[column].dtype), self.sample_size, self.exact_distinct_limit, self.seed)
+                self.profiles[column] = profile
+            profile.update(chunk[column])
+        return self
+
+    def update_chunks(self, chunks: Iterable[pd.DataFrame]) -> 'DataFrameProfiler':
+        """
+        Add every chunk of a stream to the profile.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): The chunks to add.
+
+        Returns:
+            DataFrameProfiler: The profiler.
+        """
+        for chunk in chunks:
+            self.update(chunk)
+        return self
+
+    def merge(self, other: 'DataFrameProfiler') -> 'DataFrameProfiler':
+        """
+        Merge a profiler built over another chunk or partition.
+
+        Args:
+            other (DataFrameProfiler): The profiler to merge.
+
+        Returns:
+            DataFrameProfiler: The profiler.
+        """
+        for column, profile in other.profiles.items():
+            if column in self.profiles:
+                self.profiles[column].merge(profile)
+            else:
+                self.profiles[column] = profile
+        return self
+
+    def result(self) -> ProfileResult:
+        """
+        Summarize the profiles of every column.
+
+        Returns:
+            ProfileResult: The profiling result.
+        """
+        return ProfileResult({column: profile.summary() for column, profile in self.profiles.items()})
@@ -0,0 +1,348 @@
+import numpy as np
+import pandas as pd
+from typing import Callable, Iterable, List, Optional
+
+# The column holding each sampled row's random key
+KEY_COLUMN = '_sample_key'
+
+
+class StratifiedReservoir:
+    """
+    A mergeable stratified random sample of a stream of rows.
+
+    Every row is given a random key and each stratum (a combination of values of the strata
+    columns, e.g. region x month x revenue) keeps the `size_per_stratum` rows with the smallest
+    keys, which is a simple random sample of the stratum. The number of rows seen in every
+    stratum is counted exactly, so small strata are kept whole and each sampled row can be
+    weighted by the size of its stratum. Memory is bounded by the number of strata times
+    `size_per_stratum`, not by the number of rows.
+    """
+
+    def __init__(self, strata: List[str], size_per_stratum: int = 1000, seed: Optional[int] = 0):
+        """
+        Initialize an empty sample.
+
+        Args:
+            strata (List[str]): The columns defining the strata.
+            size_per_stratum (int, optional): The maximum number of rows kept per stratum. Defaults to 1000.
+            seed (int, optional): Seed for the random keys. Defaults to 0.
+        """
+        self.strata = list(strata)
+        self.size_per_stratum = size_per_stratum
+        self.rng = np.random.default_rng(seed)
+        self.rows = None
+        self.population = None
+
+    def update(self, chunk: pd.DataFrame) -> 'StratifiedReservoir':
+        """
+        Add a chunk of rows.
+
+        Args:
+            chunk (pd.DataFrame): The rows to add, with the strata columns.
+
+        Returns:
+            StratifiedReservoir: The sample.
+        """
+        self._count(chunk.value_counts(self.strata, dropna=False))
+
+        chunk = chunk.assign(**{KEY_COLUMN: self.rng.random(len(chunk))})
+        return self._keep_smallest(chunk if self.rows is None else pd.concat([self.rows, chunk], ignore_index=True))
+
+    def update_chunks(self, chunks: Iterable[pd.DataFrame]) -> 'StratifiedReservoir':
+        """
+        Add every chunk of an iterator, e.g. from `DataExtractor.stream_rds_table`.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): The chunks to add.
+
+        Returns:
+            StratifiedReservoir: The sample.
+        """
+        for chunk in chunks:
+            self.update(chunk)
+        return self
+
+    def merge(self, other: 'StratifiedReservoir') -> 'StratifiedReservoir':
+        """
+        Merge another sample of the same strata into this one.
+
+        Args:
+            other (StratifiedReservoir): The sample to merge.
+
+        Returns:
+            StratifiedReservoir: The sample.
+        """
+        if other.population is not None:
+            self._count(other.population)
+        if other.rows is None:
+            return self
+        return self._keep_smallest(other.rows if self.rows is None else pd.concat([self.rows, other.rows], ignore_index=True))
+
+    def _count(self, counts: pd.Series):
+        """
+        Add the row counts of some strata to the population counts.
+        """
+        if self.population is None:
+            self.population = counts.astype(np.int64)
+        else:
+            self.population = self.population.add(counts, fill_value=0).astype(np.int64)
+
+    def _keep_smallest(self, rows: pd.DataFrame) -> 'StratifiedReservoir':
+        """
+        Keep the `size_per_stratum` rows with the smallest keys in every stratum.
+        """
+        rows = rows.sort_values(KEY_COLUMN, kind='stable', ignore_index=True)
+        rank = rows.groupby(self.strata, dropna=False, observed=True, sort=False).cumcount()
+        self.rows = rows[rank.to_numpy() < self.size_per_stratum].reset_index(drop=True)
+        return self
+
+    def result(self, population: Optional[pd.Series] = None,
+               source: Optional[Callable[[], Iterable[pd.DataFrame]]] = None) -> 'StratifiedSample':
+        """
+        Return the sample with the weights of its rows.
+
+        Args:
+            population (pd.Series, optional): The number of rows of each stratum in the full table, when
+                the rows added were themselves a sample (e.g. from TABLESAMPLE). Defaults to the rows counted.
+            source (Callable, optional): A function returning the full table as chunks, used for exact answers.
+                Defaults to None.
+
+        Returns:
+            StratifiedSample: The sample.
+        """
+        rows = self.rows if self.rows is not None else pd.DataFrame(columns=self.strata)
+        if population is None:
+            population = self.population if self.population is not None else pd.Series(dtype=np.int64)
+        return StratifiedSample(rows.drop(columns=KEY_COLUMN, errors='ignore'), self.strata, population, source)
+
+
+class StratifiedSample:
+    """
+    A stratified sample of a table, answering analysis queries with estimates and confidence intervals.
+
+    Every query is a ratio of two sums over the rows, e.g. the null percentage of a column is
+    the number of nulls over the number of rows, and the mean of a column is its sum over its
+    number of non-null values. The sums are estimated stratum by stratum and the variance of
+    the ratio is estimated by linearization, with the finite population correction, so a
+    stratum sampled whole contributes no error. Passing `exact=True` to a query computes it
+    over the full table instead, in one pass over its chunks.
+
+    Every query returns a DataFrame with the 'estimate', 'std_error', 'lower' and 'upper'
+    bounds of the confidence interval, and the 'sample_rows' it was estimated from.
+    """
+
+    def __init__(self, rows: pd.DataFrame, strata: List[str], population: pd.Series,
+                 source: Optional[Callable[[], Iterable[pd.DataFrame]]] = None):
+        """
+        Initialize the sample.
+
+        Args:
+            rows (pd.DataFrame): The sampled rows.
+            strata (List[str]): The columns defining the strata.
+            population (pd.Series): The number of rows of each stratum in the full table, indexed by the strata values.
+            source (Callable, optional): A function returning the full table as chunks, for exact answers.
+                Defaults to None.
+        """
+        self.rows = rows.reset_index(drop=True)
+        self.strata = list(strata)
+        self.source = source
+
+        # Number every stratum, and line the population counts up with the sampled strata
+        grouped = self.rows.groupby(self.strata, dropna=False, observed=True, sort=True)
+        self.stratum_ids = grouped.ngroup().to_numpy()
+        sizes = grouped.size().rename('sampled').reset_index()
+        population = population.rename('population').rename_axis(self.strata).reset_index()
+        sampled = sizes.merge(population, on=self.strata, how='left')
+        self.sample_sizes = sampled['sampled'].to_numpy(dtype=np.float64)
+        self.population = sampled['population'].fillna(sampled['sampled']).to_numpy(dtype=np.float64)
+
+        unsampled = population.merge(sizes, on=self.strata, how='left')
+        missing = unsampled.loc[unsampled['sampled'].isna() & (unsampled['population'] > 0), 'population']
+        if len(missing):
+            print(f"{len(missing)} strata with {int(missing.sum())} rows have no sampled rows and are left out of the estimates")
+
+    @property
+    def weights(self) -> pd.Series:
+        """
+        The number of rows of the full table each sampled row stands for.
+        """
+        return pd.Series((self.population / self.sample_sizes)[self.stratum_ids], index=self.rows.index, name='weight')
+
+    def _ratio(self, y: np.ndarray, x: np.ndarray) -> tuple:
+        """
+        Estimate the ratio of the column sums of `y` and `x` over the full table, and its standard error.
+        """
+        num_strata = len(self.sample_sizes)
+        if num_strata == 0:
+            return np.full(y.shape[1], np.nan), np.full(y.shape[1], np.nan)
+
+        def stratum_sums(values):
+            sums = np.zeros((num_strata, values.shape[1]))
+            np.add.at(sums, self.stratum_ids, values)
+            return sums
+
+        n = self.sample_sizes[:, None]
+        total_y = (self.population[:, None] * stratum_sums(y) / n).sum(axis=0)
+        total_x = (self.population[:, None] * stratum_sums(x) / n).sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = total_y / total_x
+
+            # Linearize the ratio, then take the within-stratum variance of the residuals
+            residuals = y - np.nan_to_num(ratio) * x
+            residual_sums = stratum_sums(residuals)
+            squares = stratum_sums(residuals ** 2)
+            variance = np.where(n > 1, np.maximum(squares - residual_sums ** 2 / n, 0) / (n - 1), 0.0)
+            correction = 1 - n / self.population[:, None]
+            std_error = np.sqrt((self.population[:, None] ** 2 * correction * variance / n).sum(axis=0)) / np.abs(total_x)
+        return ratio, std_error
+
+    def _exact(self, variables: Callable, names: List[str]) -> tuple:
+        """
+        Compute the ratio of the column sums over the full table, one chunk at a time.
+        """
+        if self.source is None:
+            print("No source has been given for exact answers, returning the estimates")
+            return None
+
+        total_y, total_x = np.zeros(len(names)), np.zeros(len(names))
+        for chunk in self.source():
+            y, x = variables(chunk)
+            total_y += y.sum(axis=0)
+            total_x += x.sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return total_y / total_x, np.zeros(len(names))
+
+    def _estimate(self, variables: Callable, names: List[str], exact: bool, confidence: float,
+                  scale: float = 1.0, bounds: Optional[tuple] = None) -> pd.DataFrame:
+        """
+        Answer a query given as a function returning the (y, x) arrays of a frame, one column per result.
+        """
+        from scipy import stats
+
+        result = self._exact(variables, names) if exact else None
+        if result is None:
+            result = self._ratio(*variables(self.rows))
+        estimate, std_error = result
+
+        margin = stats.norm.ppf(0.5 + confidence / 2) * std_error
+        lower, upper = estimate - margin, estimate + margin
+        if bounds is not None:
+            lower, upper = np.clip(lower, *bounds), np.clip(upper, *bounds)
+
+        return pd.DataFrame({'estimate': estimate * scale, 'std_error': std_error * scale, 'lower': lower * scale,
+                             'upper': upper * scale, 'sample_rows': len(self.rows)}, index=pd.Index(names))
+
+    def null_percentage(self, columns: Optional[List[str]] = None, exact: bool = False,
+                        confidence: float = 0.95) -> pd.DataFrame:
+        """
+        Estimate the percentage of NULL values in each column.
+
+        Args:
+            columns (List[str], optional): The columns. Defaults to every column.
+            exact (bool, optional): Compute the exact percentages over the full table instead. Defaults to False.
+            confidence (float, optional): The confidence level of the intervals. Defaults to 0.95.
+
+        Returns:
+            pd.DataFrame: The estimate and confidence interval of each column's null percentage.
+        """
+        columns = list(columns or self.rows.columns)
+
+        def variables(frame):
+            nulls = frame[columns].isna().to_numpy(dtype=np.float64)
+            return nulls, np.ones_like(nulls)
+
+        return self._estimate(variables, columns, exact, confidence, scale=100, bounds=(0, 1))
+
+    def mean(self, columns: List[str], exact: bool = False, confidence: float = 0.95) -> pd.DataFrame:
+        """
+        Estimate the mean of the non-null values of numeric or boolean columns.
+
+        Args:
+            columns (List[str]): The columns.
+            exact (bool, optional): Compute the exact means over the full table instead. Defaults to False.
+            confidence (float, optional): The confidence level of the intervals. Defaults to 0.95.
+
+        Returns:
+            pd.DataFrame: The estimate and confidence interval of each column's mean.
+        """
+        columns = list(columns)
+
+        def variables(frame):
+            values = frame[columns].astype(np.float64).to_numpy()
+            present = ~np.isnan(values)
+            return np.where(present, values, 0.0), present.astype(np.float64)
+
+        return self._estimate(variables, columns, exact, confidence)
+
+    def proportion(self, column: str, values: Optional[List] = None, exact: bool = False,
+                   confidence: float = 0.95) -> pd.DataFrame:
+        """
+        Estimate the proportion of rows taking each value of a column, e.g. the weekend/weekday split.
+
+        Args:
+            column (str): The column.
+            values (List, optional): The values to estimate the proportions of. Defaults to the values in the sample.
+            exact (bool, optional): Compute the exact proportions over the full table instead. Defaults to False.
+            confidence (float, optional): The confidence level of the intervals. Defaults to 0.95.
+
+        Returns:
+            pd.DataFrame: The estimate and confidence interval of the proportion of each value.
+        """
+        values = list(values if values is not None else self.rows[column].dropna().unique())
+
+        def variables(frame):
+            matches = np.column_stack([(frame[column] == value).to_numpy(dtype=np.float64) for value in values])
+            return matches, np.ones_like(matches)
+
+        return self._estimate(variables, values, exact, confidence, bounds=(0, 1))
+
+    def share(self, measure: str, by: str, values: Optional[List] = None, exact: bool = False,
+              confidence: float = 0.95) -> pd.DataFrame:
+        """
+        Estimate the share of a measure's total coming from each value of a column,
+        e.g. `share('revenue', 'weekend')` for the share of sales made at the weekend.
+
+        Args:
+            measure (str): The numeric or boolean column to total.
+            by (str): The column to split the total by.
+            values (List, optional): The values of `by` to estimate the shares of. Defaults to the values in the sample.
+            exact (bool, optional): Compute the exact shares over the full table instead. Defaults to False.
+            confidence (float, optional): The confidence level of the intervals. Defaults to 0.95.
+
+        Returns:
+            pd.DataFrame: The estimate and confidence interval of the share of each value.
+        """
+        values = list(values if values is not None else self.rows[by].dropna().unique())
+
+        def variables(frame):
+            amounts = np.nan_to_num(frame[measure].astype(np.float64).to_numpy())
+            matches = np.column_stack([(frame[by] == value).to_numpy(dtype=np.float64) for value in values])
+            return matches * amounts[:, None], np.repeat(amounts[:, None], len(values), axis=1)
+
+        return self._estimate(variables, values, exact, confidence, bounds=(0, 1))
+
+    def group_mean(self, measure: str, by: str, values: Optional[List] = None, exact: bool = False,
+                   confidence: float = 0.95) -> pd.DataFrame:
+        """
+        Estimate the mean of a measure within each value of a column, e.g. `group_mean('revenue', 'month')`
+        for the conversion rate of each month.
+
+        Args:
+            measure (str): The numeric or boolean column to average.
+            by (str): The column to group by.
+            values (List, optional): The values of `by` to estimate the means of. Defaults to the values in the sample.
+            exact (bool, optional): Compute the exact means over the full table instead. Defaults to False.
+            confidence (float, optional): The confidence level of the intervals. Defaults to 0.95.
+
+        Returns:
+            pd.DataFrame: The estimate and confidence interval of the mean of each group.
+        """
+        values = list(values if values is not None else self.rows[by].dropna().unique())
+
+        def variables(frame):
+            amounts = frame[measure].astype(np.float64).to_numpy()
+            present = ~np.isnan(amounts)
+            matches = np.column_stack([((frame[by] == value).to_numpy() & present).astype(np.float64) for value in values])
+            return matches * np.nan_to_num(amounts)[:, None], matches
+
+        return self._estimate(variables, values, exact, confidence)
@@ -0,0 +1,305 @@
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+class MomentAccumulator:
+    """
+    A mergeable accumulator for the count, mean, variance, skewness, minimum and maximum of a column.
+
+    Chunks are summarized with vectorized NumPy and combined with the parallel form of
+    Welford's algorithm (extended to the third moment by Pebay), so the result does not depend
+    on how the rows were split.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty accumulator.
+        """
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+
+    def update(self, values: np.ndarray) -> 'MomentAccumulator':
+        """
+        Add the non-null values of a chunk.
+
+        Args:
+            values (np.ndarray): The values to add. NaNs are ignored.
+
+        Returns:
+            MomentAccumulator: The accumulator.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+
+        chunk = MomentAccumulator()
+        chunk.count = len(values)
+        chunk.mean = float(values.mean())
+        deviations = values - chunk.mean
+        chunk.m2 = float((deviations ** 2).sum())
+        chunk.m3 = float((deviations ** 3).sum())
+        chunk.min = float(values.min())
+        chunk.max = float(values.max())
+        return self.merge(chunk)
+
+    def merge(self, other: 'MomentAccumulator') -> 'MomentAccumulator':
+        """
+        Merge another accumulator into this one.
+
+        Args:
+            other (MomentAccumulator): The accumulator to merge.
+
+        Returns:
+            MomentAccumulator: The accumulator.
+        """
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2, self.m3 = other.count, other.mean, other.m2, other.m3
+            self.min, self.max = other.min, other.max
+            return self
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.m3 += (other.m3 + delta ** 3 * self.count * other.count * (self.count - other.count) / count ** 2
+                    + 3 * delta * (self.count * other.m2 - other.count * self.m2) / count)
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """
+        The sample variance of the values added so far.
+        """
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def std(self) -> float:
+        """
+        The sample standard deviation of the values added so far.
+        """
+        return float(np.sqrt(self.variance))
+
+    @property
+    def skewness(self) -> float:
+        """
+        The adjusted Fisher-Pearson skewness of the values added so far, like `pd.Series.skew`.
+        """
+        n = self.count
+        if n < 3:
+            return np.nan
+        if self.m2 == 0:
+            return 0.0
+        g1 = np.sqrt(n) * self.m3 / self.m2 ** 1.5
+        return float(g1 * np.sqrt(n * (n - 1)) / (n - 2))
+
+
+class ReservoirSample:
+    """
+    A mergeable, fixed-size uniform random sample of a column.
+
+    Every value is given a random key and the sample keeps the values with the smallest keys,
+    which is a uniform sample of everything added and can be merged across chunks or partitions.
+    The sample is used to approximate quantiles and to fit parameters on bounded memory.
+    """
+
+    def __init__(self, size: int = 100000, seed: Optional[int] = 0):
+        """
+        Initialize an empty sample.
+
+        Args:
+            size (int, optional): The maximum number of values kept. Defaults to 100000.
+            seed (int, optional): Seed for the random keys. Defaults to 0.
+        """
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.keys = np.empty(0)
+        self.values = np.empty(0)
+        self.count = 0
+
+    def update(self, values) -> 'ReservoirSample':
+        """
+        Add the non-null values of a chunk.
+
+        Args:
+            values (array-like): The values to add.
+
+        Returns:
+            ReservoirSample: The sample.
+        """
+        values = pd.Series(values).dropna().to_numpy()
+        self.count += len(values)
+        return self._keep_smallest(np.concatenate([self.keys, self.rng.random(len(values))]),
+                                   np.concatenate([self.values, values]) if len(self.values) else values)
+
+    def merge(self, other: 'ReservoirSample') -> 'ReservoirSample':
+        """
+        Merge another sample into this one.
+
+        Args:
+            other (ReservoirSample): The sample to merge.
+
+        Returns:
+            ReservoirSample: The sample.
+        """
+        self.count += other.count
+        return self._keep_smallest(np.concatenate([self.keys, other.keys]), np.concatenate([self.values, other.values]))
+
+    def _keep_smallest(self, keys: np.ndarray, values: np.ndarray) -> 'ReservoirSample':
+        """
+        Keep the values with the `size` smallest keys.
+        """
+        if len(keys) > self.size:
+            keep = np.argpartition(keys, self.size)[:self.size]
+            keys, values = keys[keep], values[keep]
+        self.keys, self.values = keys, values
+        return self
+
+    def quantile(self, q):
+        """
+        Estimate quantiles of the values added so far.
+
+        Args:
+            q (float or array-like): The quantile(s) to estimate, between 0 and 1.
+
+        Returns:
+            float or np.ndarray: The estimated quantile(s).
+        """
+        if len(self.values) == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        return np.quantile(self.values.astype(np.float64), q)
+
+
+class FrequencyAccumulator:
+    """
+    A mergeable accumulator of exact value counts, used for the mode of low-cardinality columns.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty accumulator.
+        """
+        self.counts = pd.Series(dtype='int64')
+
+    def update(self, values) -> 'FrequencyAccumulator':
+        """
+        Add the non-null values of a chunk.
+
+        Args:
+            values (array-like): The values to add.
+
+        Returns:
+            FrequencyAccumulator: The accumulator.
+        """
+        chunk_counts = pd.Series(values).value_counts(dropna=True)
+        chunk_counts = chunk_counts[chunk_counts > 0]
+        chunk_counts.index = chunk_counts.index.astype(object)
+        self.counts = chunk_counts if self.counts.empty else self.counts.add(chunk_counts, fill_value=0)
+        return self
+
+    def merge(self, other: 'FrequencyAccumulator') -> 'FrequencyAccumulator':
+        """
+        Merge another accumulator into this one.
+
+        Args:
+            other (FrequencyAccumulator): The accumulator to merge.
+
+        Returns:
+            FrequencyAccumulator: The accumulator.
+        """
+        self.counts = other.counts.copy() if self.counts.empty else self.counts.add(other.counts, fill_value=0)
+        return self
+
+    def mode(self):
+        """
+        The most frequent value, taking the smallest value on ties like `pd.Series.mode`.
+        """
+        if self.counts.empty:
+            return None
+        top = self.counts[self.counts == self.counts.max()]
+        return sorted(top.index)[0]
+
+
+class HyperLogLog:
+    """
+    A mergeable HyperLogLog sketch estimating the number of distinct values in a column.
+
+    Values are hashed with `pd.util.hash_array` and the registers are updated with vectorized
+    NumPy, so memory stays at 2 ** `precision` bytes regardless of the number of values.
+    """
+
+    def __init__(self, precision: int = 14):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            precision (int, optional): Number of bits used to pick a register, between 4 and 18.
+                The relative error is about 1.04 / sqrt(2 ** precision). Defaults to 14.
+        """
+        self.precision = precision
+        self.registers = np.zeros(2 ** precision, dtype=np.uint8)
+
+    def update(self, values) -> 'HyperLogLog':
+        """
+        Add the non-null values of a chunk.
+
+        Args:
+            values (array-like): The values to add.
+
+        Returns:
+            HyperLogLog: The sketch.
+        """
+        values = pd.Series(values).dropna().to_numpy()
+        if len(values) == 0:
+            return self
+
+        hashes = pd.util.hash_array(values)
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        remainder = hashes << np.uint64(self.precision)
+
+        # The low bits of the remainder are zero, so shifting them out keeps it exact as a float64
+        shifted = (remainder >> np.uint64(11)).astype(np.float64)
+        bit_length = np.where(shifted > 0, np.frexp(shifted)[1] + 11, 0)
+        rank = np.where(shifted > 0, 64 - bit_length + 1, 64 - self.precision + 1).astype(np.uint8)
+
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """
+        Merge another sketch of the same precision into this one.
+
+        Args:
+            other (HyperLogLog): The sketch to merge.
+
+        Returns:
+            HyperLogLog: The sketch.
+        """
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        """
+        Estimate the number of distinct values added so far.
+
+        Returns:
+            int: The estimated distinct count.
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+
+        # Fall back to linear counting while many registers are still empty
+        empty = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and empty > 0:
+            estimate = m * np.log(m / empty)
+        return int(round(estimate))